@@ -53,8 +53,8 @@ class DepartmentAdmin(admin.ModelAdmin):
 class UserSessionAdmin(admin.ModelAdmin):
     """Admin interface for UserSession model."""
     
-    list_display = ['user', 'ip_address', 'login_time', 'last_activity', 'is_active']
+    list_display = ['user', 'ip_address', 'login_time', 'logout_time', 'last_activity', 'is_active']
     list_filter = ['is_active', 'login_time']
     search_fields = ['user__email', 'ip_address']
     raw_id_fields = ['user']
-    readonly_fields = ['login_time', 'last_activity']
+    readonly_fields = ['login_time', 'logout_time', 'last_activity']
@@ -0,0 +1,141 @@
+"""
+JWT authentication that usually skips the users table.
+
+With a cache shared by every process (Redis), `request.user` is, in order
+of preference:
+- the user's fields cached by an earlier request (never the password hash),
+  for up to the access token lifetime;
+- built from the token's signed claims (id, role, is_active, department),
+  with the remaining fields loaded in one query if a view reads them;
+- loaded from the database (and then cached), for tokens issued before the
+  user's role, active flag or department last changed, or without claims.
+
+Saving, updating or deleting a user drops the cached fields (accounts.signals,
+UserQuerySet.update), and logout revokes the access tokens of the refresh
+token it blacklists. A per-process cache would only hear of those changes in
+the process that made them, so without a shared cache every request loads the
+user from the database, checking revocation in the same query.
+"""
+
+import time
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Exists, OuterRef
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .tokens import CLAIM_FIELDS, REFRESH_JTI_CLAIM, revoked_token_key
+
+# Model fields whose change makes earlier tokens' claims stale
+CLAIM_MODEL_FIELDS = {'role', 'is_active', 'department', 'department_id'}
+
+# Never cached: a cached user is rebuilt with this field deferred
+UNCACHED_FIELDS = {'password'}
+
+
+def user_cache_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def claims_changed_key(user_id):
+    return f'auth:claims-changed:{user_id}'
+
+
+def cache_is_shared():
+    """Whether a change recorded in the cache is seen by every process."""
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _access_token_lifetime():
+    return int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def forget_users(user_ids, claims_changed=True):
+    """Drop cached users; with `claims_changed`, stop trusting the claims of tokens issued to them so far."""
+    user_ids = list(user_ids)
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+    if claims_changed:
+        changed_at = int(time.time())
+        cache.set_many({claims_changed_key(user_id): changed_at for user_id in user_ids}, _access_token_lifetime())
+
+
+def forget_user(user_id, claims_changed=True):
+    """Drop the cached user; with `claims_changed`, stop trusting the claims of tokens issued so far."""
+    forget_users([user_id], claims_changed=claims_changed)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that trusts the claims of accounts.tokens.ClaimsRefreshToken."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        if user_id is None or jwt_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        if not cache_is_shared():
+            return self.user_from_db(validated_token)
+
+        refresh_jti = validated_token.get(REFRESH_JTI_CLAIM)
+        keys = [user_cache_key(user_id), claims_changed_key(user_id)]
+        if refresh_jti:
+            keys.append(revoked_token_key(refresh_jti))
+        cached = cache.get_many(keys)
+
+        if refresh_jti and revoked_token_key(refresh_jti) in cached:
+            raise AuthenticationFailed(_('Token is blacklisted'), code='token_not_valid')
+
+        values = cached.get(user_cache_key(user_id))
+        if values is not None:
+            user = self.user_from_values(values)
+        elif self.has_current_claims(validated_token, cached.get(claims_changed_key(user_id))):
+            user = self.user_from_claims(validated_token)
+        else:
+            user = super().get_user(validated_token)
+            cache.set(user_cache_key(user_id), self.cached_values(user), _access_token_lifetime())
+
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+    def user_from_db(self, validated_token):
+        """The user row, as JWTAuthentication loads it, also rejecting tokens revoked at logout."""
+        refresh_jti = validated_token.get(REFRESH_JTI_CLAIM)
+        if not refresh_jti:
+            return super().get_user(validated_token)
+        users = self.user_model.objects.annotate(token_revoked=Exists(
+            BlacklistedToken.objects.filter(token__jti=refresh_jti, token__user=OuterRef('pk'))
+        ))
+        try:
+            user = users.get(**{jwt_settings.USER_ID_FIELD: validated_token[jwt_settings.USER_ID_CLAIM]})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        if user.token_revoked:
+            raise AuthenticationFailed(_('Token is blacklisted'), code='token_not_valid')
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        return user
+
+    def cached_values(self, user):
+        return {
+            # Plain values (a file's name rather than its FieldFile), as a query would return them
+            field.attname: field.get_prep_value(field.value_from_object(user))
+            for field in self.user_model._meta.concrete_fields if field.attname not in UNCACHED_FIELDS
+        }
+
+    def user_from_values(self, values):
+        field_names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in values]
+        return self.user_model.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
+
+    def has_current_claims(self, validated_token, changed_at):
+        if not all(field in validated_token for field in CLAIM_FIELDS):
+            return False
+        # Same second counts as stale: the change may have come just after the token
+        return changed_at is None or validated_token.get('iat', 0) > changed_at
+
+    def user_from_claims(self, validated_token):
+        values = {field: validated_token[field] for field in CLAIM_FIELDS}
+        values[jwt_settings.USER_ID_FIELD] = validated_token[jwt_settings.USER_ID_CLAIM]
+        return self.user_from_values(values)
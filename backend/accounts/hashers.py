@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 with its costs taken from settings. A hash made with other costs
+    (or another hasher) is redone with these at the user's next login.
+    """
+    
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+    
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+    
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from accounts.session_tracking import flush_session_events
+
+
+class Command(BaseCommand):
+    help = 'Write the queued login/logout session events now instead of waiting for the next flush.'
+    
+    def handle(self, *args, **options):
+        written = flush_session_events()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} session events."))
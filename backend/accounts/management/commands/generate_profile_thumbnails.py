@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from accounts.models import User
+from accounts.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generate missing profile picture thumbnails (e.g. for pictures uploaded before thumbnails existed).'
+    
+    def handle(self, *args, **options):
+        users = (
+            User.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+            .exclude(profile_thumbnails_source=F('profile_picture'))
+            .only('id', 'profile_picture')
+        )
+        done = failed = 0
+        for user in users.iterator():
+            try:
+                generate_thumbnails(user.profile_picture)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"User {user.pk}: {exc}")
+                continue
+            User.objects.filter(pk=user.pk).update(profile_thumbnails_source=user.profile_picture.name)
+            done += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated thumbnails for {done} users ({failed} failed)."))
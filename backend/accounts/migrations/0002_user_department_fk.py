@@ -0,0 +1,79 @@
+# Generated by Django 5.2.6 on 2026-10-18 23:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _unique_code(Department, name):
+    """Build a unique department code from the initials of a free-text name."""
+    words = [word for word in name.replace('&', ' ').split() if word[0].isalnum()]
+    base = ''.join(word[0] for word in words).upper()[:8] or name[:8].upper()
+    code = base
+    suffix = 1
+    while Department.objects.filter(code=code).exists():
+        suffix += 1
+        code = f"{base}{suffix}"[:10]
+    return code
+
+
+def map_department_names(apps, schema_editor):
+    """Point every user at the Department row matching their free-text department."""
+    User = apps.get_model('accounts', 'User')
+    Department = apps.get_model('accounts', 'Department')
+
+    departments = {dept.name.strip().lower(): dept for dept in Department.objects.all()}
+    names = (
+        User.objects.exclude(department='')
+        .values_list('department', flat=True)
+        .distinct()
+    )
+    for name in list(names):
+        key = name.strip().lower()
+        if not key:
+            continue
+        department = departments.get(key)
+        if department is None:
+            department = Department.objects.create(
+                name=name.strip(),
+                code=_unique_code(Department, name.strip()),
+                description='Created from existing user records.',
+            )
+            departments[key] = department
+        User.objects.filter(department=name).update(department_ref=department)
+
+
+def restore_department_names(apps, schema_editor):
+    """Copy the linked department name back into the free-text column."""
+    User = apps.get_model('accounts', 'User')
+    for user in User.objects.filter(department_ref__isnull=False).select_related('department_ref'):
+        User.objects.filter(pk=user.pk).update(department=user.department_ref.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='department_ref',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='accounts.department'),
+        ),
+        migrations.RunPython(map_department_names, restore_department_names),
+        migrations.RemoveField(
+            model_name='user',
+            name='department',
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='department_ref',
+            new_name='department',
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='department',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='accounts.department'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:10
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_department_fk'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, storage=blobs.storage.get_content_addressed_storage, upload_to='profiles/'),
+        ),
+    ]
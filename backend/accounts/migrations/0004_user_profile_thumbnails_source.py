@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_profile_picture'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_thumbnails_source',
+            field=models.CharField(blank=True, editable=False, max_length=255),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_profile_thumbnails_source'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['is_active', '-login_time'], name='user_sessions_active_idx'),
+        ),
+    ]
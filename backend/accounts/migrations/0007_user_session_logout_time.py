@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_alter_user_managers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usersession',
+            name='logout_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='usersession',
+            name='login_time',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -1,6 +1,26 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
+from functools import partial
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
+from django.db import models, transaction
 from django.utils import timezone
+from blobs.storage import get_content_addressed_storage
+
+
+class UserQuerySet(models.QuerySet):
+    
+    def update(self, **kwargs):
+        # Unlike save(), update() sends no signal; drop what authentication cached for these users
+        from .authentication import CLAIM_MODEL_FIELDS, forget_users
+        user_ids = list(self.values_list('pk', flat=True))
+        rows = super().update(**kwargs)
+        if user_ids:
+            transaction.on_commit(partial(
+                forget_users, user_ids, claims_changed=bool(CLAIM_MODEL_FIELDS & set(kwargs))
+            ))
+        return rows
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    pass
 
 
 class User(AbstractUser):
@@ -15,15 +35,24 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='student')
     student_id = models.CharField(max_length=20, blank=True, null=True, unique=True)
-    department = models.CharField(max_length=100, blank=True)
+    department = models.ForeignKey(
+        'Department',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='users'
+    )
     phone = models.CharField(max_length=15, blank=True)
-    profile_picture = models.ImageField(upload_to='profiles/', blank=True, null=True)
+    profile_picture = models.ImageField(upload_to='profiles/', storage=get_content_addressed_storage, blank=True, null=True)
+    profile_thumbnails_source = models.CharField(max_length=255, blank=True, editable=False)  # Picture the thumbnails were made from
     bio = models.TextField(blank=True)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_login = models.DateTimeField(default=timezone.now)
     
+    objects = UserManager()
+    
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
     
@@ -47,6 +76,14 @@ class User(AbstractUser):
     
     def is_admin(self):
         return self.role == 'admin'
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # A user built from token claims (accounts.authentication) defers most fields;
+        # load them all on first access instead of one query per field
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
 
 
 class UserProfile(models.Model):
@@ -105,7 +142,8 @@ class UserSession(models.Model):
     session_key = models.CharField(max_length=40, unique=True)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField()
-    login_time = models.DateTimeField(auto_now_add=True)
+    login_time = models.DateTimeField(default=timezone.now)
+    logout_time = models.DateTimeField(blank=True, null=True)
     last_activity = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
@@ -113,6 +151,10 @@ class UserSession(models.Model):
         db_table = 'user_sessions'
         verbose_name = 'User Session'
         verbose_name_plural = 'User Sessions'
+        indexes = [
+            # Active session list (newest first) and the active session count
+            models.Index(fields=['is_active', '-login_time'], name='user_sessions_active_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.login_time}"
@@ -1,7 +1,51 @@
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer, TokenObtainPairSerializer, TokenRefreshSerializer
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.contrib.auth import authenticate
+from django.db.models import Q
 from django.contrib.auth.password_validation import validate_password
+from eduportal.serializers import SparseFieldsMixin
 from .models import User, UserProfile, Department, UserSession
+from .thumbnails import profile_picture_thumbnails, profile_picture_url
+from .tokens import ClaimsRefreshToken, revoke_refresh_token
+
+
+class DepartmentField(serializers.SlugRelatedField):
+    """
+    Department by name. Clients send free text, so the code or the name
+    matches in any case. An exact code match wins, then an exact name
+    match; a value that only matches different departments case-insensitively
+    is rejected as ambiguous, as is a value matching none. A blank value
+    leaves the user without a department.
+    """
+    
+    default_error_messages = {
+        'does_not_exist': 'Unknown department "{value}".',
+        'ambiguous': '"{value}" matches more than one department; use its code.',
+    }
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('allow_null', True)
+        super().__init__(slug_field='name', queryset=Department.objects.all(), **kwargs)
+    
+    def to_internal_value(self, data):
+        value = str(data).strip()
+        if not value:
+            return None
+        candidates = list(self.get_queryset().filter(Q(code__iexact=value) | Q(name__iexact=value)))
+        for exact in (lambda department: department.code == value, lambda department: department.name == value):
+            matches = [department for department in candidates if exact(department)]
+            if matches:
+                return matches[0]  # Codes and names are unique
+        if not candidates:
+            self.fail('does_not_exist', value=value)
+        if len(candidates) > 1:
+            self.fail('ambiguous', value=value)
+        return candidates[0]
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -9,6 +53,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     password = serializers.CharField(write_only=True, validators=[validate_password])
     password_confirm = serializers.CharField(write_only=True)
+    department = DepartmentField()
     
     class Meta:
         model = User
@@ -52,31 +97,47 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError('Must include email and password.')
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for user profile."""
     
     full_name = serializers.ReadOnlyField()
     profile_picture_url = serializers.SerializerMethodField()
+    profile_picture_thumbnails = serializers.SerializerMethodField()
+    department = DepartmentField()
     
     class Meta:
         model = User
         fields = [
             'id', 'email', 'username', 'first_name', 'last_name', 'full_name',
             'role', 'student_id', 'department', 'phone', 'profile_picture',
-            'profile_picture_url', 'bio', 'is_verified', 'date_joined',
+            'profile_picture_url', 'profile_picture_thumbnails', 'bio', 'is_verified', 'date_joined',
             'last_login', 'is_active'
         ]
         read_only_fields = ['id', 'date_joined', 'last_login', 'is_active']
     
     def get_profile_picture_url(self, obj):
-        if obj.profile_picture:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.profile_picture.url)
-        return None
+        return profile_picture_url(obj, self.context.get('request'))
+    
+    def get_profile_picture_thumbnails(self, obj):
+        """URLs per size (`small`, `small_webp`, ...); the original until thumbnails are generated."""
+        return profile_picture_thumbnails(obj, self.context.get('request'))
 
 
-class ExtendedUserProfileSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Compact user representation, embedded by `?expand=user` on activity records."""
+    
+    full_name = serializers.ReadOnlyField()
+    profile_picture_thumbnails = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'full_name', 'role', 'profile_picture_thumbnails']
+    
+    def get_profile_picture_thumbnails(self, obj):
+        return profile_picture_thumbnails(obj, self.context.get('request'))
+
+
+class ExtendedUserProfileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Extended serializer with profile details."""
     
     user = UserProfileSerializer(read_only=True)
@@ -120,7 +181,7 @@ class PasswordChangeSerializer(serializers.Serializer):
         return value
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for departments."""
     
     head_name = serializers.SerializerMethodField()
@@ -137,10 +198,13 @@ class DepartmentSerializer(serializers.ModelSerializer):
         return obj.head.full_name if obj.head else None
     
     def get_user_count(self, obj):
-        return User.objects.filter(department=obj.name).count()
+        # List/detail querysets annotate the count; freshly created rows fall back to a query
+        if hasattr(obj, 'user_count'):
+            return obj.user_count
+        return obj.users.count()
 
 
-class UserSessionSerializer(serializers.ModelSerializer):
+class UserSessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for user sessions."""
     
     user_name = serializers.SerializerMethodField()
@@ -166,3 +230,47 @@ class UserStatsSerializer(serializers.Serializer):
     active_users = serializers.IntegerField()
     new_users_this_month = serializers.IntegerField()
     departments_count = serializers.IntegerField()
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """`/api/token/` issuing tokens with role, active flag and department claims."""
+    
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """`/api/token/refresh/` re-reading the user so new access tokens carry current claims."""
+    
+    token_class = ClaimsRefreshToken
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{jwt_settings.USER_ID_FIELD: user_id}).first() if user_id else None
+        if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+        
+        # Rotated first, so the access token names the refresh token a later logout revokes
+        refresh.set_user_claims(user)
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            data['refresh'] = str(refresh)
+        return data
+
+
+class ClaimsTokenBlacklistSerializer(TokenBlacklistSerializer):
+    """`/api/token/blacklist/` also revoking the access tokens issued from the refresh token."""
+    
+    token_class = ClaimsRefreshToken
+    
+    def validate(self, attrs):
+        revoke_refresh_token(self.token_class(attrs['refresh']))
+        return {}
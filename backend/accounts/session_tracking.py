@@ -0,0 +1,185 @@
+"""
+Buffered UserSession tracking.
+
+With REDIS_URL set, login and logout only push an event onto a Redis list
+shared by every process. Celery beat drains it every
+SESSION_TRACKING_FLUSH_INTERVAL seconds (`flush_session_events_task`),
+one upsert for the new sessions and one for the ended ones, so logins
+never wait on the user_sessions table. A session shows up in the session
+list and stats within that interval, with the time it really started.
+
+Both writes are keyed on the session key, so they can land in either
+order: a logout written first leaves an inactive row that the login only
+fills in. Events that can't be written because the database is
+unreachable go back on the queue; an event the database rejects is
+logged and dropped.
+
+Without Redis, or with SESSION_TRACKING_FLUSH_INTERVAL=0, each event is
+written during its request.
+"""
+
+import json
+import logging
+from datetime import datetime
+from django.conf import settings
+from django.db import DatabaseError, InterfaceError, OperationalError
+from django.utils import timezone
+from .models import UserSession
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'eduportal:session-events'
+BATCH_SIZE = 500
+
+
+class RedisQueue:
+    """Event queue in a Redis list shared by all processes."""
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    @property
+    def client(self):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def push(self, event):
+        import redis
+
+        try:
+            self.client.rpush(QUEUE_KEY, json.dumps(event, separators=(',', ':')))
+        except redis.RedisError:
+            logger.exception('Could not queue a user session in Redis; writing it directly')
+            write_events([event])
+
+    def push_back(self, events):
+        """Return events to the front of the queue, in their original order."""
+        self.client.lpush(QUEUE_KEY, *[json.dumps(event, separators=(',', ':')) for event in reversed(events)])
+
+    def pop(self, count):
+        # Read and remove in one transaction so two flushers never write the same events
+        pipeline = self.client.pipeline()
+        pipeline.lrange(QUEUE_KEY, 0, count - 1)
+        pipeline.ltrim(QUEUE_KEY, count, -1)
+        events, _ = pipeline.execute()
+        return [json.loads(event) for event in events]
+
+
+_queue = None
+
+
+def buffering():
+    return bool(settings.REDIS_URL) and settings.SESSION_TRACKING_FLUSH_INTERVAL > 0
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = RedisQueue(settings.REDIS_URL)
+    return _queue
+
+
+def _session(event, **extra):
+    return UserSession(
+        user_id=event['user_id'],
+        session_key=event['session_key'],
+        ip_address=event['ip_address'],
+        user_agent=event['user_agent'],
+        login_time=datetime.fromisoformat(event['at']),
+        **extra,
+    )
+
+
+def write_events(events):
+    """
+    Upsert a batch of events by session key. A login fills in its session
+    without touching `is_active`; a logout deactivates it, creating the row
+    if its login hasn't been written yet.
+    """
+    # One row per session key and kind, or the upsert would hit the same row twice
+    logins = {event['session_key']: event for event in events if event['event'] == 'login'}
+    logouts = {event['session_key']: event for event in events if event['event'] == 'logout'}
+    if logins:
+        UserSession.objects.bulk_create(
+            [_session(event) for event in logins.values()],
+            update_conflicts=True,
+            unique_fields=['session_key'],
+            update_fields=['user', 'ip_address', 'user_agent', 'login_time'],
+        )
+    if logouts:
+        UserSession.objects.bulk_create(
+            [
+                _session(event, is_active=False, logout_time=datetime.fromisoformat(event['at']))
+                for event in logouts.values()
+            ],
+            update_conflicts=True,
+            unique_fields=['session_key'],
+            update_fields=['is_active', 'logout_time'],
+        )
+
+
+def _write_batch(queue, events):
+    """Write a batch; return False if the database is unreachable and the batch went back on the queue."""
+    try:
+        write_events(events)
+        return True
+    except (OperationalError, InterfaceError):
+        logger.exception('Could not write %d buffered user session events; requeued', len(events))
+        queue.push_back(events)
+        return False
+    except DatabaseError:
+        logger.exception('Could not write a batch of buffered user session events; retrying one by one')
+    for event in events:
+        try:
+            write_events([event])
+        except DatabaseError:
+            logger.exception('Dropped user session event %s', event)
+    return True
+
+
+def flush_session_events():
+    """Write everything queued so far; return how many events were taken off the queue."""
+    if not settings.REDIS_URL:
+        return 0
+    queue = get_queue()
+    written = 0
+    while events := queue.pop(BATCH_SIZE):
+        if not _write_batch(queue, events):
+            break
+        written += len(events)
+    return written
+
+
+def _record(event):
+    event['at'] = timezone.now().isoformat()
+    if buffering():
+        get_queue().push(event)
+    else:
+        write_events([event])
+
+
+def record_login(user, session_key, ip_address, user_agent):
+    """Track a login's session."""
+    _record({
+        'event': 'login',
+        'user_id': user.pk,
+        'session_key': session_key,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+    })
+
+
+def record_logout(user, session_key, ip_address, user_agent):
+    """Mark a login's session inactive."""
+    if session_key:
+        _record({
+            'event': 'logout',
+            'user_id': user.pk,
+            'session_key': session_key,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+        })
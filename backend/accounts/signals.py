@@ -0,0 +1,52 @@
+import logging
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from kombu.exceptions import OperationalError as BrokerError
+from .authentication import CLAIM_MODEL_FIELDS, forget_user
+from .models import User
+from .tasks import generate_profile_thumbnails_task
+
+logger = logging.getLogger(__name__)
+
+
+def generate_thumbnails_later(user_id, picture_name):
+    """Queue thumbnail generation; without a reachable broker, generate them right away."""
+    try:
+        # No publish retries or result subscription: an unreachable broker shouldn't hold up the upload
+        generate_profile_thumbnails_task.apply_async((user_id, picture_name), retry=False, ignore_result=True)
+        return
+    except BrokerError:
+        logger.warning('Celery broker unavailable; generating profile thumbnails inline')
+    try:
+        generate_profile_thumbnails_task(user_id, picture_name)
+    except (OSError, ValueError):
+        logger.exception('Could not generate thumbnails for user %s', user_id)
+
+
+def queue_profile_thumbnails(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Generate thumbnails in the background for a new profile picture."""
+    if raw:
+        return
+    if update_fields is not None and 'profile_picture' not in update_fields:
+        return
+    name = instance.profile_picture.name if instance.profile_picture else ''
+    if not name or name == instance.profile_thumbnails_source:
+        return
+    transaction.on_commit(partial(generate_thumbnails_later, instance.pk, name))
+
+
+post_save.connect(queue_profile_thumbnails, sender=User, dispatch_uid='accounts-profile-thumbnails')
+
+
+def forget_cached_user(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep authentication from serving a stale copy of the user or trusting outdated token claims."""
+    if raw:
+        return
+    claims_changed = update_fields is None or bool(CLAIM_MODEL_FIELDS & set(update_fields))
+    # After commit, so no request can cache the old row again in between
+    transaction.on_commit(partial(forget_user, instance.pk, claims_changed=claims_changed))
+
+
+post_save.connect(forget_cached_user, sender=User, dispatch_uid='accounts-forget-cached-user')
+post_delete.connect(forget_cached_user, sender=User, dispatch_uid='accounts-forget-deleted-user')
@@ -0,0 +1,21 @@
+from celery import shared_task
+from .models import User
+from .session_tracking import flush_session_events
+from .thumbnails import generate_thumbnails
+
+
+@shared_task
+def generate_profile_thumbnails_task(user_id, picture_name):
+    """Queued on commit when a profile picture changes, see accounts.signals."""
+    user = User.objects.filter(pk=user_id, profile_picture=picture_name).first()
+    if user is None:
+        return 0  # Picture replaced or removed since the task was queued
+    written = generate_thumbnails(user.profile_picture)
+    User.objects.filter(pk=user_id, profile_picture=picture_name).update(profile_thumbnails_source=picture_name)
+    return len(written)
+
+
+@shared_task
+def flush_session_events_task():
+    """Scheduled by Celery beat, see CELERY_BEAT_SCHEDULE."""
+    return flush_session_events()
@@ -0,0 +1,36 @@
+from django.test import TestCase
+from rest_framework import serializers
+from .models import Department
+from .serializers import DepartmentField
+
+
+class DepartmentFieldTests(TestCase):
+    """Free-text department input resolves to one department or fails."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.computer_science = Department.objects.create(name='Computer Science', code='CS')
+        cls.art = Department.objects.create(name='Art', code='AR')
+        cls.architecture = Department.objects.create(name='Architecture', code='ART')
+    
+    def resolve(self, value):
+        return DepartmentField().to_internal_value(value)
+    
+    def test_name_or_code_in_any_case(self):
+        for value in ('Computer Science', 'computer science', 'CS', ' cs '):
+            self.assertEqual(self.resolve(value), self.computer_science)
+    
+    def test_exact_code_then_exact_name_wins(self):
+        self.assertEqual(self.resolve('ART'), self.architecture)
+        self.assertEqual(self.resolve('Art'), self.art)
+    
+    def test_ambiguous_value_is_rejected(self):
+        with self.assertRaisesMessage(serializers.ValidationError, 'matches more than one department'):
+            self.resolve('art')
+    
+    def test_unknown_value_is_rejected(self):
+        with self.assertRaisesMessage(serializers.ValidationError, 'Unknown department "Mechanical Engineering".'):
+            self.resolve('Mechanical Engineering')
+    
+    def test_blank_value_clears_the_department(self):
+        self.assertIsNone(self.resolve('  '))
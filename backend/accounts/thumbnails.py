@@ -0,0 +1,89 @@
+import hashlib
+import io
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+from blobs.storage import digest_from_name
+
+# variant -> square edge in pixels
+THUMBNAIL_SIZES = {
+    'small': 64,
+    'medium': 256,
+}
+THUMBNAIL_FORMATS = {
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+}
+THUMBNAIL_DIR = 'thumbnails/profiles'
+
+
+def thumbnail_name(source_name, variant, extension):
+    """
+    Storage path of one variant. Derived from the source's content hash, so
+    the path never needs invalidating and identical pictures share thumbnails.
+    """
+    digest = digest_from_name(source_name) or hashlib.sha256(source_name.encode()).hexdigest()
+    return f'{THUMBNAIL_DIR}/{digest[:2]}/{digest}-{THUMBNAIL_SIZES[variant]}.{extension}'
+
+
+def thumbnail_urls(source_name):
+    urls = {}
+    for variant in THUMBNAIL_SIZES:
+        urls[variant] = default_storage.url(thumbnail_name(source_name, variant, 'jpg'))
+        urls[f'{variant}_webp'] = default_storage.url(thumbnail_name(source_name, variant, 'webp'))
+    return urls
+
+
+def profile_picture_url(user, request):
+    """Absolute URL of the original picture."""
+    if not user.profile_picture or request is None:
+        return None
+    return request.build_absolute_uri(user.profile_picture.url)
+
+
+def profile_picture_thumbnails(user, request):
+    """Absolute thumbnail URLs per size; the original picture until the thumbnails exist."""
+    original = profile_picture_url(user, request)
+    if original is None:
+        return None
+    if user.profile_thumbnails_source != user.profile_picture.name:
+        return {variant: original for size in THUMBNAIL_SIZES for variant in (size, f'{size}_webp')}
+    return {
+        variant: request.build_absolute_uri(url)
+        for variant, url in thumbnail_urls(user.profile_picture.name).items()
+    }
+
+
+def _flatten(image):
+    """JPEG has no alpha channel: composite transparent pictures onto white."""
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def generate_thumbnails(field_file):
+    """Write every size/format variant of a stored picture; existing variants are kept."""
+    largest = max(THUMBNAIL_SIZES.values())
+    with field_file.storage.open(field_file.name, 'rb') as source:
+        image = Image.open(source)
+        # Lets the JPEG decoder downscale by up to 8x while decoding
+        image.draft('RGB', (largest * 2, largest * 2))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    
+    written = []
+    # Largest first, each smaller size is resized from the previous one
+    for variant, edge in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+        image = ImageOps.fit(image, (edge, edge), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in THUMBNAIL_FORMATS.items():
+            name = thumbnail_name(field_file.name, variant, extension)
+            if default_storage.exists(name):
+                continue
+            output = io.BytesIO()
+            variant_image = _flatten(image) if image_format == 'JPEG' else image
+            variant_image.save(output, image_format, **options)
+            written.append(default_storage.save(name, ContentFile(output.getvalue())))
+    return written
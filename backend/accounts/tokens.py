@@ -0,0 +1,48 @@
+"""
+Tokens that carry what most requests need to know about their user.
+
+Refresh and access tokens embed the user's role, active flag and department
+when they are issued (and again on every refresh), so ClaimsJWTAuthentication
+can build `request.user` without loading the row. Access tokens also name
+the refresh token they came from, so logging out revokes them too instead of
+leaving them usable until they expire.
+"""
+
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+CLAIM_FIELDS = ('role', 'is_active', 'department_id')
+REFRESH_JTI_CLAIM = 'rjti'
+
+
+def revoked_token_key(refresh_jti):
+    return f'auth:revoked:{refresh_jti}'
+
+
+class ClaimsRefreshToken(RefreshToken):
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.set_user_claims(user)
+        return token
+
+    def set_user_claims(self, user):
+        for field in CLAIM_FIELDS:
+            self[field] = getattr(user, field)
+
+    @property
+    def access_token(self):
+        access = super().access_token
+        access[REFRESH_JTI_CLAIM] = self[jwt_settings.JTI_CLAIM]
+        return access
+
+
+def revoke_refresh_token(refresh):
+    """Blacklist a refresh token and reject the access tokens issued from it until they expire."""
+    refresh.blacklist()
+    cache.set(
+        revoked_token_key(refresh[jwt_settings.JTI_CLAIM]), True,
+        int(jwt_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
@@ -2,12 +2,18 @@ from rest_framework import status, generics, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import login, logout
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
+from functools import partial
+from eduportal.async_views import async_api_view, gather_queries
+from eduportal.replicas import replica_reads
+from eduportal.views import ConditionalGetMixin
 from .models import User, UserProfile, Department, UserSession
+from .session_tracking import record_login, record_logout
+from .tokens import ClaimsRefreshToken, revoke_refresh_token
+from tags.indexing import tagged_object_ids
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
     ExtendedUserProfileSerializer, UserUpdateSerializer, PasswordChangeSerializer,
@@ -15,6 +21,15 @@ from .serializers import (
 )
 
 
+def get_client_ip(request):
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = x_forwarded_for.split(',')[0]
+    else:
+        ip = request.META.get('REMOTE_ADDR')
+    return ip
+
+
 class UserRegistrationView(APIView):
     """User registration endpoint."""
     
@@ -24,7 +39,7 @@ class UserRegistrationView(APIView):
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'user': UserProfileSerializer(user, context={'request': request}).data,
                 'tokens': {
@@ -46,15 +61,15 @@ class UserLoginView(APIView):
             user = serializer.validated_data['user']
             login(request, user)
             
-            # Track session
-            UserSession.objects.create(
-                user=user,
-                session_key=request.session.session_key,
-                ip_address=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            # Track session (may be written in the background, see accounts.session_tracking)
+            record_login(
+                user,
+                request.session.session_key,
+                get_client_ip(request),
+                request.META.get('HTTP_USER_AGENT', '')
             )
             
-            refresh = RefreshToken.for_user(user)
+            refresh = ClaimsRefreshToken.for_user(user)
             return Response({
                 'user': UserProfileSerializer(user, context={'request': request}).data,
                 'tokens': {
@@ -63,14 +78,6 @@ class UserLoginView(APIView):
                 }
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-    
-    def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
 
 
 class UserLogoutView(APIView):
@@ -81,14 +88,15 @@ class UserLogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh"]
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+            revoke_refresh_token(ClaimsRefreshToken(refresh_token))
             
             # Deactivate current session
-            UserSession.objects.filter(
-                user=request.user,
-                session_key=request.session.session_key
-            ).update(is_active=False)
+            record_logout(
+                request.user,
+                request.session.session_key,
+                get_client_ip(request),
+                request.META.get('HTTP_USER_AGENT', '')
+            )
             
             logout(request)
             return Response({'message': 'Successfully logged out.'}, status=status.HTTP_200_OK)
@@ -132,20 +140,31 @@ class PasswordChangeView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(ConditionalGetMixin, generics.ListAPIView):
     """List all users (Admin only)."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserProfileSerializer
     queryset = User.objects.all()
+    search_fields = ['first_name', 'last_name', 'email', 'student_id']
     
     def get_queryset(self):
         if not self.request.user.is_admin():
             return User.objects.none()
-        return User.objects.all().order_by('-date_joined')
+        queryset = User.objects.select_related('department')
+        
+        skill_filter = self.request.query_params.get('skill')
+        if skill_filter:
+            queryset = queryset.filter(profile__id__in=tagged_object_ids('profile', 'skill', skill_filter))
+        
+        interest_filter = self.request.query_params.get('interest')
+        if interest_filter:
+            queryset = queryset.filter(profile__id__in=tagged_object_ids('profile', 'interest', interest_filter))
+        
+        return queryset.order_by('-date_joined')
 
 
-class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
+class UserDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific user (Admin only)."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -155,10 +174,10 @@ class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin():
             return User.objects.none()
-        return User.objects.all()
+        return User.objects.select_related('department')
 
 
-class DepartmentListView(generics.ListCreateAPIView):
+class DepartmentListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create departments."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -168,10 +187,10 @@ class DepartmentListView(generics.ListCreateAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin():
             return Department.objects.none()
-        return Department.objects.all()
+        return Department.objects.select_related('head').annotate(user_count=Count('users')).order_by('name')
 
 
-class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class DepartmentDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific department."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -181,10 +200,10 @@ class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         if not self.request.user.is_admin():
             return Department.objects.none()
-        return Department.objects.all()
+        return Department.objects.select_related('head').annotate(user_count=Count('users')).order_by('name')
 
 
-class UserSessionListView(generics.ListAPIView):
+class UserSessionListView(ConditionalGetMixin, generics.ListAPIView):
     """List user sessions (Admin only)."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -197,9 +216,10 @@ class UserSessionListView(generics.ListAPIView):
         return UserSession.objects.filter(is_active=True).order_by('-login_time')
 
 
-@api_view(['GET'])
+@replica_reads
+@async_api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def user_stats(request):
+async def user_stats(request):
     """Get user statistics (Admin only)."""
     if not request.user.is_admin():
         return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
@@ -207,51 +227,56 @@ def user_stats(request):
     now = timezone.now()
     month_ago = now - timedelta(days=30)
     
-    stats = {
-        'total_users': User.objects.count(),
-        'students_count': User.objects.filter(role='student').count(),
-        'faculty_count': User.objects.filter(role='faculty').count(),
-        'admins_count': User.objects.filter(role='admin').count(),
-        'active_users': User.objects.filter(is_active=True).count(),
-        'new_users_this_month': User.objects.filter(date_joined__gte=month_ago).count(),
-        'departments_count': Department.objects.count(),
-    }
+    user_counts, departments_count = await gather_queries(
+        partial(
+            User.objects.aggregate,
+            total_users=Count('pk'),
+            students_count=Count('pk', filter=Q(role='student')),
+            faculty_count=Count('pk', filter=Q(role='faculty')),
+            admins_count=Count('pk', filter=Q(role='admin')),
+            active_users=Count('pk', filter=Q(is_active=True)),
+            new_users_this_month=Count('pk', filter=Q(date_joined__gte=month_ago)),
+        ),
+        Department.objects.count,
+    )
+    stats = {**user_counts, 'departments_count': departments_count}
     
     serializer = UserStatsSerializer(stats)
     return Response(serializer.data)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def dashboard_data(request):
-    """Get dashboard data based on user role."""
-    user = request.user
+async def dashboard_overview(user):
+    """Role-specific dashboard summary (shared with the combined dashboard)."""
     
     if user.is_admin():
         # Admin dashboard data
-        return Response({
+        user_counts, active_sessions = await gather_queries(
+            partial(
+                User.objects.aggregate,
+                total_users=Count('pk'),
+                students_count=Count('pk', filter=Q(role='student')),
+                faculty_count=Count('pk', filter=Q(role='faculty')),
+            ),
+            UserSession.objects.filter(is_active=True).count,
+        )
+        return {
             'role': 'admin',
-            'stats': {
-                'total_users': User.objects.count(),
-                'students_count': User.objects.filter(role='student').count(),
-                'faculty_count': User.objects.filter(role='faculty').count(),
-                'active_sessions': UserSession.objects.filter(is_active=True).count(),
-            }
-        })
+            'stats': {**user_counts, 'active_sessions': active_sessions}
+        }
     elif user.is_faculty():
         # Faculty dashboard data
-        return Response({
+        return {
             'role': 'faculty',
             'stats': {
                 'pending_reviews': 0,  # Will be implemented in certificates app
                 'total_reviews': 0,
                 'students_mentored': 0,
             }
-        })
+        }
     else:
         # Student dashboard data
-        profile = user.profile
-        return Response({
+        profile = await UserProfile.objects.aget(user=user)
+        return {
             'role': 'student',
             'stats': {
                 'total_certificates': profile.certificates_count,
@@ -259,4 +284,12 @@ def dashboard_data(request):
                 'volunteering_hours': profile.volunteering_hours,
                 'total_points': profile.total_points,
             }
-        })
+        }
+
+
+@replica_reads
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+async def dashboard_data(request):
+    """Get dashboard data based on user role."""
+    return Response(await dashboard_overview(request.user))
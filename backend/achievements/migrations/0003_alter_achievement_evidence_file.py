@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:10
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0002_achievement_achievement_user_id_2bb3bb_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='achievement',
+            name='evidence_file',
+            field=models.FileField(blank=True, null=True, storage=blobs.storage.get_content_addressed_storage, upload_to='achievements/evidence/'),
+        ),
+    ]
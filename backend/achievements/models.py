@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from blobs.storage import get_content_addressed_storage
 
 
 class AchievementCategory(models.Model):
@@ -47,7 +48,7 @@ class Achievement(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     points = models.PositiveIntegerField(default=0)
     evidence_url = models.URLField(blank=True)
-    evidence_file = models.FileField(upload_to='achievements/evidence/', blank=True, null=True)
+    evidence_file = models.FileField(upload_to='achievements/evidence/', storage=get_content_addressed_storage, blank=True, null=True)
     verified_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.SET_NULL, 
@@ -68,6 +69,9 @@ class Achievement(models.Model):
         verbose_name = 'Achievement'
         verbose_name_plural = 'Achievements'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.title}"
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Value
+from accounts.serializers import UserSummarySerializer
+from eduportal.serializers import SparseFieldsMixin, ValuesSerializer, count_subquery
 from .models import (
     AchievementCategory, Achievement, AchievementComment, 
     AchievementLike, AchievementShare, AchievementBadge, UserBadge
@@ -8,7 +11,7 @@ from .models import (
 User = get_user_model()
 
 
-class AchievementCategorySerializer(serializers.ModelSerializer):
+class AchievementCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievement categories."""
     
     class Meta:
@@ -16,7 +19,7 @@ class AchievementCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'icon', 'color', 'points_multiplier', 'is_active']
 
 
-class AchievementSerializer(serializers.ModelSerializer):
+class AchievementSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievements."""
     
     user_name = serializers.SerializerMethodField()
@@ -37,6 +40,11 @@ class AchievementSerializer(serializers.ModelSerializer):
             'likes_count', 'comments_count', 'is_liked'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'verified_by', 'verified_at']
+        expandable_fields = {
+            'user': UserSummarySerializer,
+            'category': AchievementCategorySerializer,
+            'verified_by': UserSummarySerializer,
+        }
     
     def get_user_name(self, obj):
         return obj.user.full_name
@@ -67,6 +75,64 @@ class AchievementSerializer(serializers.ModelSerializer):
         return False
 
 
+class AchievementValuesSerializer(ValuesSerializer):
+    """Read-only list serializer with AchievementSerializer's output, built from `.values()` rows."""
+    
+    values_fields = {
+        'id': ('id',),
+        'user': ('user_id',),
+        'user_name': ('user__first_name', 'user__last_name'),
+        'title': ('title',),
+        'description': ('description',),
+        'category': ('category_id',),
+        'category_name': ('category__name',),
+        'status': ('status',),
+        'priority': ('priority',),
+        'points': ('points',),
+        'evidence_url': ('evidence_url',),
+        'evidence_file': ('evidence_file',),
+        'evidence_file_url': ('evidence_file',),
+        'verified_by': ('verified_by_id',),
+        'verified_by_name': ('verified_by__first_name', 'verified_by__last_name'),
+        'verified_at': ('verified_at',),
+        'rejection_reason': ('rejection_reason',),
+        'skills_gained': ('skills_gained',),
+        'tags': ('tags',),
+        'is_public': ('is_public',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'likes_count': ('likes_count',),
+        'comments_count': ('comments_count',),
+        'is_liked': ('is_liked',),
+    }
+    datetime_fields = ('verified_at', 'created_at', 'updated_at')
+    evidence_storage = Achievement._meta.get_field('evidence_file').storage
+    
+    @classmethod
+    def annotations(cls, context):
+        user = context['request'].user
+        return {
+            'likes_count': count_subquery(AchievementLike, 'achievement'),
+            'comments_count': count_subquery(AchievementComment, 'achievement'),
+            'is_liked': (
+                Exists(AchievementLike.objects.filter(achievement=OuterRef('pk'), user=user))
+                if user.is_authenticated else Value(False)
+            ),
+        }
+    
+    def get_user_name(self, row):
+        return self.full_name(row['user__first_name'], row['user__last_name'])
+    
+    def get_verified_by_name(self, row):
+        return self.full_name(row['verified_by__first_name'], row['verified_by__last_name'])
+    
+    def get_evidence_file(self, row):
+        return self.file_url(self.evidence_storage, row['evidence_file'])
+    
+    def get_evidence_file_url(self, row):
+        return self.get_evidence_file(row) if self.request is not None else None
+
+
 class AchievementCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating achievements."""
     
@@ -105,7 +171,7 @@ class AchievementApprovalSerializer(serializers.Serializer):
         return attrs
 
 
-class AchievementCommentSerializer(serializers.ModelSerializer):
+class AchievementCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievement comments."""
     
     user_name = serializers.SerializerMethodField()
@@ -123,7 +189,7 @@ class AchievementCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class AchievementLikeSerializer(serializers.ModelSerializer):
+class AchievementLikeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievement likes."""
     
     class Meta:
@@ -136,7 +202,7 @@ class AchievementLikeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class AchievementShareSerializer(serializers.ModelSerializer):
+class AchievementShareSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievement shares."""
     
     class Meta:
@@ -149,7 +215,7 @@ class AchievementShareSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class AchievementBadgeSerializer(serializers.ModelSerializer):
+class AchievementBadgeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for achievement badges."""
     
     class Meta:
@@ -157,7 +223,7 @@ class AchievementBadgeSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'icon', 'color', 'criteria', 'is_active']
 
 
-class UserBadgeSerializer(serializers.ModelSerializer):
+class UserBadgeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for user badges."""
     
     badge = AchievementBadgeSerializer(read_only=True)
@@ -192,3 +258,30 @@ class AchievementAnalyticsSerializer(serializers.Serializer):
     popular_categories = serializers.ListField()
     average_points_per_achievement = serializers.FloatField()
     approval_rate = serializers.FloatField()
+
+
+class DepartmentAchievementStatsSerializer(serializers.Serializer):
+    """Serializer for per-department achievement statistics."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    contributors_count = serializers.IntegerField()
+    total_achievements = serializers.IntegerField()
+    approved_achievements = serializers.IntegerField()
+    pending_achievements = serializers.IntegerField()
+    rejected_achievements = serializers.IntegerField()
+    total_points = serializers.IntegerField()
+    approval_rate = serializers.FloatField()
+
+
+class DepartmentAchievementAnalyticsSerializer(serializers.Serializer):
+    """Serializer for achievement analytics scoped to one department."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    stats = serializers.DictField()
+    achievements_by_category = serializers.DictField()
+    achievements_by_month = serializers.DictField()
+    top_achievers = serializers.ListField()
+    average_points_per_achievement = serializers.FloatField()
+    approval_rate = serializers.FloatField()
@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from .models import Achievement, AchievementCategory, AchievementComment, AchievementLike
+from .serializers import AchievementSerializer, AchievementValuesSerializer
+
+
+class AchievementValuesSerializerTests(TestCase):
+    """AchievementValuesSerializer must render exactly what AchievementSerializer does."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@test.local', username='student', password='pw', role='student',
+            first_name='Ada', last_name='Lovelace',
+        )
+        cls.faculty = User.objects.create_user(
+            email='faculty@test.local', username='faculty', password='pw', role='faculty', first_name='Alan',
+        )
+        category = AchievementCategory.objects.create(name='Academic')
+        common = {'user': cls.student, 'description': 'd', 'category': category, 'tags': ['python']}
+        verified = Achievement.objects.create(
+            title='Verified', status='approved', verified_by=cls.faculty, verified_at=timezone.now(),
+            skills_gained=['research'], **common
+        )
+        Achievement.objects.create(title='No verifier, no file', **common)
+        with_file = Achievement.objects.create(title='Empty file name', **common)
+        # Set file names directly; saving through the storage would need the blob on disk
+        Achievement.objects.filter(pk=with_file.pk).update(evidence_file='')
+        Achievement.objects.filter(pk=verified.pk).update(evidence_file=f'blobs/aa/bb/{"0" * 64}.pdf')
+        AchievementLike.objects.create(achievement=verified, user=cls.student)
+        AchievementLike.objects.create(achievement=with_file, user=cls.faculty)
+        AchievementComment.objects.create(achievement=verified, user=cls.faculty, comment='Nice')
+    
+    def assertSameOutput(self, viewer, **params):
+        request = Request(APIRequestFactory().get('/api/achievements/', params))
+        request.user = viewer
+        context = {'request': request}
+        queryset = Achievement.objects.select_related('user', 'category', 'verified_by').order_by('id')
+        expected = [dict(item) for item in AchievementSerializer(queryset, many=True, context=context).data]
+        values = AchievementValuesSerializer.values_queryset(queryset, context)
+        self.assertEqual(list(AchievementValuesSerializer(values, many=True, context=context).data), expected)
+    
+    def test_same_output_for_liking_viewer(self):
+        self.assertSameOutput(self.student)
+    
+    def test_same_output_for_other_viewer(self):
+        self.assertSameOutput(self.faculty)
+    
+    def test_same_output_for_sparse_fields(self):
+        self.assertSameOutput(self.student, fields='id,verified_by_name,evidence_file_url,is_liked')
+        self.assertSameOutput(self.student, omit='description,likes_count')
@@ -25,4 +25,6 @@ urlpatterns = [
     # Statistics and Analytics
     path('stats/', views.achievement_stats, name='achievement-stats'),
     path('analytics/', views.achievement_analytics, name='achievement-analytics'),
+    path('analytics/departments/', views.department_achievement_stats, name='department-achievement-stats'),
+    path('analytics/departments/<int:department_id>/', views.department_achievement_analytics, name='department-achievement-analytics'),
 ]
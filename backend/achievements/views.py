@@ -1,9 +1,19 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
 from django.db.models import Count, Q, Avg, Sum
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import timedelta
+from functools import partial
+from accounts.models import Department
+from tags.indexing import tagged_object_ids
+from eduportal.async_views import async_api_view, gather_queries
+from eduportal.replicas import replica_reads
+from eduportal.throttling import request_cost
+from eduportal.views import ConditionalGetMixin, ValuesListMixin
 from .models import (
     AchievementCategory, Achievement, AchievementComment, 
     AchievementLike, AchievementShare, AchievementBadge, UserBadge
@@ -12,11 +22,13 @@ from .serializers import (
     AchievementCategorySerializer, AchievementSerializer, AchievementCreateSerializer,
     AchievementUpdateSerializer, AchievementApprovalSerializer, AchievementCommentSerializer,
     AchievementLikeSerializer, AchievementShareSerializer, AchievementBadgeSerializer,
-    UserBadgeSerializer, AchievementStatsSerializer, AchievementAnalyticsSerializer
+    UserBadgeSerializer, AchievementStatsSerializer, AchievementAnalyticsSerializer,
+    DepartmentAchievementStatsSerializer, DepartmentAchievementAnalyticsSerializer,
+    AchievementValuesSerializer
 )
 
 
-class AchievementCategoryListView(generics.ListAPIView):
+class AchievementCategoryListView(ConditionalGetMixin, generics.ListAPIView):
     """List all achievement categories."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -24,10 +36,13 @@ class AchievementCategoryListView(generics.ListAPIView):
     queryset = AchievementCategory.objects.filter(is_active=True)
 
 
-class AchievementListView(generics.ListCreateAPIView):
+class AchievementListView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List and create achievements."""
     
     permission_classes = [permissions.IsAuthenticated]
+    values_serializer_class = AchievementValuesSerializer
+    search_fields = ['title', 'description', 'category__name']
+    etag_related = ('likes', 'comments')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -64,14 +79,24 @@ class AchievementListView(generics.ListCreateAPIView):
         if user_filter and (user.is_faculty() or user.is_admin()):
             queryset = queryset.filter(user_id=user_filter)
         
+        # Tag/skill filters resolve through the tag index instead of scanning JSON
+        tag_filter = self.request.query_params.get('tag')
+        if tag_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('achievement', 'tag', tag_filter))
+        
+        skill_filter = self.request.query_params.get('skill')
+        if skill_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('achievement', 'skill', skill_filter))
+        
         return queryset.order_by('-created_at')
 
 
-class AchievementDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AchievementDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific achievement."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AchievementSerializer
+    etag_related = ('likes', 'comments')
     
     def get_queryset(self):
         user = self.request.user
@@ -123,7 +148,7 @@ class AchievementApprovalView(generics.UpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AchievementCommentListView(generics.ListCreateAPIView):
+class AchievementCommentListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create comments for an achievement."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -186,7 +211,7 @@ class AchievementShareView(generics.CreateAPIView):
         serializer.save(achievement=achievement)
 
 
-class AchievementBadgeListView(generics.ListAPIView):
+class AchievementBadgeListView(ConditionalGetMixin, generics.ListAPIView):
     """List all achievement badges."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -194,7 +219,7 @@ class AchievementBadgeListView(generics.ListAPIView):
     queryset = AchievementBadge.objects.filter(is_active=True)
 
 
-class UserBadgeListView(generics.ListAPIView):
+class UserBadgeListView(ConditionalGetMixin, generics.ListAPIView):
     """List user's earned badges."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -207,48 +232,54 @@ class UserBadgeListView(generics.ListAPIView):
         return UserBadge.objects.filter(user=self.request.user).select_related('badge')
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def achievement_stats(request):
-    """Get achievement statistics."""
-    user = request.user
+async def achievement_stats_data(user):
+    """Achievement statistics as the user's role sees them (shared with the combined dashboard)."""
+    this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
     if user.is_student():
         # Student stats
         achievements = Achievement.objects.filter(user=user)
-        this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        stats = {
-            'total_achievements': achievements.count(),
-            'approved_achievements': achievements.filter(status='approved').count(),
-            'pending_achievements': achievements.filter(status='pending').count(),
-            'rejected_achievements': achievements.filter(status='rejected').count(),
-            'total_points': achievements.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'this_month_achievements': achievements.filter(created_at__gte=this_month).count(),
-            'categories_count': achievements.values('category').distinct().count(),
-            'badges_earned': UserBadge.objects.filter(user=user).count(),
-        }
+        categories = achievements.values('category').distinct()
+        badges = UserBadge.objects.filter(user=user)
     else:
         # Admin/Faculty stats
-        this_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        stats = {
-            'total_achievements': Achievement.objects.count(),
-            'approved_achievements': Achievement.objects.filter(status='approved').count(),
-            'pending_achievements': Achievement.objects.filter(status='pending').count(),
-            'rejected_achievements': Achievement.objects.filter(status='rejected').count(),
-            'total_points': Achievement.objects.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'this_month_achievements': Achievement.objects.filter(created_at__gte=this_month).count(),
-            'categories_count': AchievementCategory.objects.filter(is_active=True).count(),
-            'badges_earned': UserBadge.objects.count(),
-        }
+        achievements = Achievement.objects.all()
+        categories = AchievementCategory.objects.filter(is_active=True)
+        badges = UserBadge.objects.all()
     
-    serializer = AchievementStatsSerializer(stats)
-    return Response(serializer.data)
+    totals, categories_count, badges_earned = await gather_queries(
+        partial(
+            achievements.aggregate,
+            total_achievements=Count('pk'),
+            approved_achievements=Count('pk', filter=Q(status='approved')),
+            pending_achievements=Count('pk', filter=Q(status='pending')),
+            rejected_achievements=Count('pk', filter=Q(status='rejected')),
+            total_points=Sum('points', filter=Q(status='approved')),
+            this_month_achievements=Count('pk', filter=Q(created_at__gte=this_month)),
+        ),
+        categories.count,
+        badges.count,
+    )
+    stats = {
+        **totals,
+        'total_points': totals['total_points'] or 0,
+        'categories_count': categories_count,
+        'badges_earned': badges_earned,
+    }
+    
+    return AchievementStatsSerializer(stats).data
 
 
+@replica_reads
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+async def achievement_stats(request):
+    """Get achievement statistics."""
+    return Response(await achievement_stats_data(request.user))
+
+
+@replica_reads
+@request_cost(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def achievement_analytics(request):
@@ -317,3 +348,129 @@ def achievement_analytics(request):
     
     serializer = AchievementAnalyticsSerializer(analytics)
     return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_achievement_stats(request):
+    """Get achievement statistics for every department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    cache_key = 'achievements:departments'
+    stats = cache.get(cache_key)
+    if stats is None:
+        # One grouped query across the department -> users -> achievements join
+        approved = Q(users__achievements__status='approved')
+        departments = Department.objects.annotate(
+            contributors_count=Count('users__achievements__user', distinct=True),
+            total_achievements=Count('users__achievements'),
+            approved_achievements=Count('users__achievements', filter=approved),
+            pending_achievements=Count('users__achievements', filter=Q(users__achievements__status='pending')),
+            rejected_achievements=Count('users__achievements', filter=Q(users__achievements__status='rejected')),
+            total_points=Sum('users__achievements__points', filter=approved),
+        ).order_by('name')
+        
+        stats = []
+        for department in departments:
+            total = department.total_achievements
+            stats.append({
+                'department_id': department.id,
+                'department_name': department.name,
+                'contributors_count': department.contributors_count,
+                'total_achievements': total,
+                'approved_achievements': department.approved_achievements,
+                'pending_achievements': department.pending_achievements,
+                'rejected_achievements': department.rejected_achievements,
+                'total_points': department.total_points or 0,
+                'approval_rate': round(department.approved_achievements / total * 100, 2) if total > 0 else 0,
+            })
+        cache.set(cache_key, stats, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentAchievementStatsSerializer(stats, many=True)
+    return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_achievement_analytics(request, department_id):
+    """Get achievement analytics for a single department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        department = Department.objects.get(id=department_id)
+    except Department.DoesNotExist:
+        return Response({'error': 'Department not found.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    cache_key = f'achievements:department:{department.id}'
+    analytics = cache.get(cache_key)
+    if analytics is None:
+        achievements = Achievement.objects.filter(user__department=department)
+        approved = Q(status='approved')
+        
+        totals = achievements.aggregate(
+            total_achievements=Count('id'),
+            approved_achievements=Count('id', filter=approved),
+            pending_achievements=Count('id', filter=Q(status='pending')),
+            rejected_achievements=Count('id', filter=Q(status='rejected')),
+            total_points=Sum('points', filter=approved),
+            average_points=Avg('points', filter=approved),
+            contributors_count=Count('user', distinct=True),
+        )
+        
+        achievements_by_category = {
+            row['category__name']: row['count']
+            for row in achievements.values('category__name').annotate(count=Count('id')).order_by('-count')
+        }
+        
+        year_ago = timezone.now() - timedelta(days=365)
+        achievements_by_month = {
+            row['month'].strftime('%Y-%m'): row['count']
+            for row in achievements.filter(created_at__gte=year_ago).annotate(
+                month=TruncMonth('created_at')
+            ).values('month').annotate(count=Count('id')).order_by('-month')
+        }
+        
+        top_achievers = [
+            {
+                'user_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+                'total_points': row['total_points'],
+            }
+            for row in achievements.filter(status='approved').values(
+                'user', 'user__first_name', 'user__last_name'
+            ).annotate(total_points=Sum('points')).order_by('-total_points')[:10]
+        ]
+        
+        total = totals['total_achievements']
+        approval_rate = (totals['approved_achievements'] / total * 100) if total > 0 else 0
+        
+        analytics = {
+            'department_id': department.id,
+            'department_name': department.name,
+            'stats': {
+                'contributors_count': totals['contributors_count'],
+                'total_achievements': total,
+                'approved_achievements': totals['approved_achievements'],
+                'pending_achievements': totals['pending_achievements'],
+                'rejected_achievements': totals['rejected_achievements'],
+                'total_points': totals['total_points'] or 0,
+            },
+            'achievements_by_category': achievements_by_category,
+            'achievements_by_month': achievements_by_month,
+            'top_achievers': top_achievers,
+            'average_points_per_achievement': round(totals['average_points'] or 0, 2),
+            'approval_rate': round(approval_rate, 2),
+        }
+        cache.set(cache_key, analytics, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentAchievementAnalyticsSerializer(analytics)
+    return Response(serializer.data)
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class Blob(models.Model):
+    """One stored file body, shared by every upload with the same content."""
+    
+    name = models.CharField(max_length=255, unique=True)  # Storage path, derived from the SHA-256
+    sha256 = models.CharField(max_length=64, db_index=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'blobs'
+        verbose_name = 'Blob'
+        verbose_name_plural = 'Blobs'
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
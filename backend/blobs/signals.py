@@ -0,0 +1,81 @@
+from functools import lru_cache
+from django.apps import apps
+from django.db.models import FileField
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_init, pre_save, post_save, post_delete
+from .storage import ContentAddressedStorage
+
+
+@lru_cache(maxsize=None)
+def _blob_fields(model):
+    return tuple(
+        field for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    )
+
+
+def _stored_name(value):
+    """Name of an already stored file; raw uploads and empty values have none."""
+    if isinstance(value, str):
+        return value or None
+    if isinstance(value, FieldFile) and value._committed:
+        return value.name or None
+    return None
+
+
+def remember_file_names(sender, instance, **kwargs):
+    """Note the stored names as loaded, to release them when replaced."""
+    instance._blob_names = {
+        field.attname: _stored_name(instance.__dict__[field.attname])
+        for field in _blob_fields(sender)
+        if field.attname in instance.__dict__  # deferred fields are never saved, so never tracked
+    }
+
+
+def note_pending_uploads(sender, instance, **kwargs):
+    # Uploads not yet written are counted by the storage itself when the field saves them
+    instance._blob_uploads = {
+        field.attname for field in _blob_fields(sender)
+        if field.attname in instance.__dict__
+        and getattr(instance, field.attname)
+        and not getattr(instance, field.attname)._committed
+    }
+
+
+def release_replaced_files(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_blob_names', {})
+    uploads = getattr(instance, '_blob_uploads', set())
+    for field in _blob_fields(sender):
+        if field.attname not in previous:
+            continue
+        if update_fields is not None and field.name not in update_fields:
+            continue
+        old = previous[field.attname]
+        new = getattr(instance, field.attname).name or None
+        uploaded = field.attname in uploads
+        if new and new != old and not uploaded:
+            field.storage.acquire(new)
+        if old and (new != old or uploaded):
+            field.storage.release(old)
+    remember_file_names(sender, instance)
+
+
+def release_deleted_files(sender, instance, **kwargs):
+    for field in _blob_fields(sender):
+        name = _stored_name(instance.__dict__.get(field.attname))
+        if name:
+            field.storage.release(name)
+
+
+def connect_file_fields():
+    """Track references for every model field stored in ContentAddressedStorage."""
+    for model in apps.get_models():
+        if not _blob_fields(model):
+            continue
+        label = model._meta.label
+        post_init.connect(remember_file_names, sender=model, dispatch_uid=f'blobs-init-{label}')
+        pre_save.connect(note_pending_uploads, sender=model, dispatch_uid=f'blobs-pre-save-{label}')
+        post_save.connect(release_replaced_files, sender=model, dispatch_uid=f'blobs-post-save-{label}')
+        post_delete.connect(release_deleted_files, sender=model, dispatch_uid=f'blobs-delete-{label}')
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import tempfile
+from functools import partial
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = 'blobs/'
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_file(file):
+    """
+    SHA-256 of an uploaded/stored file, read chunk by chunk (chunks() rewinds
+    first). Remembered on the file, so ContentAddressedStorage doesn't hash
+    an upload that validation already hashed.
+    """
+    if getattr(file, 'sha256', None) is None:
+        digest = hashlib.sha256()
+        for chunk in file.chunks(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        file.seek(0)
+        file.sha256 = digest.hexdigest()
+    return file.sha256
+
+
+def hash_path(path):
+    """SHA-256 of a file on disk, read chunk by chunk."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def blob_name(sha256, extension):
+    return f'{BLOB_PREFIX}{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}'
+
+
+def digest_from_name(name):
+    """SHA-256 encoded in a blob name, or None for files stored outside the blob area."""
+    if not name or not name.startswith(BLOB_PREFIX):
+        return None
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File storage that keeps one copy of each distinct file body.
+
+    Uploads are hashed while they are streamed to a temporary file, then
+    moved to a path derived from their SHA-256; identical uploads reuse
+    the existing file and only bump the Blob reference count. `delete()`
+    drops one reference and removes the file with the last one.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name comes from the content hash in _save
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1].lower()
+        directory = self.path(BLOB_PREFIX)
+        os.makedirs(directory, exist_ok=True)
+
+        known_sha256 = getattr(content, 'sha256', None)  # Set by hash_file()
+        digest = None if known_sha256 else hashlib.sha256()
+        size = 0
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix='.upload')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    if digest is not None:
+                        digest.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+            sha256 = known_sha256 or digest.hexdigest()
+            return self._commit(temp_path, sha256, size, extension, references=1)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def adopt(self, path, extension, sha256=None):
+        """
+        Store a file already written under MEDIA_ROOT (e.g. an assembled
+        chunked upload) by hard-linking it into the blob area, without
+        copying. The original stays in place for the caller to remove once
+        the record using the blob is saved.
+
+        No reference is counted: the record the returned name is saved on
+        acquires it through the signals in blobs.signals.
+        """
+        sha256 = sha256 or hash_path(path)
+        link_path = f'{path}.adopting'
+        os.link(path, link_path)
+        try:
+            return self._commit(link_path, sha256, os.path.getsize(path), extension.lower(), references=0)
+        finally:
+            if os.path.exists(link_path):
+                os.remove(link_path)
+
+    def _commit(self, temp_path, sha256, size, extension, references):
+        from .models import Blob
+
+        final_name = blob_name(sha256, extension)
+        final_path = self.path(final_name)
+        with transaction.atomic():
+            blob, _ = Blob.objects.select_for_update().get_or_create(
+                name=final_name, defaults={'sha256': sha256, 'size': size}
+            )
+            if not os.path.exists(final_path):
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                os.replace(temp_path, final_path)
+            if references:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + references)
+        return final_name
+
+    def acquire(self, name):
+        """Count another reference to an already stored blob (e.g. a copied file name)."""
+        from .models import Blob
+        if digest_from_name(name):
+            Blob.objects.filter(name=name).update(ref_count=F('ref_count') + 1)
+
+    def release(self, name):
+        """
+        Drop one reference to a blob; the file goes away with the last one.
+        
+        Files stored before content addressing (outside BLOB_PREFIX) are left
+        alone, as they were never deleted with their records before.
+        """
+        from .models import Blob
+        if not digest_from_name(name):
+            return
+        with transaction.atomic():
+            blob = Blob.objects.select_for_update().filter(name=name).first()
+            if blob is not None and blob.ref_count > 1:
+                Blob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') - 1)
+                return
+            if blob is not None:
+                blob.delete()
+            # Only once the blob row is gone for good; a rollback keeps both
+            transaction.on_commit(partial(self.delete_if_unreferenced, name))
+    
+    def delete_if_unreferenced(self, name):
+        """Remove a blob's file if no Blob row claims it (e.g. one whose creation was rolled back)."""
+        from .models import Blob
+        if not Blob.objects.filter(name=name).exists():
+            self.delete(name)
+
+
+content_addressed_storage = ContentAddressedStorage()
+
+
+def get_content_addressed_storage():
+    """Callable for FileField(storage=...) so migrations don't serialize the instance."""
+    return content_addressed_storage
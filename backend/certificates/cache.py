@@ -0,0 +1,14 @@
+from django.core.cache import cache
+
+DEPARTMENT_STATS_CACHE_KEY = 'certificates:departments'
+
+
+def department_analytics_cache_key(department_id):
+    return f'certificates:department:{department_id}'
+
+
+def invalidate_department_analytics(department_ids):
+    """Forget the cached certificate stats of every department and the analytics of these ones."""
+    cache.delete_many(
+        [DEPARTMENT_STATS_CACHE_KEY] + [department_analytics_cache_key(department_id) for department_id in set(department_ids)]
+    )
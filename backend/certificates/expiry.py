@@ -0,0 +1,137 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from accounts.models import User
+from dashboard.cache import invalidate_dashboards, invalidate_staff_dashboards
+from feed.views import feed_cache_key
+from notifications.live import publish_notifications
+from notifications.models import Notification, NotificationType
+from .cache import invalidate_department_analytics
+from .models import Certificate
+from .verification import invalidate_certificates
+
+EXPIRE_BATCH_SIZE = 1000
+NOTICE_BATCH_SIZE = 1000
+
+
+def expire_certificates(today=None):
+    """
+    Flag every certificate whose expiry date has passed and drop the cached
+    pages that showed them as current.
+    
+    Rows are found through the partial index and flipped in batches claimed
+    with SKIP LOCKED where supported, so a large backlog never holds every
+    row lock at once and overlapping runs don't wait on each other.
+    """
+    today = today or timezone.now().date()
+    expired = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Certificate.objects.filter(is_expired=False, expiry_date__lt=today)
+                .select_for_update(skip_locked=True)
+                .order_by('expiry_date', 'id')
+                .values_list('id', 'user_id')[:EXPIRE_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            Certificate.objects.filter(id__in=[pk for pk, _ in batch]).update(
+                is_expired=True, updated_at=timezone.now()
+            )
+        forget_cached_certificates(batch)
+        expired += len(batch)
+        if len(batch) < EXPIRE_BATCH_SIZE:
+            break
+    return expired
+
+
+def forget_cached_certificates(certificates):
+    """
+    Drop what post_save would have for (id, user_id) pairs changed by an
+    UPDATE: owners' dashboards and feeds, the faculty/admin totals,
+    verification payloads, and the certificate analytics of the owners'
+    departments.
+    """
+    user_ids = {user_id for _, user_id in certificates}
+    invalidate_dashboards(user_ids)
+    invalidate_staff_dashboards()
+    invalidate_certificates([pk for pk, _ in certificates])
+    cache.delete_many([feed_cache_key(user_id) for user_id in user_ids])
+    invalidate_department_analytics(
+        User.objects.filter(id__in=user_ids, department__isnull=False).values_list('department_id', flat=True)
+    )
+
+
+def _expiring_soon(today, notice_days):
+    return Certificate.objects.filter(
+        is_expired=False,
+        status='approved',
+        expiry_date__gte=today,
+        expiry_date__lte=today + timedelta(days=notice_days),
+    ).filter(
+        # Not yet notified for the current expiry date (a renewal re-arms the notice)
+        Q(expiry_notified_for__isnull=True) | ~Q(expiry_notified_for=F('expiry_date'))
+    )
+
+
+def _notice(certificate, notification_type, today):
+    days_left = (certificate['expiry_date'] - today).days
+    when = 'today' if days_left == 0 else f"in {days_left} day{'s' if days_left != 1 else ''}"
+    return Notification(
+        user_id=certificate['user_id'],
+        type=notification_type,
+        title='Certificate expiring soon',
+        message=f"Your certificate \"{certificate['title']}\" expires {when} ({certificate['expiry_date']:%d %b %Y}).",
+        priority='high' if days_left <= 7 else 'medium',
+        action_text='View certificate',
+        metadata={'certificate_id': certificate['id'], 'expiry_date': certificate['expiry_date'].isoformat()},
+    )
+
+
+def notify_expiring_certificates(today=None, notice_days=None):
+    """
+    Send one expiring-soon notification per certificate and expiry date.
+
+    Rows are claimed in batches with SKIP LOCKED where supported, so
+    overlapping runs never notify the same certificate twice.
+    """
+    today = today or timezone.now().date()
+    notice_days = settings.CERTIFICATE_EXPIRY_NOTICE_DAYS if notice_days is None else notice_days
+    notification_type, _ = NotificationType.objects.get_or_create(
+        name='certificate',
+        defaults={'description': 'Certificate notifications', 'icon': '📜', 'color': '#10B981'},
+    )
+
+    sent = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                _expiring_soon(today, notice_days)
+                .select_for_update(skip_locked=True)
+                .order_by('expiry_date', 'id')
+                .values('id', 'user_id', 'title', 'expiry_date')[:NOTICE_BATCH_SIZE]
+            )
+            if not batch:
+                break
+            publish_notifications(
+                Notification.objects.bulk_create([_notice(row, notification_type, today) for row in batch])
+            )
+            Certificate.objects.filter(id__in=[row['id'] for row in batch]).update(
+                expiry_notified_for=F('expiry_date')
+            )
+        invalidate_dashboards(row['user_id'] for row in batch)
+        sent += len(batch)
+        if len(batch) < NOTICE_BATCH_SIZE:
+            break
+    return sent
+
+
+def sweep_certificate_expiry(today=None):
+    """Run both sweeper steps; safe to repeat as often as needed."""
+    return {
+        'expired': expire_certificates(today),
+        'notified': notify_expiring_certificates(today),
+    }
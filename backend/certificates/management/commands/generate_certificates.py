@@ -0,0 +1,56 @@
+import csv
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from accounts.models import User
+from certificates.models import CertificateCategory, CertificateTemplate
+from certificates.rendering import generate_certificates
+
+
+class Command(BaseCommand):
+    help = (
+        'Render and issue certificates from a template for every row of a CSV. '
+        'The CSV needs an "email" column; other columns (e.g. "name") override template fields.'
+    )
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--template', required=True, help='Certificate template name')
+        parser.add_argument('--recipients', required=True, help='Path to the recipients CSV')
+        parser.add_argument('--title', required=True)
+        parser.add_argument('--category', required=True, help='Certificate category name')
+        parser.add_argument('--issuer', required=True)
+        parser.add_argument('--issue-date', type=date.fromisoformat, default=date.today())
+        parser.add_argument('--issued-by', help='Email of the faculty/admin issuing the certificates')
+        parser.add_argument('--workers', type=int, default=None, help='Render processes (default: CPU count)')
+    
+    def handle(self, *args, **options):
+        try:
+            template = CertificateTemplate.objects.get(name=options['template'], is_active=True)
+            category = CertificateCategory.objects.get(name=options['category'])
+            issued_by = User.objects.get(email=options['issued_by']) if options['issued_by'] else None
+        except (CertificateTemplate.DoesNotExist, CertificateCategory.DoesNotExist, User.DoesNotExist) as exc:
+            raise CommandError(str(exc))
+        
+        with open(options['recipients'], newline='', encoding='utf-8') as recipients_file:
+            rows = list(csv.DictReader(recipients_file))
+        
+        emails = [row.pop('email').strip() for row in rows]
+        user_ids = dict(User.objects.filter(email__in=emails).values_list('email', 'id'))
+        missing = sorted(set(emails) - set(user_ids))
+        if missing:
+            raise CommandError(f"Unknown recipient emails: {', '.join(missing[:10])}")
+        
+        recipients = [
+            {'user_id': user_ids[email], 'fields': {key: value for key, value in row.items() if value}}
+            for email, row in zip(emails, rows)
+        ]
+        batch, created = generate_certificates(
+            template, recipients,
+            title=options['title'],
+            category=category,
+            issuer=options['issuer'],
+            issue_date=options['issue_date'],
+            issued_by=issued_by,
+            workers=options['workers'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Issued {created} certificates in batch {batch}."))
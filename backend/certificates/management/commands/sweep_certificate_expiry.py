@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from certificates.expiry import sweep_certificate_expiry
+
+
+class Command(BaseCommand):
+    help = 'Flag expired certificates and send expiring-soon notifications (for cron when Celery beat is not used).'
+    
+    def handle(self, *args, **options):
+        result = sweep_certificate_expiry()
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {result['expired']} certificates, sent {result['notified']} expiring-soon notifications."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['user', '-created_at'], name='certificate_user_id_92d296_idx'),
+        ),
+    ]
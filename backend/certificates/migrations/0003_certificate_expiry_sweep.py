@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0002_certificate_certificate_user_id_92d296_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='expiry_notified_for',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(condition=models.Q(('expiry_date__isnull', False), ('is_expired', False)), fields=['expiry_date'], name='certificates_unexpired_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0003_certificate_expiry_sweep'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificatetemplate',
+            name='layout',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
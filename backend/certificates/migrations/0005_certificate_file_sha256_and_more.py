@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:10
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0004_certificatetemplate_layout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='file_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='certificate',
+            name='certificate_file',
+            field=models.FileField(blank=True, null=True, storage=blobs.storage.get_content_addressed_storage, upload_to='certificates/'),
+        ),
+    ]
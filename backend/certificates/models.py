@@ -1,6 +1,17 @@
+import secrets
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
+from blobs.storage import get_content_addressed_storage, digest_from_name
+
+# Crockford base32: no I, L, O or U, so codes survive being read aloud or retyped
+VERIFICATION_CODE_ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+VERIFICATION_CODE_LENGTH = 12
+
+
+def generate_verification_code():
+    """Random 60-bit verification code."""
+    return ''.join(secrets.choice(VERIFICATION_CODE_ALPHABET) for _ in range(VERIFICATION_CODE_LENGTH))
 
 
 class CertificateCategory(models.Model):
@@ -50,7 +61,8 @@ class Certificate(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     points = models.PositiveIntegerField(default=0)
-    certificate_file = models.FileField(upload_to='certificates/', blank=True, null=True)
+    certificate_file = models.FileField(upload_to='certificates/', storage=get_content_addressed_storage, blank=True, null=True)
+    file_sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Filled from the blob name on save
     verified_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.SET_NULL, 
@@ -64,6 +76,7 @@ class Certificate(models.Model):
     tags = models.JSONField(default=list, blank=True)
     is_public = models.BooleanField(default=True)
     is_expired = models.BooleanField(default=False)
+    expiry_notified_for = models.DateField(null=True, blank=True)  # expiry_date the last expiring-soon notice was sent for
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -72,6 +85,15 @@ class Certificate(models.Model):
         verbose_name = 'Certificate'
         verbose_name_plural = 'Certificates'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+            # Only unexpired certificates with an expiry date are ever swept
+            models.Index(
+                fields=['expiry_date'],
+                name='certificates_unexpired_idx',
+                condition=models.Q(is_expired=False, expiry_date__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.title}"
@@ -82,7 +104,20 @@ class Certificate(models.Model):
             self.is_expired = True
         else:
             self.is_expired = False
+        
+        # Keep the content hash used for duplicate detection in step with the file
+        uploading = bool(self.certificate_file) and not self.certificate_file._committed
+        if not self.certificate_file:
+            self.file_sha256 = ''
+        elif not uploading:
+            self.file_sha256 = digest_from_name(self.certificate_file.name) or self.file_sha256
         super().save(*args, **kwargs)
+        if uploading:
+            # The storage hashed the upload while writing it; its name carries the digest
+            sha256 = digest_from_name(self.certificate_file.name)
+            if sha256 and sha256 != self.file_sha256:
+                self.file_sha256 = sha256
+                Certificate.objects.filter(pk=self.pk).update(file_sha256=sha256)
     
     def approve(self, verified_by):
         """Approve the certificate."""
@@ -184,6 +219,7 @@ class CertificateTemplate(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField()
     template_file = models.FileField(upload_to='certificate_templates/')
+    layout = models.JSONField(default=dict, blank=True)  # Output format and field positions; see render_worker.DEFAULT_LAYOUT
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
@@ -213,3 +249,8 @@ class CertificateVerification(models.Model):
     
     def __str__(self):
         return f"{self.certificate.title} - {self.verifier_email}"
+    
+    def save(self, *args, **kwargs):
+        if not self.verification_code:
+            self.verification_code = generate_verification_code()
+        super().save(*args, **kwargs)
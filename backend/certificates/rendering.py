@@ -0,0 +1,130 @@
+import os
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from accounts.models import User, UserProfile
+from dashboard.cache import invalidate_dashboards, invalidate_staff_dashboards
+from feed.views import feed_cache_key
+from search.indexing import index_instances
+from blobs.storage import digest_from_name
+from .models import Certificate
+from .render_worker import DEFAULT_LAYOUT, init_worker, render
+
+CREATE_BATCH_SIZE = 500
+IN_FLIGHT_PER_WORKER = 4
+
+
+def _issue(certificates):
+    """Insert a batch and do what approve() and post_save handlers would have done for it."""
+    with transaction.atomic():
+        created = Certificate.objects.bulk_create(certificates)
+        for (count, points), user_ids in _awards(created).items():
+            UserProfile.objects.filter(user_id__in=user_ids).update(
+                certificates_count=F('certificates_count') + count,
+                total_points=F('total_points') + points,
+            )
+    index_instances(created)
+    user_ids = {c.user_id for c in created}
+    cache.delete_many([feed_cache_key(user_id) for user_id in user_ids])
+    invalidate_dashboards(user_ids)
+    invalidate_staff_dashboards()
+    return created
+
+
+def _awards(certificates):
+    """Group users by (certificates, points) gained so each group needs one profile UPDATE."""
+    totals = {}
+    for certificate in certificates:
+        count, points = totals.get(certificate.user_id, (0, 0))
+        totals[certificate.user_id] = (count + 1, points + certificate.points)
+    groups = {}
+    for user_id, award in totals.items():
+        groups.setdefault(award, []).append(user_id)
+    return groups
+
+
+def generate_certificates(template, recipients, *, title, category, issuer, issue_date,
+                          issued_by=None, description='', workers=None, stdout=None):
+    """
+    Render and issue one approved certificate per recipient from a template.
+
+    `recipients` is a list of dicts with a `user_id` and optional field
+    overrides (e.g. `name`). The template is read once and decoded once per
+    worker process; at most IN_FLIGHT_PER_WORKER renders per worker are
+    pending at a time, and each finished file is written to storage straight
+    away, so memory stays flat however many recipients there are.
+    """
+    workers = workers or os.cpu_count() or 1
+    layout = template.layout or DEFAULT_LAYOUT
+    extension = 'pdf' if (layout.get('format') or 'png').lower() == 'pdf' else 'png'
+    with template.template_file.open('rb') as template_file:
+        template_bytes = template_file.read()
+
+    users = User.objects.in_bulk([recipient['user_id'] for recipient in recipients])
+    batch = uuid.uuid4().hex[:10].upper()
+    now = timezone.now()
+
+    def job(index):
+        recipient = recipients[index]
+        values = {
+            'name': users[recipient['user_id']].full_name,
+            'title': title,
+            'date': issue_date.strftime('%d %B %Y'),
+            'number': f'{batch}-{index + 1:05d}',
+        }
+        values.update(recipient.get('fields', {}))
+        return index, values
+
+    # The field's storage counts each blob reference itself, so bulk_create's lack of signals is fine here
+    storage = Certificate._meta.get_field('certificate_file').storage
+
+    # Forked workers must not share the parent's database sockets
+    connections.close_all()
+
+    created = 0
+    pending_rows = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(template_bytes, layout)) as pool:
+        indexes = iter(range(len(recipients)))
+        in_flight = set()
+        while True:
+            for index in indexes:
+                in_flight.add(pool.submit(render, job(index)))
+                if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                    break
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, data = future.result()
+                number = f'{batch}-{index + 1:05d}'
+                path = storage.save(f'{number}.{extension}', ContentFile(data))
+                pending_rows.append(Certificate(
+                    user_id=recipients[index]['user_id'],
+                    title=title,
+                    description=description,
+                    category=category,
+                    issuer=issuer,
+                    issue_date=issue_date,
+                    certificate_number=number,
+                    status='approved',
+                    points=category.points_value,
+                    certificate_file=path,
+                    file_sha256=digest_from_name(path) or '',
+                    verified_by=issued_by,
+                    verified_at=now,
+                ))
+
+            if len(pending_rows) >= CREATE_BATCH_SIZE:
+                created += len(_issue(pending_rows))
+                pending_rows = []
+                if stdout:
+                    stdout.write(f"Issued {created}/{len(recipients)} certificates")
+
+    if pending_rows:
+        created += len(_issue(pending_rows))
+    return batch, created
@@ -1,5 +1,11 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Value
+from django.utils import timezone
+from django.utils.functional import cached_property
+from blobs.storage import hash_file
+from accounts.serializers import UserSummarySerializer
+from eduportal.serializers import SparseFieldsMixin, ValuesSerializer, count_subquery
 from .models import (
     CertificateCategory, Certificate, CertificateReview, CertificateComment,
     CertificateLike, CertificateShare, CertificateTemplate, CertificateVerification
@@ -8,7 +14,7 @@ from .models import (
 User = get_user_model()
 
 
-class CertificateCategorySerializer(serializers.ModelSerializer):
+class CertificateCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate categories."""
     
     class Meta:
@@ -16,7 +22,7 @@ class CertificateCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'icon', 'color', 'points_value', 'is_active']
 
 
-class CertificateSerializer(serializers.ModelSerializer):
+class CertificateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificates."""
     
     user_name = serializers.SerializerMethodField()
@@ -39,6 +45,11 @@ class CertificateSerializer(serializers.ModelSerializer):
             'is_liked', 'days_until_expiry'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'verified_by', 'verified_at', 'is_expired']
+        expandable_fields = {
+            'user': UserSummarySerializer,
+            'category': CertificateCategorySerializer,
+            'verified_by': UserSummarySerializer,
+        }
     
     def get_user_name(self, obj):
         return obj.user.full_name
@@ -77,6 +88,92 @@ class CertificateSerializer(serializers.ModelSerializer):
         return None
 
 
+class CertificateValuesSerializer(ValuesSerializer):
+    """Read-only list serializer with CertificateSerializer's output, built from `.values()` rows."""
+    
+    values_fields = {
+        'id': ('id',),
+        'user': ('user_id',),
+        'user_name': ('user__first_name', 'user__last_name'),
+        'title': ('title',),
+        'description': ('description',),
+        'category': ('category_id',),
+        'category_name': ('category__name',),
+        'issuer': ('issuer',),
+        'issue_date': ('issue_date',),
+        'expiry_date': ('expiry_date',),
+        'certificate_number': ('certificate_number',),
+        'status': ('status',),
+        'priority': ('priority',),
+        'points': ('points',),
+        'certificate_file': ('certificate_file',),
+        'certificate_file_url': ('certificate_file',),
+        'verified_by': ('verified_by_id',),
+        'verified_by_name': ('verified_by__first_name', 'verified_by__last_name'),
+        'verified_at': ('verified_at',),
+        'rejection_reason': ('rejection_reason',),
+        'skills_verified': ('skills_verified',),
+        'tags': ('tags',),
+        'is_public': ('is_public',),
+        'is_expired': ('is_expired',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'likes_count': ('likes_count',),
+        'comments_count': ('comments_count',),
+        'is_liked': ('is_liked',),
+        'days_until_expiry': ('expiry_date',),
+    }
+    datetime_fields = ('verified_at', 'created_at', 'updated_at')
+    date_fields = ('issue_date', 'expiry_date')
+    certificate_storage = Certificate._meta.get_field('certificate_file').storage
+    
+    @classmethod
+    def annotations(cls, context):
+        user = context['request'].user
+        return {
+            'likes_count': count_subquery(CertificateLike, 'certificate'),
+            'comments_count': count_subquery(CertificateComment, 'certificate'),
+            'is_liked': (
+                Exists(CertificateLike.objects.filter(certificate=OuterRef('pk'), user=user))
+                if user.is_authenticated else Value(False)
+            ),
+        }
+    
+    def get_user_name(self, row):
+        return self.full_name(row['user__first_name'], row['user__last_name'])
+    
+    def get_verified_by_name(self, row):
+        return self.full_name(row['verified_by__first_name'], row['verified_by__last_name'])
+    
+    def get_certificate_file(self, row):
+        return self.file_url(self.certificate_storage, row['certificate_file'])
+    
+    def get_certificate_file_url(self, row):
+        return self.get_certificate_file(row) if self.request is not None else None
+    
+    @cached_property
+    def today(self):
+        return timezone.now().date()
+    
+    def get_days_until_expiry(self, row):
+        return (row['expiry_date'] - self.today).days if row['expiry_date'] else None
+
+
+def validate_unique_certificate_file(serializer, value):
+    """Reject a file the user already submitted (unless that certificate was rejected)."""
+    if value:
+        # Remembered on the upload, so the storage doesn't hash it again
+        sha256 = hash_file(value)
+        if serializer.instance is not None:
+            duplicates = Certificate.objects.filter(user=serializer.instance.user_id).exclude(pk=serializer.instance.pk)
+        else:
+            duplicates = Certificate.objects.filter(user=serializer.context['request'].user)
+        duplicates = duplicates.filter(file_sha256=sha256).exclude(status='rejected')
+        if duplicates.exists():
+            raise serializers.ValidationError("This file has already been submitted as a certificate.")
+    return value
+
+
 class CertificateCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating certificates."""
     
@@ -87,6 +184,9 @@ class CertificateCreateSerializer(serializers.ModelSerializer):
             'certificate_number', 'priority', 'points', 'certificate_file', 'skills_verified', 'tags', 'is_public'
         ]
     
+    def validate_certificate_file(self, value):
+        return validate_unique_certificate_file(self, value)
+    
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
@@ -101,6 +201,9 @@ class CertificateUpdateSerializer(serializers.ModelSerializer):
             'title', 'description', 'category', 'issuer', 'issue_date', 'expiry_date',
             'certificate_number', 'priority', 'certificate_file', 'skills_verified', 'tags', 'is_public'
         ]
+    
+    def validate_certificate_file(self, value):
+        return validate_unique_certificate_file(self, value)
 
 
 class CertificateApprovalSerializer(serializers.Serializer):
@@ -116,7 +219,7 @@ class CertificateApprovalSerializer(serializers.Serializer):
         return attrs
 
 
-class CertificateReviewSerializer(serializers.ModelSerializer):
+class CertificateReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate reviews."""
     
     reviewer_name = serializers.SerializerMethodField()
@@ -134,7 +237,7 @@ class CertificateReviewSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CertificateCommentSerializer(serializers.ModelSerializer):
+class CertificateCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate comments."""
     
     user_name = serializers.SerializerMethodField()
@@ -152,7 +255,7 @@ class CertificateCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CertificateLikeSerializer(serializers.ModelSerializer):
+class CertificateLikeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate likes."""
     
     class Meta:
@@ -165,7 +268,7 @@ class CertificateLikeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CertificateShareSerializer(serializers.ModelSerializer):
+class CertificateShareSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate shares."""
     
     class Meta:
@@ -178,14 +281,14 @@ class CertificateShareSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class CertificateTemplateSerializer(serializers.ModelSerializer):
+class CertificateTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate templates."""
     
     template_file_url = serializers.SerializerMethodField()
     
     class Meta:
         model = CertificateTemplate
-        fields = ['id', 'name', 'description', 'template_file', 'template_file_url', 'is_active', 'created_at']
+        fields = ['id', 'name', 'description', 'template_file', 'template_file_url', 'layout', 'is_active', 'created_at']
     
     def get_template_file_url(self, obj):
         if obj.template_file:
@@ -195,7 +298,7 @@ class CertificateTemplateSerializer(serializers.ModelSerializer):
         return None
 
 
-class CertificateVerificationSerializer(serializers.ModelSerializer):
+class CertificateVerificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for certificate verification."""
     
     class Meta:
@@ -204,6 +307,26 @@ class CertificateVerificationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'verification_code', 'is_verified', 'verified_at', 'created_at']
 
 
+class BulkCertificateVerificationSerializer(serializers.Serializer):
+    """Serializer for issuing many verification codes at once."""
+    
+    verifier_emails = serializers.ListField(child=serializers.EmailField(), min_length=1, max_length=500)
+
+
+class PublicCertificateVerificationSerializer(serializers.Serializer):
+    """Serializer for the public, signed verification payload."""
+    
+    code = serializers.CharField()
+    status = serializers.CharField()
+    title = serializers.CharField()
+    holder = serializers.CharField()
+    issuer = serializers.CharField()
+    number = serializers.CharField(allow_blank=True)
+    issued = serializers.CharField()
+    expires = serializers.CharField(allow_null=True)
+    signature = serializers.CharField()
+
+
 class CertificateStatsSerializer(serializers.Serializer):
     """Serializer for certificate statistics."""
     
@@ -227,3 +350,37 @@ class CertificateAnalyticsSerializer(serializers.Serializer):
     average_points_per_certificate = serializers.FloatField()
     approval_rate = serializers.FloatField()
     expiry_analytics = serializers.DictField()
+
+
+class DepartmentCertificateStatsSerializer(serializers.Serializer):
+    """Serializer for per-department certificate statistics."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    contributors_count = serializers.IntegerField()
+    total_certificates = serializers.IntegerField()
+    approved_certificates = serializers.IntegerField()
+    pending_certificates = serializers.IntegerField()
+    rejected_certificates = serializers.IntegerField()
+    expired_certificates = serializers.IntegerField()
+    total_points = serializers.IntegerField()
+    approval_rate = serializers.FloatField()
+
+
+class DepartmentCertificateAnalyticsSerializer(serializers.Serializer):
+    """Serializer for certificate analytics scoped to one department."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    stats = serializers.DictField()
+    certificates_by_category = serializers.DictField()
+    certificates_by_month = serializers.DictField()
+    top_issuers = serializers.ListField()
+    average_points_per_certificate = serializers.FloatField()
+    approval_rate = serializers.FloatField()
+
+
+class CertificateDuplicateCheckSerializer(serializers.Serializer):
+    """Serializer for checking a file hash against existing submissions."""
+    
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$')
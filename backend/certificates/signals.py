@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from .models import Certificate
+from .verification import invalidate_certificate
+
+
+def drop_cached_verifications(sender, instance, raw=False, **kwargs):
+    """Status, expiry or title changes must not keep serving a stale verification payload."""
+    if raw:
+        return
+    invalidate_certificate(instance.pk)
+
+
+post_save.connect(drop_cached_verifications, sender=Certificate, dispatch_uid='certificates-verification-cache')
+post_delete.connect(drop_cached_verifications, sender=Certificate, dispatch_uid='certificates-verification-cache-delete')
@@ -0,0 +1,8 @@
+from celery import shared_task
+from .expiry import sweep_certificate_expiry
+
+
+@shared_task
+def sweep_certificate_expiry_task():
+    """Scheduled by Celery beat, see CELERY_BEAT_SCHEDULE."""
+    return sweep_certificate_expiry()
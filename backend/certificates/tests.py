@@ -0,0 +1,145 @@
+from datetime import date, timedelta
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import Department, User
+from dashboard.cache import dashboard_cache_key
+from . import expiry, verification
+from .cache import DEPARTMENT_STATS_CACHE_KEY, department_analytics_cache_key
+from .models import Certificate, CertificateCategory, CertificateComment, CertificateLike, CertificateVerification
+from .serializers import CertificateSerializer, CertificateValuesSerializer
+
+
+class CertificateValuesSerializerTests(TestCase):
+    """CertificateValuesSerializer must render exactly what CertificateSerializer does."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@test.local', username='student', password='pw', role='student',
+            first_name='Ada', last_name='Lovelace',
+        )
+        cls.faculty = User.objects.create_user(
+            email='faculty@test.local', username='faculty', password='pw', role='faculty', first_name='Alan',
+        )
+        category = CertificateCategory.objects.create(name='Course')
+        common = {
+            'user': cls.student, 'description': 'd', 'category': category, 'issuer': 'Coursera',
+            'issue_date': date(2024, 1, 1), 'tags': ['python'],
+        }
+        verified = Certificate.objects.create(
+            title='Verified', status='approved', verified_by=cls.faculty, verified_at=timezone.now(),
+            expiry_date=date.today() + timedelta(days=30), skills_verified=['research'], **common
+        )
+        Certificate.objects.create(title='No verifier, no expiry, no file', **common)
+        expired = Certificate.objects.create(title='Expired', expiry_date=date.today() - timedelta(days=3), **common)
+        # Set file names directly; saving through the storage would need the blob on disk
+        Certificate.objects.filter(pk=expired.pk).update(certificate_file='')
+        Certificate.objects.filter(pk=verified.pk).update(certificate_file=f'blobs/aa/bb/{"0" * 64}.pdf')
+        CertificateLike.objects.create(certificate=verified, user=cls.student)
+        CertificateLike.objects.create(certificate=expired, user=cls.faculty)
+        CertificateComment.objects.create(certificate=verified, user=cls.faculty, comment='Nice')
+    
+    def assertSameOutput(self, viewer, **params):
+        request = Request(APIRequestFactory().get('/api/certificates/', params))
+        request.user = viewer
+        context = {'request': request}
+        queryset = Certificate.objects.select_related('user', 'category', 'verified_by').order_by('id')
+        expected = [dict(item) for item in CertificateSerializer(queryset, many=True, context=context).data]
+        values = CertificateValuesSerializer.values_queryset(queryset, context)
+        self.assertEqual(list(CertificateValuesSerializer(values, many=True, context=context).data), expected)
+    
+    def test_same_output_for_liking_viewer(self):
+        self.assertSameOutput(self.student)
+    
+    def test_same_output_for_other_viewer(self):
+        self.assertSameOutput(self.faculty)
+    
+    def test_same_output_for_sparse_fields(self):
+        self.assertSameOutput(self.student, fields='id,verified_by_name,certificate_file_url,days_until_expiry')
+        self.assertSameOutput(self.student, omit='description,likes_count')
+
+
+class ExpireCertificatesTests(TestCase):
+    """The expiry sweep flips every overdue certificate in batches and drops the caches that show them."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Physics', code='PHY')
+        cls.student = User.objects.create_user(
+            email='student@test.local', username='student', password='pw', role='student', department=cls.department
+        )
+        category = CertificateCategory.objects.create(name='Course')
+        Certificate.objects.bulk_create([
+            Certificate(
+                user=cls.student, title=f'Course {days}', description='d', category=category, issuer='Coursera',
+                issue_date=date(2024, 1, 1), expiry_date=date.today() + timedelta(days=days),
+            )
+            for days in (-30, -2, -1, -1, -1, 0, 10)
+        ])
+    
+    def setUp(self):
+        cache.clear()
+    
+    @mock.patch.object(expiry, 'EXPIRE_BATCH_SIZE', 2)
+    def test_expires_overdue_certificates_in_batches(self):
+        self.assertEqual(expiry.expire_certificates(), 5)
+        self.assertEqual(Certificate.objects.filter(is_expired=True).count(), 5)
+        self.assertFalse(Certificate.objects.filter(is_expired=True, expiry_date__gte=date.today()).exists())
+        self.assertEqual(expiry.expire_certificates(), 0)
+    
+    def test_drops_cached_dashboard_and_analytics(self):
+        keys = [
+            dashboard_cache_key(self.student.pk),
+            DEPARTMENT_STATS_CACHE_KEY,
+            department_analytics_cache_key(self.department.pk),
+        ]
+        cache.set_many({key: 'stale' for key in keys})
+        expiry.expire_certificates()
+        self.assertEqual(cache.get_many(keys), {})
+
+
+class VerificationLookupTests(TestCase):
+    """Public lookups never write, and never report a certificate valid past its expiry."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        student = User.objects.create_user(email='student@test.local', username='student', password='pw', role='student')
+        cls.certificate = Certificate.objects.create(
+            user=student, title='Course', description='d', category=CertificateCategory.objects.create(name='Course'),
+            issuer='Coursera', issue_date=date(2024, 1, 1), expiry_date=timezone.now().date(), status='approved',
+        )
+        cls.verification = CertificateVerification.objects.create(
+            certificate=cls.certificate, verifier_email='hr@test.local', verification_code='ABC123'
+        )
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_lookup_does_not_write(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(verification.lookup('ABC123')['data']['status'], 'valid')
+        self.verification.refresh_from_db()
+        self.assertFalse(self.verification.is_verified)
+    
+    def test_cache_timeout_ends_with_expiry_date(self):
+        two_minutes_left = timezone.now().replace(hour=23, minute=58, second=0, microsecond=0)
+        with mock.patch('django.utils.timezone.now', return_value=two_minutes_left):
+            with mock.patch.object(verification.cache, 'set') as cache_set:
+                verification.lookup('ABC123')
+            response = self.client.get('/api/certificates/verify/ABC123/')
+        self.assertEqual(cache_set.call_args.args[2], 120)
+        self.assertIn('max-age=120', response['Cache-Control'])
+    
+    def test_sweep_and_save_drop_cached_payload(self):
+        verification.lookup('ABC123')
+        Certificate.objects.filter(pk=self.certificate.pk).update(expiry_date=date(2024, 6, 1))
+        expiry.expire_certificates()
+        self.assertEqual(verification.lookup('ABC123')['data']['status'], 'expired')
+        self.certificate.refresh_from_db()
+        self.certificate.status = 'rejected'
+        self.certificate.save()
+        self.assertEqual(verification.lookup('ABC123')['data']['status'], 'invalid')
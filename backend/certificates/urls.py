@@ -8,6 +8,7 @@ urlpatterns = [
     # Certificates
     path('', views.CertificateListView.as_view(), name='certificate-list'),
     path('<int:pk>/', views.CertificateDetailView.as_view(), name='certificate-detail'),
+    path('check-duplicate/', views.check_duplicate_certificate, name='certificate-check-duplicate'),
     path('<int:pk>/approve/', views.CertificateApprovalView.as_view(), name='certificate-approval'),
     
     # Reviews
@@ -25,9 +26,13 @@ urlpatterns = [
     
     # Verification
     path('<int:certificate_id>/verify/', views.CertificateVerificationView.as_view(), name='certificate-verification'),
+    path('<int:certificate_id>/verifications/bulk/', views.bulk_certificate_verifications, name='certificate-verification-bulk'),
+    path('verify/<str:code>/', views.public_certificate_verification, name='certificate-public-verification'),
     
     # Statistics and Analytics
     path('stats/', views.certificate_stats, name='certificate-stats'),
     path('analytics/', views.certificate_analytics, name='certificate-analytics'),
+    path('analytics/departments/', views.department_certificate_stats, name='department-certificate-stats'),
+    path('analytics/departments/<int:department_id>/', views.department_certificate_analytics, name='department-certificate-analytics'),
     path('pending-reviews/', views.pending_reviews, name='pending-reviews'),
 ]
@@ -0,0 +1,114 @@
+import hashlib
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from .models import CertificateVerification, generate_verification_code
+
+SIGNING_SALT = 'certificates.verification'
+MAX_ISSUE_ATTEMPTS = 5
+
+
+def cache_key(code):
+    return f'certificates:verification:{code}'
+
+
+def _unused_codes(count):
+    """`count` distinct codes not present in the table, checked with one indexed IN query per round."""
+    codes = set()
+    while len(codes) < count:
+        candidates = {generate_verification_code() for _ in range(count - len(codes))}
+        taken = set(
+            CertificateVerification.objects.filter(verification_code__in=candidates)
+            .values_list('verification_code', flat=True)
+        )
+        codes.update(candidates - taken)
+    return list(codes)
+
+
+def issue_verifications(certificate, verifier_emails):
+    """Create one verification per email with collision-free codes, in bulk."""
+    for _ in range(MAX_ISSUE_ATTEMPTS):
+        codes = _unused_codes(len(verifier_emails))
+        try:
+            with transaction.atomic():
+                return CertificateVerification.objects.bulk_create([
+                    CertificateVerification(certificate=certificate, verifier_email=email, verification_code=code)
+                    for email, code in zip(verifier_emails, codes)
+                ])
+        except IntegrityError:
+            # A concurrent issuer took one of the codes between the check and the insert
+            continue
+    raise IntegrityError('Could not allocate unique verification codes.')
+
+
+def build_payload(verification):
+    """Compact public view of a verified certificate plus a signature over it."""
+    certificate = verification.certificate
+    today = timezone.now().date()
+    if certificate.status != 'approved':
+        state = 'invalid'
+    elif certificate.is_expired or (certificate.expiry_date and certificate.expiry_date < today):
+        state = 'expired'
+    else:
+        state = 'valid'
+
+    data = {
+        'code': verification.verification_code,
+        'status': state,
+        'title': certificate.title,
+        'holder': certificate.user.full_name,
+        'issuer': certificate.issuer,
+        'number': certificate.certificate_number,
+        'issued': certificate.issue_date.isoformat(),
+        'expires': certificate.expiry_date.isoformat() if certificate.expiry_date else None,
+    }
+    signature = signing.Signer(salt=SIGNING_SALT).sign_object(data, compress=True)
+    return {
+        'data': data,
+        'signature': signature,
+        'etag': '"%s"' % hashlib.sha256(signature.encode()).hexdigest()[:32],
+    }
+
+
+def lookup(code):
+    """Cached payload for a verification code, or None when the code is unknown."""
+    key = cache_key(code)
+    payload = cache.get(key)
+    if payload is None:
+        verification = (
+            CertificateVerification.objects.select_related('certificate__user')
+            .filter(verification_code=code).first()
+        )
+        if verification is None:
+            return None
+        payload = build_payload(verification)
+        cache.set(key, payload, fresh_for(payload, settings.CERTIFICATE_VERIFICATION_CACHE_TIMEOUT))
+    return payload
+
+
+def fresh_for(payload, timeout):
+    """
+    `timeout` in seconds, cut short so a valid payload is never served once
+    its certificate's expiry date has passed. Saves and the expiry sweep drop
+    cached payloads themselves (see signals and expiry).
+    """
+    data = payload['data']
+    if data['status'] != 'valid' or data['expires'] is None:
+        return timeout
+    # Valid through the expiry date; build_payload compares UTC dates
+    expires_at = datetime.combine(
+        date.fromisoformat(data['expires']) + timedelta(days=1), time.min, tzinfo=dt_timezone.utc
+    )
+    return max(0, min(timeout, int((expires_at - timezone.now()).total_seconds())))
+
+
+def invalidate_certificates(certificate_ids):
+    codes = CertificateVerification.objects.filter(certificate_id__in=certificate_ids).values_list('verification_code', flat=True)
+    cache.delete_many([cache_key(code) for code in codes])
+
+
+def invalidate_certificate(certificate_id):
+    invalidate_certificates([certificate_id])
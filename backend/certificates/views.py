@@ -1,9 +1,21 @@
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, authentication_classes, throttle_classes
 from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import patch_cache_control
 from django.db.models import Count, Q, Sum, Avg
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 from datetime import timedelta, date
+from functools import partial
+from accounts.models import Department
+from tags.indexing import tagged_object_ids
+from eduportal.async_views import async_api_view, gather_queries
+from eduportal.replicas import replica_reads
+from eduportal.throttling import request_cost
+from eduportal.views import ConditionalGetMixin, ValuesListMixin
 from .models import (
     CertificateCategory, Certificate, CertificateReview, CertificateComment,
     CertificateLike, CertificateShare, CertificateTemplate, CertificateVerification
@@ -13,11 +25,16 @@ from .serializers import (
     CertificateUpdateSerializer, CertificateApprovalSerializer, CertificateReviewSerializer,
     CertificateCommentSerializer, CertificateLikeSerializer, CertificateShareSerializer,
     CertificateTemplateSerializer, CertificateVerificationSerializer, CertificateStatsSerializer,
-    CertificateAnalyticsSerializer
+    CertificateAnalyticsSerializer, DepartmentCertificateStatsSerializer,
+    DepartmentCertificateAnalyticsSerializer, BulkCertificateVerificationSerializer,
+    PublicCertificateVerificationSerializer, CertificateDuplicateCheckSerializer,
+    CertificateValuesSerializer
 )
+from .cache import DEPARTMENT_STATS_CACHE_KEY, department_analytics_cache_key
+from .verification import fresh_for, issue_verifications, lookup
 
 
-class CertificateCategoryListView(generics.ListAPIView):
+class CertificateCategoryListView(ConditionalGetMixin, generics.ListAPIView):
     """List all certificate categories."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -25,10 +42,13 @@ class CertificateCategoryListView(generics.ListAPIView):
     queryset = CertificateCategory.objects.filter(is_active=True)
 
 
-class CertificateListView(generics.ListCreateAPIView):
+class CertificateListView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List and create certificates."""
     
     permission_classes = [permissions.IsAuthenticated]
+    values_serializer_class = CertificateValuesSerializer
+    search_fields = ['title', 'description', 'issuer', 'category__name']
+    etag_related = ('likes', 'comments')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -65,6 +85,15 @@ class CertificateListView(generics.ListCreateAPIView):
         if user_filter and (user.is_faculty() or user.is_admin()):
             queryset = queryset.filter(user_id=user_filter)
         
+        # Tag/skill filters resolve through the tag index instead of scanning JSON
+        tag_filter = self.request.query_params.get('tag')
+        if tag_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('certificate', 'tag', tag_filter))
+        
+        skill_filter = self.request.query_params.get('skill')
+        if skill_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('certificate', 'skill', skill_filter))
+        
         expired_filter = self.request.query_params.get('expired')
         if expired_filter == 'true':
             queryset = queryset.filter(is_expired=True)
@@ -83,11 +112,12 @@ class CertificateListView(generics.ListCreateAPIView):
         return queryset.order_by('-created_at')
 
 
-class CertificateDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CertificateDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific certificate."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = CertificateSerializer
+    etag_related = ('likes', 'comments')
     
     def get_queryset(self):
         user = self.request.user
@@ -158,7 +188,7 @@ class CertificateApprovalView(generics.UpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class CertificateReviewListView(generics.ListAPIView):
+class CertificateReviewListView(ConditionalGetMixin, generics.ListAPIView):
     """List certificate reviews."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -171,7 +201,7 @@ class CertificateReviewListView(generics.ListAPIView):
         return CertificateReview.objects.all().select_related('reviewer')
 
 
-class CertificateCommentListView(generics.ListCreateAPIView):
+class CertificateCommentListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create comments for a certificate."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -234,7 +264,7 @@ class CertificateShareView(generics.CreateAPIView):
         serializer.save(certificate=certificate)
 
 
-class CertificateTemplateListView(generics.ListAPIView):
+class CertificateTemplateListView(ConditionalGetMixin, generics.ListAPIView):
     """List certificate templates."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -254,59 +284,111 @@ class CertificateVerificationView(generics.CreateAPIView):
         serializer.save(certificate=certificate)
 
 
-@api_view(['GET'])
+class CertificateVerificationRateThrottle(AnonRateThrottle):
+    """Per-IP limit for the public verification lookup."""
+    
+    scope = 'certificate_verification'
+
+
+@api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def certificate_stats(request):
-    """Get certificate statistics."""
+def bulk_certificate_verifications(request, certificate_id):
+    """Issue verification codes for many verifiers at once (owner or Faculty/Admin)."""
     user = request.user
     
+    try:
+        certificate = Certificate.objects.get(id=certificate_id)
+    except Certificate.DoesNotExist:
+        return Response({'error': 'Certificate not found.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if certificate.user_id != user.id and not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    serializer = BulkCertificateVerificationSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    verifications = issue_verifications(certificate, serializer.validated_data['verifier_emails'])
+    return Response(CertificateVerificationSerializer(verifications, many=True).data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+@throttle_classes([CertificateVerificationRateThrottle])
+def public_certificate_verification(request, code):
+    """Resolve a verification code for third parties; no login required."""
+    payload = lookup(code.strip().upper())
+    if payload is None:
+        return Response({'error': 'Unknown verification code.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if payload['etag'] in request.headers.get('If-None-Match', ''):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        serializer = PublicCertificateVerificationSerializer({**payload['data'], 'signature': payload['signature']})
+        response = Response(serializer.data)
+    response['ETag'] = payload['etag']
+    patch_cache_control(response, public=True, max_age=fresh_for(payload, settings.CERTIFICATE_VERIFICATION_MAX_AGE))
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def check_duplicate_certificate(request):
+    """Tell a client whether a file (by SHA-256) was already submitted, before uploading it."""
+    serializer = CertificateDuplicateCheckSerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    
+    existing = Certificate.objects.filter(
+        user=request.user, file_sha256=serializer.validated_data['sha256'].lower()
+    ).exclude(status='rejected').values('id', 'title', 'status').first()
+    return Response({'duplicate': existing is not None, 'certificate': existing})
+
+
+async def certificate_stats_data(user):
+    """Certificate statistics as the user's role sees them (shared with the combined dashboard)."""
+    
     if user.is_student():
         # Student stats
         certificates = Certificate.objects.filter(user=user)
-        expiring_soon = certificates.filter(
-            expiry_date__lte=date.today() + timedelta(days=30),
-            expiry_date__gte=date.today(),
-            is_expired=False
-        ).count()
-        
-        stats = {
-            'total_certificates': certificates.count(),
-            'approved_certificates': certificates.filter(status='approved').count(),
-            'pending_certificates': certificates.filter(status='pending').count(),
-            'rejected_certificates': certificates.filter(status='rejected').count(),
-            'expired_certificates': certificates.filter(is_expired=True).count(),
-            'expiring_soon': expiring_soon,
-            'total_points': certificates.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'categories_count': certificates.values('category').distinct().count(),
-        }
+        categories = certificates.values('category').distinct()
     else:
         # Admin/Faculty stats
         certificates = Certificate.objects.all()
-        expiring_soon = certificates.filter(
-            expiry_date__lte=date.today() + timedelta(days=30),
-            expiry_date__gte=date.today(),
-            is_expired=False
-        ).count()
-        
-        stats = {
-            'total_certificates': certificates.count(),
-            'approved_certificates': certificates.filter(status='approved').count(),
-            'pending_certificates': certificates.filter(status='pending').count(),
-            'rejected_certificates': certificates.filter(status='rejected').count(),
-            'expired_certificates': certificates.filter(is_expired=True).count(),
-            'expiring_soon': expiring_soon,
-            'total_points': certificates.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'categories_count': CertificateCategory.objects.filter(is_active=True).count(),
-        }
-    
-    serializer = CertificateStatsSerializer(stats)
-    return Response(serializer.data)
+        categories = CertificateCategory.objects.filter(is_active=True)
+    
+    totals, categories_count = await gather_queries(
+        partial(
+            certificates.aggregate,
+            total_certificates=Count('pk'),
+            approved_certificates=Count('pk', filter=Q(status='approved')),
+            pending_certificates=Count('pk', filter=Q(status='pending')),
+            rejected_certificates=Count('pk', filter=Q(status='rejected')),
+            expired_certificates=Count('pk', filter=Q(is_expired=True)),
+            expiring_soon=Count('pk', filter=Q(
+                expiry_date__lte=date.today() + timedelta(days=30),
+                expiry_date__gte=date.today(),
+                is_expired=False
+            )),
+            total_points=Sum('points', filter=Q(status='approved')),
+        ),
+        categories.count,
+    )
+    stats = {**totals, 'total_points': totals['total_points'] or 0, 'categories_count': categories_count}
+    
+    return CertificateStatsSerializer(stats).data
+
+
+@replica_reads
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+async def certificate_stats(request):
+    """Get certificate statistics."""
+    return Response(await certificate_stats_data(request.user))
 
 
+@replica_reads
+@request_cost(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def certificate_analytics(request):
@@ -405,3 +487,134 @@ def pending_reviews(request):
     pending_certificates = Certificate.objects.filter(status='pending').select_related('user', 'category')
     serializer = CertificateSerializer(pending_certificates, many=True, context={'request': request})
     return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_certificate_stats(request):
+    """Get certificate statistics for every department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    cache_key = DEPARTMENT_STATS_CACHE_KEY
+    stats = cache.get(cache_key)
+    if stats is None:
+        # One grouped query across the department -> users -> certificates join
+        approved = Q(users__certificates__status='approved')
+        departments = Department.objects.annotate(
+            contributors_count=Count('users__certificates__user', distinct=True),
+            total_certificates=Count('users__certificates'),
+            approved_certificates=Count('users__certificates', filter=approved),
+            pending_certificates=Count('users__certificates', filter=Q(users__certificates__status='pending')),
+            rejected_certificates=Count('users__certificates', filter=Q(users__certificates__status='rejected')),
+            expired_certificates=Count('users__certificates', filter=Q(users__certificates__is_expired=True)),
+            total_points=Sum('users__certificates__points', filter=approved),
+        ).order_by('name')
+        
+        stats = []
+        for department in departments:
+            total = department.total_certificates
+            stats.append({
+                'department_id': department.id,
+                'department_name': department.name,
+                'contributors_count': department.contributors_count,
+                'total_certificates': total,
+                'approved_certificates': department.approved_certificates,
+                'pending_certificates': department.pending_certificates,
+                'rejected_certificates': department.rejected_certificates,
+                'expired_certificates': department.expired_certificates,
+                'total_points': department.total_points or 0,
+                'approval_rate': round(department.approved_certificates / total * 100, 2) if total > 0 else 0,
+            })
+        cache.set(cache_key, stats, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentCertificateStatsSerializer(stats, many=True)
+    return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_certificate_analytics(request, department_id):
+    """Get certificate analytics for a single department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        department = Department.objects.get(id=department_id)
+    except Department.DoesNotExist:
+        return Response({'error': 'Department not found.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    cache_key = department_analytics_cache_key(department.id)
+    analytics = cache.get(cache_key)
+    if analytics is None:
+        certificates = Certificate.objects.filter(user__department=department)
+        approved = Q(status='approved')
+        today = date.today()
+        
+        totals = certificates.aggregate(
+            total_certificates=Count('id'),
+            approved_certificates=Count('id', filter=approved),
+            pending_certificates=Count('id', filter=Q(status='pending')),
+            rejected_certificates=Count('id', filter=Q(status='rejected')),
+            expired_certificates=Count('id', filter=Q(is_expired=True)),
+            expiring_soon=Count('id', filter=Q(
+                expiry_date__lte=today + timedelta(days=30),
+                expiry_date__gte=today,
+                is_expired=False
+            )),
+            total_points=Sum('points', filter=approved),
+            average_points=Avg('points', filter=approved),
+            contributors_count=Count('user', distinct=True),
+        )
+        
+        certificates_by_category = {
+            row['category__name']: row['count']
+            for row in certificates.values('category__name').annotate(count=Count('id')).order_by('-count')
+        }
+        
+        year_ago = timezone.now() - timedelta(days=365)
+        certificates_by_month = {
+            row['month'].strftime('%Y-%m'): row['count']
+            for row in certificates.filter(created_at__gte=year_ago).annotate(
+                month=TruncMonth('created_at')
+            ).values('month').annotate(count=Count('id')).order_by('-month')
+        }
+        
+        top_issuers = list(
+            certificates.values('issuer').annotate(count=Count('id')).order_by('-count')[:10]
+        )
+        
+        total = totals['total_certificates']
+        approval_rate = (totals['approved_certificates'] / total * 100) if total > 0 else 0
+        
+        analytics = {
+            'department_id': department.id,
+            'department_name': department.name,
+            'stats': {
+                'contributors_count': totals['contributors_count'],
+                'total_certificates': total,
+                'approved_certificates': totals['approved_certificates'],
+                'pending_certificates': totals['pending_certificates'],
+                'rejected_certificates': totals['rejected_certificates'],
+                'expired_certificates': totals['expired_certificates'],
+                'expiring_soon': totals['expiring_soon'],
+                'total_points': totals['total_points'] or 0,
+            },
+            'certificates_by_category': certificates_by_category,
+            'certificates_by_month': certificates_by_month,
+            'top_issuers': top_issuers,
+            'average_points_per_certificate': round(totals['average_points'] or 0, 2),
+            'approval_rate': round(approval_rate, 2),
+        }
+        cache.set(cache_key, analytics, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentCertificateAnalyticsSerializer(analytics)
+    return Response(serializer.data)
@@ -0,0 +1,28 @@
+from django.core.cache import cache
+
+# The site-wide section totals every faculty/admin dashboard shows
+STAFF_DASHBOARD_CACHE_KEY = 'dashboard:staff'
+
+
+def dashboard_cache_key(user_id):
+    """A student's whole dashboard."""
+    return f'dashboard:user:{user_id}'
+
+
+def staff_dashboard_cache_key(user_id):
+    """The sections of a faculty/admin dashboard that only show the user's own records."""
+    return f'dashboard:staff:user:{user_id}'
+
+
+def invalidate_dashboards(user_ids):
+    """Forget the cached dashboards of these users."""
+    user_ids = set(user_ids)
+    cache.delete_many(
+        [dashboard_cache_key(user_id) for user_id in user_ids] +
+        [staff_dashboard_cache_key(user_id) for user_id in user_ids]
+    )
+
+
+def invalidate_staff_dashboards():
+    """Forget the site-wide totals; any write to the records they count must call this."""
+    cache.delete(STAFF_DASHBOARD_CACHE_KEY)
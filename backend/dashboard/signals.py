@@ -0,0 +1,45 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from accounts.models import UserProfile
+from achievements.models import Achievement, AchievementCategory, UserBadge
+from certificates.models import Certificate, CertificateCategory
+from notifications.models import Notification
+from volunteering.models import VolunteeringActivity, VolunteeringCategory, VolunteeringOpportunity
+from .cache import invalidate_dashboards, invalidate_staff_dashboards
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=VolunteeringActivity)
+@receiver(post_save, sender=Notification)
+@receiver(post_save, sender=UserBadge)
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=Achievement)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=VolunteeringActivity)
+@receiver(post_delete, sender=Notification)
+@receiver(post_delete, sender=UserBadge)
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    """Drop the cached dashboard of the record's owner."""
+    invalidate_dashboards([instance.user_id])
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=VolunteeringActivity)
+@receiver(post_save, sender=UserBadge)
+@receiver(post_save, sender=AchievementCategory)
+@receiver(post_save, sender=CertificateCategory)
+@receiver(post_save, sender=VolunteeringCategory)
+@receiver(post_save, sender=VolunteeringOpportunity)
+@receiver(post_delete, sender=Achievement)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=VolunteeringActivity)
+@receiver(post_delete, sender=UserBadge)
+@receiver(post_delete, sender=AchievementCategory)
+@receiver(post_delete, sender=CertificateCategory)
+@receiver(post_delete, sender=VolunteeringCategory)
+@receiver(post_delete, sender=VolunteeringOpportunity)
+def invalidate_staff_dashboard(sender, **kwargs):
+    """Drop the site-wide totals faculty/admin dashboards show."""
+    invalidate_staff_dashboards()
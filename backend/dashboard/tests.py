@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+from accounts.models import User, UserProfile
+from achievements.models import Achievement, AchievementCategory
+
+
+class DashboardCacheTests(TransactionTestCase):
+    """
+    Faculty/admin totals never stay stale after a student's write. The view's
+    queries run on other connections, so the rows must be committed.
+    """
+    
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user(email='student@test.local', username='student', password='pw', role='student')
+        UserProfile.objects.create(user=self.student)
+        self.faculty = User.objects.create_user(email='faculty@test.local', username='faculty', password='pw', role='faculty')
+        self.admin = User.objects.create_user(email='admin@test.local', username='admin', password='pw', role='admin')
+        self.category = AchievementCategory.objects.create(name='A')
+    
+    def dashboard(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get('/api/dashboard/').data
+    
+    def test_student_submission_refreshes_staff_totals(self):
+        for user in (self.faculty, self.admin):
+            self.assertEqual(self.dashboard(user)['achievements']['pending_achievements'], 0)
+        Achievement.objects.create(user=self.student, title='Award', description='d', category=self.category)
+        for user in (self.faculty, self.admin):
+            self.assertEqual(self.dashboard(user)['achievements']['pending_achievements'], 1)
+        self.assertEqual(self.dashboard(self.student)['achievements']['pending_achievements'], 1)
+    
+    def test_admin_overview_is_current(self):
+        self.assertEqual(self.dashboard(self.admin)['stats']['students_count'], 1)
+        User.objects.create_user(email='new@test.local', username='new', password='pw', role='student')
+        self.assertEqual(self.dashboard(self.admin)['stats']['students_count'], 2)
+    
+    def test_staff_dashboard_keeps_section_order(self):
+        data = self.dashboard(self.faculty)
+        self.assertEqual(
+            list(data), ['role', 'stats', 'achievements', 'certificates', 'volunteering', 'notifications']
+        )
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Combined dashboard
+    path('', views.dashboard, name='dashboard'),
+]
@@ -0,0 +1,70 @@
+import asyncio
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import permissions
+from rest_framework.decorators import permission_classes
+from rest_framework.response import Response
+from accounts.views import dashboard_overview
+from achievements.views import achievement_stats_data
+from certificates.views import certificate_stats_data
+from eduportal.async_views import async_api_view
+from eduportal.replicas import replica_reads
+from notifications.views import notification_stats_data
+from volunteering.views import volunteering_stats_data
+from .cache import STAFF_DASHBOARD_CACHE_KEY, dashboard_cache_key, staff_dashboard_cache_key
+
+# Response key -> coroutine function computing that section for a user
+DASHBOARD_SECTIONS = {
+    'achievements': achievement_stats_data,
+    'certificates': certificate_stats_data,
+    'volunteering': volunteering_stats_data,
+    'notifications': notification_stats_data,
+}
+
+# Sections that show faculty/admin site-wide totals; the rest only ever show the user's own records
+STAFF_SECTIONS = ('achievements', 'certificates', 'volunteering')
+
+
+async def build_sections(user, names):
+    """Compute these sections at once; see build_dashboard."""
+    sections = await asyncio.gather(*(DASHBOARD_SECTIONS[name](user) for name in names))
+    return dict(zip(names, sections))
+
+
+async def build_dashboard(user):
+    """
+    Compute the overview and every section at once. Each section sends its
+    independent aggregates to the query pool, so all of them are in flight
+    together and the whole dashboard takes about as long as its slowest query.
+    """
+    overview, sections = await asyncio.gather(dashboard_overview(user), build_sections(user, list(DASHBOARD_SECTIONS)))
+    return {**overview, **sections}
+
+
+async def cached(cache_key, build, *args):
+    data = await cache.aget(cache_key)
+    if data is None:
+        data = await build(*args)
+        await cache.aset(cache_key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+@replica_reads
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+async def dashboard(request):
+    """Get the dashboard summary and the achievement, certificate, volunteering and notification stats."""
+    user = request.user
+    if user.is_student():
+        return Response(await cached(dashboard_cache_key(user.id), build_dashboard, user))
+    
+    # Faculty/admin totals are shared by every staff user and dropped on any write to
+    # the records they count; the overview (user and live session counts) is never cached
+    own_sections = [name for name in DASHBOARD_SECTIONS if name not in STAFF_SECTIONS]
+    overview, staff, own = await asyncio.gather(
+        dashboard_overview(user),
+        cached(STAFF_DASHBOARD_CACHE_KEY, build_sections, user, STAFF_SECTIONS),
+        cached(staff_dashboard_cache_key(user.id), build_sections, user, own_sections),
+    )
+    sections = {**staff, **own}
+    return Response({**overview, **{name: sections[name] for name in DASHBOARD_SECTIONS}})
@@ -0,0 +1,108 @@
+"""
+Async function views on top of REST framework.
+
+REST framework's APIView is synchronous; `async_api_view` is `api_view` for
+`async def` views. Authentication, permission and throttle checks (which
+may hit the database or cache) run in a worker thread, the view itself on
+the event loop, and responses render exactly like the sync views.
+
+Django's async ORM methods (`acount()`, `aaggregate()`, ...) all run on the
+request's single database thread, so gathering them still runs the queries
+one after another. `gather_queries` runs independent read-only queries on a
+small thread pool instead, each thread with its own connection.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.decorators import api_view
+from rest_framework.views import APIView
+
+_query_executor = None
+
+
+class AsyncAPIView(APIView):
+    """APIView whose method handlers are coroutines."""
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            handler = None
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                self.http_method_not_allowed(request, *args, **kwargs)
+
+            response = await handler(request, *args, **kwargs)
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def options(self, request, *args, **kwargs):
+        return await sync_to_async(super().options)(request, *args, **kwargs)
+
+
+def async_api_view(http_method_names=None):
+    """
+    `@api_view` for `async def` function views; `@permission_classes` and
+    the other policy decorators apply as usual.
+    """
+    def decorator(func):
+        # Let api_view validate the arguments and collect the policy attributes
+        wrapped_view = api_view(http_method_names)(func).cls
+
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        attributes = {'__doc__': func.__doc__, '__module__': func.__module__}
+        for method in http_method_names or ['GET']:
+            attributes[method.lower()] = handler
+        return type(func.__name__, (AsyncAPIView, wrapped_view), attributes).as_view()
+
+    return decorator
+
+
+def _query_pool():
+    global _query_executor
+    if _query_executor is None:
+        _query_executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_QUERY_WORKERS, thread_name_prefix='async-query'
+        )
+    return _query_executor
+
+
+def _run_query(query):
+    # Same connection lifecycle as a request: CONN_MAX_AGE decides whether the thread's connection is reused
+    close_old_connections()
+    try:
+        return query()
+    finally:
+        close_old_connections()
+
+
+async def gather_queries(*queries):
+    """
+    Run independent read-only callables (e.g. `queryset.count`,
+    `partial(queryset.aggregate, ...)`) concurrently and return their
+    results in order. Each runs on its own connection, so it does not see
+    uncommitted writes of the caller.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _query_pool()
+    # Carry the caller's context (e.g. the replica choice in eduportal.replicas) into the pool
+    return await asyncio.gather(*(
+        loop.run_in_executor(pool, contextvars.copy_context().run, _run_query, query) for query in queries
+    ))
@@ -0,0 +1,26 @@
+from rest_framework.filters import BaseFilterBackend
+from .serializers import SparseFieldsMixin, sparse_fieldset
+
+
+class SparseFieldsFilter(BaseFilterBackend):
+    """
+    Loads only the columns a list request's `?fields=`/`?omit=` keep, for
+    views whose serializer uses SparseFieldsMixin.
+    
+    Detail views keep whole rows (one row, and object permissions may read
+    any field), and lists served from `.values()` (ValuesListMixin) already
+    select their own columns.
+    """
+    
+    def filter_queryset(self, request, queryset, view):
+        lookup = getattr(view, 'lookup_url_kwarg', None) or getattr(view, 'lookup_field', None)
+        if request.method != 'GET' or lookup in getattr(view, 'kwargs', {}):
+            return queryset
+        _, _, expand = sparse_fieldset(request)
+        if getattr(view, 'values_serializer_class', None) is not None and not expand:
+            return queryset
+        
+        serializer_class = view.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            return queryset
+        return serializer_class.sparse_queryset(queryset, view.get_serializer_context())
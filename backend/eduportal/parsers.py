@@ -0,0 +1,29 @@
+"""
+JSON parser backed by orjson, when it is installed.
+
+orjson only reads UTF-8 and always rejects NaN/Infinity, like DRF's parser
+with STRICT_JSON; other charsets and a non-strict setup use JSONParser.
+"""
+
+import codecs
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONParser(JSONParser):
+    """Drop-in JSONParser that decodes with orjson."""
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if orjson is None or not self.strict or codecs.lookup(get_encoding(parser_context)).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
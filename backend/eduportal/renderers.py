@@ -0,0 +1,72 @@
+"""
+JSON renderer backed by orjson, when it is installed.
+
+Output matches DRF's JSONRenderer: datetimes as ISO 8601 with `Z` for UTC,
+Decimals as floats, UUIDs as strings, and every other type through DRF's
+own JSONEncoder.default. Anything orjson refuses (integers beyond 64 bits,
+non-string keys it can't convert, indents other than 2) is re-rendered by
+the stdlib path, so responses only get faster, never different. That
+includes NaN and Infinity, which orjson would write as null: they raise
+the same ValueError as in DRF (or render as DRF does with STRICT_JSON off).
+"""
+
+import math
+from decimal import Decimal
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def has_non_finite(data):
+    """Whether NaN or Infinity appears anywhere in data, as a float or Decimal."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        # Exact type checks first: nearly every value is one of these
+        if kind is str or kind is int or value is None or kind is bool:
+            continue
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, Decimal) and not value.is_finite():
+            return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+    """Drop-in JSONRenderer that encodes with orjson and falls back to the stdlib encoder."""
+    
+    _default = staticmethod(JSONEncoder().default)
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent not in (None, 2) or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent == 2 else 0)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and has_non_finite(data):
+            # orjson wrote them as null; let the stdlib path raise DRF's error
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Same JavaScript-safety escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
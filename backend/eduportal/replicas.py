@@ -0,0 +1,133 @@
+"""
+Optional read replica.
+
+When a `replica` database is configured, GET/HEAD requests to list views
+and to views marked with `@replica_reads` (stats, analytics, ...) read from
+it; everything else, and every write, uses the primary. A user who has just
+written reads from the primary for REPLICA_READ_YOUR_WRITES_WINDOW seconds,
+so they never see the replica lagging behind their own change. Code outside
+requests (commands, tasks) can opt in with `using_replica()`.
+
+Without a replica every query goes to the primary, as before.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.mixins import ListModelMixin
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_read_alias = ContextVar('read_alias', default=None)
+
+
+def replica_configured():
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def replica_reads(view):
+    """Mark a read-only function view whose GETs may be served from the replica."""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def using_replica():
+    """Send the reads in this block to the replica, when one is configured."""
+    previous = _read_alias.get()
+    _read_alias.set(REPLICA_ALIAS if replica_configured() else None)
+    try:
+        yield
+    finally:
+        _read_alias.set(previous)
+
+
+def _recent_write_key(user_id):
+    return f'replica:recent-write:{user_id}'
+
+
+def note_write(user_id):
+    """Keep this user's reads on the primary until the replica has caught up."""
+    cache.set(_recent_write_key(user_id), True, settings.REPLICA_READ_YOUR_WRITES_WINDOW)
+
+
+def wrote_recently(user_id):
+    return cache.get(_recent_write_key(user_id)) is not None
+
+
+def _token_user_id(request):
+    # The view authenticates later; only the signed user id is needed here, without a query
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+    except (InvalidToken, TokenError):
+        return None
+
+
+def _reads_from_replica(view_func):
+    view_class = getattr(view_func, 'cls', None)
+    return getattr(view_func, 'replica_reads', False) or (
+        view_class is not None and issubclass(view_class, ListModelMixin)
+    )
+
+
+class ReplicaMiddleware:
+    """Pick the database each request reads from; remember who just wrote."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.set(None)
+
+        if replica_configured() and request.method not in SAFE_METHODS and response.status_code < 400:
+            # REST framework stores the user it authenticated on the Django request
+            user = getattr(request, 'user', None)
+            if user is not None and user.is_authenticated:
+                note_write(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD') or not replica_configured() or not _reads_from_replica(view_func):
+            return None
+        user_id = _token_user_id(request)
+        if user_id is not None and wrote_recently(user_id):
+            return None
+        _read_alias.set(REPLICA_ALIAS)
+        return None
+
+
+class ReplicaRouter:
+    """Reads go where the current request or `using_replica()` says; writes always go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Inside a transaction, read what it has written
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return None if db != REPLICA_ALIAS else False
@@ -0,0 +1,196 @@
+from operator import itemgetter
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+def _param_set(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return set()
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+
+def sparse_fieldset(request):
+    """
+    The `?fields=`, `?omit=` and `?expand=` sets of a GET request.
+    
+    `fields` is None when every field is wanted. Other methods always get
+    full output, so writes never lose fields.
+    """
+    if request is None or request.method != 'GET':
+        return None, set(), set()
+    return _param_set(request, 'fields') or None, _param_set(request, 'omit'), _param_set(request, 'expand')
+
+
+def select_fields(names, request):
+    """The names (in their order) a request asks to keep."""
+    fields, omit, _ = sparse_fieldset(request)
+    return [name for name in names if (fields is None or name in fields) and name not in omit]
+
+
+class SparseFieldsMixin:
+    """
+    Lets GET requests shape a serializer's output: `?fields=a,b` keeps only
+    those fields, `?omit=a,b` drops them, and `?expand=x` embeds a related
+    object for fields listed in `Meta.expandable_fields` (name -> serializer
+    class) instead of its id.
+    
+    Dropped fields are never computed, so omitting e.g. `likes_count` also
+    skips its query. Only the outermost serializer (or each item of an
+    outermost list) is shaped; nested serializers keep their fields.
+    
+    List views also load only the columns behind the kept fields, see
+    `sparse_queryset` and eduportal.filters.SparseFieldsFilter.
+    """
+    
+    @classmethod
+    def sparse_queryset(cls, queryset, context):
+        """
+        `queryset.only()` the model fields a `?fields=`/`?omit=` request keeps.
+        
+        Columns are only known for fields read straight off the model (or a
+        related object, or an annotation); a kept SerializerMethodField,
+        property or `source='*'` field could read anything, so the queryset
+        is returned unchanged. Annotations are left as they are.
+        """
+        fields, omit, _ = sparse_fieldset(context.get('request'))
+        query = queryset.query
+        if (fields is None and not omit) or query.select_related is True or query.deferred_loading != (frozenset(), True):
+            return queryset
+        
+        opts = queryset.model._meta
+        # Fields traversed by select_related() can't be deferred
+        columns = {opts.pk.name, *(query.select_related or {})}
+        for field in cls(context=context).fields.values():
+            if isinstance(field, serializers.SerializerMethodField) or field.source == '*':
+                return queryset
+            name = field.source.split('.')[0]
+            if name in query.annotations:
+                continue
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                return queryset
+            if model_field.concrete and not model_field.many_to_many:
+                columns.add(model_field.name)
+            elif not (model_field.many_to_many or model_field.auto_created):
+                return queryset
+        return queryset.only(*columns)
+    
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not self._is_output_root():
+            return fields
+        
+        _, _, expand = sparse_fieldset(request)
+        for name, serializer_class in getattr(self.Meta, 'expandable_fields', {}).items():
+            if name in expand and name in fields:
+                fields[name] = serializer_class(read_only=True)
+        return {name: fields[name] for name in select_fields(fields, request)}
+    
+    def _is_output_root(self):
+        parent = self.parent
+        return parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for list pages built from `.values()` rows.
+    
+    Rows come straight from the database cursor with related names joined in,
+    so no model instances (or related instances) are created per item; the
+    output must stay identical to the ModelSerializer the list normally uses.
+    
+    `values_fields` maps each output field, in output order, to the columns
+    or annotation names it is built from. A field is its single column as-is,
+    formatted if listed in `datetime_fields`/`date_fields`, or computed by a
+    `get_<field>(row)` method. Only the columns and annotations (from
+    `annotations()`) behind the fields a request keeps are queried, so
+    `?fields=`/`?omit=` make the query itself cheaper.
+    """
+    
+    values_fields = {}
+    datetime_fields = ()
+    date_fields = ()
+    
+    _datetime_field = serializers.DateTimeField()
+    _date_field = serializers.DateField()
+    
+    @classmethod
+    def annotations(cls, context):
+        """Annotation expressions by name; only those behind requested fields are used."""
+        return {}
+    
+    @classmethod
+    def values_queryset(cls, queryset, context):
+        columns = []
+        for name in select_fields(cls.values_fields, context.get('request')):
+            columns.extend(column for column in cls.values_fields[name] if column not in columns)
+        annotations = {
+            name: expression for name, expression in cls.annotations(context).items() if name in columns
+        }
+        return queryset.annotate(**annotations).values(*columns)
+    
+    @cached_property
+    def request(self):
+        return self.context.get('request')
+    
+    @cached_property
+    def _getters(self):
+        getters = []
+        for name in select_fields(self.values_fields, self.request):
+            getter = getattr(self, f'get_{name}', None)
+            if getter is None:
+                column = itemgetter(self.values_fields[name][0])
+                if name in self.datetime_fields:
+                    getter = lambda row, column=column: self.datetime(column(row))
+                elif name in self.date_fields:
+                    getter = lambda row, column=column: self.date(column(row))
+                else:
+                    getter = column
+            getters.append((name, getter))
+        return getters
+    
+    def to_representation(self, row):
+        return {name: getter(row) for name, getter in self._getters}
+    
+    def to_internal_value(self, data):
+        # Only list GETs use these; anything handing one input gets a 400, not a crash
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [f"{type(self).__name__} is read-only."]
+        })
+    
+    def datetime(self, value):
+        """Same output as serializers.DateTimeField (current timezone, ISO 8601)."""
+        return self._datetime_field.to_representation(value) if value is not None else None
+    
+    def date(self, value):
+        return self._date_field.to_representation(value) if value is not None else None
+    
+    def file_url(self, storage, name):
+        """Same output as serializers.FileField, and the `*_file_url` methods when there is a request."""
+        if not name:
+            return None
+        url = storage.url(name)
+        return self.request.build_absolute_uri(url) if self.request is not None else url
+    
+    @staticmethod
+    def full_name(first_name, last_name):
+        """User.full_name from joined columns; None when the user itself is null."""
+        if first_name is None and last_name is None:
+            return None
+        return f"{first_name} {last_name}".strip()
+
+
+def count_subquery(model, fk_name):
+    """Number of `model` rows pointing at the outer row through `fk_name`, 0 when none."""
+    rows = (
+        model.objects.filter(**{fk_name: OuterRef('pk')})
+        .order_by().values(fk_name).annotate(count=Count('*')).values('count')
+    )
+    return Coalesce(Subquery(rows), 0)
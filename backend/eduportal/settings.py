@@ -3,8 +3,10 @@ Django settings for eduportal project.
 """
 
 from pathlib import Path
+from importlib.util import find_spec
 from decouple import config
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -30,17 +32,24 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     'django_filters',
 ]
 
 LOCAL_APPS = [
+    'blobs',
     'accounts',
     'achievements',
     'certificates',
     'volunteering',
     'reports',
     'notifications',
+    'feed',
+    'dashboard',
+    'search',
+    'tags',
+    'uploads',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -55,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'eduportal.replicas.ReplicaMiddleware',
 ]
 
 ROOT_URLCONF = 'eduportal.urls'
@@ -95,8 +105,68 @@ else:
             'PASSWORD': config('DB_PASSWORD', default='password'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
+            # PgBouncer in transaction pooling mode hands each transaction to any server
+            # connection, so a server-side cursor can't outlive the transaction that opened it
+            'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
         }
     }
+    if config('DB_POOL', default=False, cast=bool):
+        # psycopg 3 connection pool (pip install "psycopg[binary,pool]"), one per process;
+        # connections go back to the pool after each request instead of being kept per thread
+        if find_spec('psycopg') is None or find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured(
+                'DB_POOL=True needs psycopg 3 with its pool: pip install "psycopg[binary,pool]" '
+                '(psycopg2-binary has no pool support).'
+            )
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+                'max_size': config('DB_POOL_MAX_SIZE', default=20, cast=int),
+                'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+            },
+        }
+
+# Keep a thread's connection open for DB_CONN_MAX_AGE seconds instead of opening one per
+# request (0 closes it after every request, as a pool requires); a connection that has
+# gone bad is replaced at the start of the next request rather than failing it
+DATABASES['default']['CONN_MAX_AGE'] = (
+    0 if 'pool' in DATABASES['default'].get('OPTIONS', {}) else config('DB_CONN_MAX_AGE', default=60, cast=int)
+)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+# Optional read replica for stats, analytics and list GETs (eduportal/replicas.py); it
+# shares the primary's credentials. Point DB_REPLICA_NAME at the SQLite file to try it locally
+if config('DB_REPLICA_HOST', default='') or config('DB_REPLICA_NAME', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=str(DATABASES['default']['NAME'])),
+        'HOST': config('DB_REPLICA_HOST', default=DATABASES['default'].get('HOST', '')),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default'].get('PORT', '')),
+        'OPTIONS': {**DATABASES['default'].get('OPTIONS', {})},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['eduportal.replicas.ReplicaRouter']
+
+# Seconds a user's reads stay on the primary after they write, covering replication lag
+REPLICA_READ_YOUR_WRITES_WINDOW = config('REPLICA_READ_YOUR_WRITES_WINDOW', default=5, cast=int)
+
+# Password hashing: PASSWORD_HASHER makes new hashes, and re-hashes older ones at login;
+# the others stay listed so existing hashes still verify
+PASSWORD_HASHER_CHOICES = {
+    'argon2': 'accounts.hashers.TunedArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'pbkdf2_sha1': 'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'bcrypt_sha256': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2')
+PASSWORD_HASHERS = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER
+]
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)  # KiB
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -138,18 +208,38 @@ AUTH_USER_MODEL = 'accounts.User'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication that trusts token claims and caches users instead of a query per request
+        'accounts.authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed when installed, identical output to DRF's JSON classes otherwise
+    'DEFAULT_RENDERER_CLASSES': [
+        'eduportal.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'eduportal.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
+        # Loads only the columns behind ?fields=/?omit= on list pages
+        'eduportal.filters.SparseFieldsFilter',
+    ],
+    # Per-role token buckets (eduportal/throttling.py); views declare what a request costs
+    'DEFAULT_THROTTLE_CLASSES': [
+        'eduportal.throttling.TokenBucketThrottle',
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'certificate_verification': config('CERTIFICATE_VERIFICATION_RATE', default='60/min'),
+    },
 }
 
 # JWT Configuration
@@ -177,6 +267,9 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.ClaimsTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.serializers.ClaimsTokenRefreshSerializer',
+    'TOKEN_BLACKLIST_SERIALIZER': 'accounts.serializers.ClaimsTokenBlacklistSerializer',
 }
 
 # CORS Configuration
@@ -211,6 +304,76 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Give up publishing after one reconnect, so callers can fall back instead of waiting on a missing broker
+CELERY_BROKER_TRANSPORT_OPTIONS = {'max_retries': 1, 'interval_start': 0}
+CELERY_BEAT_SCHEDULE = {
+    'sweep-certificate-expiry': {
+        'task': 'certificates.tasks.sweep_certificate_expiry_task',
+        'schedule': config('CERTIFICATE_SWEEP_INTERVAL', default=300, cast=int),  # seconds
+    },
+    'purge-stale-uploads': {
+        'task': 'uploads.tasks.purge_stale_uploads_task',
+        'schedule': 3600,
+    },
+}
+
+# Chunked uploads
+UPLOAD_CHUNK_SIZE = config('UPLOAD_CHUNK_SIZE', default=5 * 1024 * 1024, cast=int)  # bytes per PATCH
+UPLOAD_MAX_SIZE = config('UPLOAD_MAX_SIZE', default=1024 * 1024 * 1024, cast=int)  # bytes per file
+UPLOAD_SESSION_TTL = config('UPLOAD_SESSION_TTL', default=24, cast=int)  # hours an idle upload is kept
+
+# Certificates
+CERTIFICATE_EXPIRY_NOTICE_DAYS = config('CERTIFICATE_EXPIRY_NOTICE_DAYS', default=30, cast=int)
+CERTIFICATE_VERIFICATION_CACHE_TIMEOUT = config('CERTIFICATE_VERIFICATION_CACHE_TIMEOUT', default=3600, cast=int)
+CERTIFICATE_VERIFICATION_MAX_AGE = config('CERTIFICATE_VERIFICATION_MAX_AGE', default=300, cast=int)  # browser/CDN cache
+
+# Cache Configuration
+# Redis is used when REDIS_URL is set, otherwise a per-process memory cache
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds between writes of the login/logout sessions queued in Redis (0 writes them during the request)
+SESSION_TRACKING_FLUSH_INTERVAL = config('SESSION_TRACKING_FLUSH_INTERVAL', default=5, cast=float)
+if REDIS_URL and SESSION_TRACKING_FLUSH_INTERVAL > 0:
+    CELERY_BEAT_SCHEDULE['flush-session-events'] = {
+        'task': 'accounts.tasks.flush_session_events_task',
+        'schedule': SESSION_TRACKING_FLUSH_INTERVAL,
+    }
+
+# Seconds that department/analytics aggregates stay cached
+ANALYTICS_CACHE_TIMEOUT = config('ANALYTICS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds that the first page of a user's activity feed stays cached
+FEED_CACHE_TIMEOUT = config('FEED_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds that a user's combined dashboard stays cached
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=60, cast=int)
+
+# Request budgets per role: "N/period" is a bucket of N tokens that refills N per period;
+# a request spends its view's request_cost (default 1); blank means unlimited
+REQUEST_BUDGETS = {
+    'student': config('REQUEST_BUDGET_STUDENT', default='120/min'),
+    'faculty': config('REQUEST_BUDGET_FACULTY', default='300/min'),
+    'admin': config('REQUEST_BUDGET_ADMIN', default='300/min'),
+}
+
+# Threads (each with its own DB connection) that async views run independent queries on
+ASYNC_QUERY_WORKERS = config('ASYNC_QUERY_WORKERS', default=16, cast=int)
+
+# Seconds between keep-alive comments on an idle notification stream
+NOTIFICATION_STREAM_KEEPALIVE = config('NOTIFICATION_STREAM_KEEPALIVE', default=15, cast=int)
 
 # Logging Configuration
 import os
@@ -0,0 +1,132 @@
+import unittest
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from accounts.models import Department, User
+from achievements.models import Achievement, AchievementCategory, AchievementLike
+from eduportal import throttling
+from volunteering.models import VolunteeringApplication, VolunteeringCategory, VolunteeringOpportunity
+
+
+def redis_cache_configured():
+    return isinstance(caches['default'], RedisCache)
+
+
+class TokenBucketTests(SimpleTestCase):
+    """Token bucket behaviour on whichever cache backend is configured."""
+
+    def setUp(self):
+        self.key = f'throttle:test:{uuid.uuid4().hex}'
+
+    def tearDown(self):
+        caches['default'].delete(self.key)
+
+    def test_spends_until_empty(self):
+        self.assertEqual(throttling.take(self.key, 3, 0.001, 2), (True, 0))
+        allowed, wait = throttling.take(self.key, 3, 0.001, 2)
+        self.assertFalse(allowed)
+        self.assertGreater(wait, 0)
+
+    def test_cost_above_capacity_is_capped(self):
+        allowed, _ = throttling.take(self.key, 5, 1, 50)
+        self.assertTrue(allowed)
+
+
+@unittest.skipUnless(redis_cache_configured(), 'needs REDIS_URL')
+class RedisTokenBucketTests(SimpleTestCase):
+    """The Redis path: buckets live in Redis and are updated atomically."""
+
+    def setUp(self):
+        import redis
+
+        self.key = f'throttle:test:{uuid.uuid4().hex}'
+        self.client = redis.Redis.from_url(settings.REDIS_URL)
+        self.redis_key = caches['default'].make_and_validate_key(self.key)
+
+    def tearDown(self):
+        self.client.delete(self.redis_key)
+
+    def test_bucket_is_kept_in_redis(self):
+        throttling.take(self.key, 10, 0.001, 4)
+        tokens = float(self.client.hget(self.redis_key, 'tokens'))
+        self.assertAlmostEqual(tokens, 6, places=2)
+
+    def test_concurrent_requests_never_overspend(self):
+        capacity = 20
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(lambda _: throttling.take(self.key, capacity, 0.001, 1)[0], range(100)))
+        self.assertEqual(sum(results), capacity)
+
+
+class ConditionalGetTests(TestCase):
+    """ETags change whenever something the serializer shows changes."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Physics', code='PHY')
+        cls.admin = User.objects.create_user(
+            email='admin@test.local', username='admin', password='pw', role='admin', department=cls.department
+        )
+        cls.student = User.objects.create_user(
+            email='student@test.local', username='student', password='pw', role='student', department=cls.department
+        )
+        cls.department_head = User.objects.create_user(
+            email='head@test.local', username='head', password='pw', role='faculty', department=cls.department
+        )
+    
+    def setUp(self):
+        caches['default'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+    
+    def assertChanged(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+    
+    def test_accepted_application_changes_opportunity(self):
+        opportunity = VolunteeringOpportunity.objects.create(
+            title='Tutoring', description='d', organization='Org', location='Campus',
+            category=VolunteeringCategory.objects.create(name='Education'),
+            start_date=date.today(), end_date=date.today() + timedelta(days=30), required_hours=10,
+            max_volunteers=5, contact_email='org@test.local', created_by=self.admin,
+        )
+        application = VolunteeringApplication.objects.create(
+            opportunity=opportunity, user=self.student, motivation='m', available_hours=5
+        )
+        self.assertChanged('/api/volunteering/opportunities/', lambda: application.accept(self.admin))
+        self.assertChanged(
+            f'/api/volunteering/opportunities/{opportunity.pk}/', lambda: application.reject(self.admin)
+        )
+    
+    def test_new_member_changes_department(self):
+        def join():
+            User.objects.create_user(
+                email='new@test.local', username='new', password='pw', role='student', department=self.department
+            )
+        
+        self.assertChanged('/api/auth/departments/', join)
+        self.assertChanged(
+            f'/api/auth/departments/{self.department.pk}/',
+            lambda: User.objects.filter(username='new').update(department=None),
+        )
+    
+    def test_unlike_changes_achievement(self):
+        achievement = Achievement.objects.create(
+            user=self.student, title='Award', description='d', category=AchievementCategory.objects.create(name='A')
+        )
+        for user in (self.admin, self.student, self.department_head):
+            AchievementLike.objects.create(achievement=achievement, user=user)
+        # Older likes, so the newest like pk stays the same
+        self.assertChanged('/api/achievements/', lambda: achievement.likes.filter(user=self.admin).delete())
+        self.assertChanged(
+            f'/api/achievements/{achievement.pk}/', lambda: achievement.likes.filter(user=self.student).delete()
+        )
@@ -0,0 +1,125 @@
+"""
+Token-bucket request budgets.
+
+Every authenticated user has a bucket sized by their role's entry in
+REQUEST_BUDGETS: "120/min" holds 120 tokens and refills 120 per minute.
+Each request spends its view's `request_cost` (1 unless the view declares
+more), so a burst of expensive analytics calls drains the bucket long
+before the same number of cheap list requests would. Requests that find
+too few tokens get 429 with a Retry-After of when enough will be back.
+
+With Redis the bucket is updated by one server-side script, atomic across
+every process. Other cache backends are per process anyway and are
+updated under a lock.
+"""
+
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.throttling import BaseThrottle
+
+DEFAULT_REQUEST_COST = 1
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# KEYS[1]: bucket hash; ARGV: capacity, tokens per second, cost. Returns {allowed, seconds to wait}
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed, wait = 1, 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    allowed, wait = 0, (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+_local_lock = threading.Lock()
+_take_script = None
+_redis_lock = threading.Lock()
+
+
+def request_cost(cost):
+    """Declare what a function view's requests spend from the caller's budget (`@api_view` views)."""
+    def decorator(view):
+        view.cls.request_cost = cost
+        return view
+    return decorator
+
+
+def parse_budget(budget):
+    """'120/min' -> (capacity 120, refill 2.0 tokens per second)."""
+    tokens, period = budget.split('/')
+    tokens = int(tokens)
+    return tokens, tokens / PERIODS[period[0]]
+
+
+def _redis_script():
+    global _take_script
+    if _take_script is None:
+        import redis
+
+        with _redis_lock:
+            if _take_script is None:
+                # Same server as the Redis cache (both come from REDIS_URL)
+                _take_script = redis.Redis.from_url(settings.REDIS_URL).register_script(TAKE_SCRIPT)
+    return _take_script
+
+
+def _take_redis(backend, key, capacity, rate, cost):
+    allowed, wait = _redis_script()(keys=[backend.make_and_validate_key(key)], args=[capacity, rate, cost])
+    return bool(allowed), float(wait)
+
+
+def _take_local(key, capacity, rate, cost):
+    with _local_lock:
+        now = time.time()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + max(0, now - updated) * rate)
+        allowed, wait = tokens >= cost, 0
+        if allowed:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / rate
+        cache.set(key, (tokens, now), int(capacity / rate) + 1)
+    return allowed, wait
+
+
+def take(key, capacity, rate, cost):
+    """Spend `cost` tokens from a bucket if it holds them; return (allowed, seconds until it would)."""
+    cost = min(cost, capacity)  # A bigger cost could never be paid
+    # `cache` is a proxy; the backend behind it is what tells whether buckets can live in Redis
+    backend = caches['default']
+    if isinstance(backend, RedisCache):
+        return _take_redis(backend, key, capacity, rate, cost)
+    return _take_local(key, capacity, rate, cost)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Spend the view's `request_cost` from the user's per-role token bucket."""
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        user = request.user
+        budget = settings.REQUEST_BUDGETS.get(getattr(user, 'role', None)) if user.is_authenticated else None
+        if not budget:
+            return True
+
+        capacity, rate = parse_budget(budget)
+        cost = getattr(view, 'request_cost', DEFAULT_REQUEST_COST)
+        allowed, self.wait_seconds = take(f'throttle:bucket:{user.pk}', capacity, rate, cost)
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
@@ -22,6 +22,11 @@ urlpatterns = [
     path('api/volunteering/', include('volunteering.urls')),
     path('api/reports/', include('reports.urls')),
     path('api/notifications/', include('notifications.urls')),
+    path('api/feed/', include('feed.urls')),
+    path('api/dashboard/', include('dashboard.urls')),
+    path('api/search/', include('search.urls')),
+    path('api/tags/', include('tags.urls')),
+    path('api/uploads/', include('uploads.urls')),
 ]
 
 # Serve media files in development
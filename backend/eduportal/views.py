@@ -0,0 +1,132 @@
+import hashlib
+from django.db import models
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from .serializers import count_subquery, sparse_fieldset
+
+
+def choice_counts(field):
+    """Row count per choice of a model field, for ConditionalGetMixin.etag_aggregates."""
+    return {
+        f'{field.name}_{value}': Count('pk', filter=Q(**{field.name: value}))
+        for value, _ in field.choices
+    }
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET with 304 Not Modified, before anything is serialized, when the
+    client's `If-None-Match` still matches the resource's version.
+    
+    The version is one aggregate query over the view's filtered queryset
+    (narrowed to the looked-up object on detail views): row count, highest
+    pk, the latest value of each of the model's DateTimeFields, and a sum of
+    every numeric annotation the queryset carries (e.g. `user_count`), so a
+    change to what those annotations count changes the version too. Reverse
+    relations named in `etag_related` (likes, comments, ...) add, per row,
+    the related row count, newest pk and count per choice of each of its
+    choice fields; `etag_aggregates` adds state that changes without a
+    timestamp. It is hashed with the full path, the user and the negotiated
+    media type.
+    
+    Annotations are summed both as-is and weighted by pk, so a count moving
+    from one row to another changes the version as well. Edits that touch
+    none of these (e.g. renaming a category) show up once the list itself
+    next changes.
+    """
+    
+    etag_related = ()
+    etag_aggregates = {}
+    
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is not None and self._etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            # Browsers keep the copy but check back every time; shared caches never store it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+    
+    def get_etag_queryset(self, queryset):
+        """The queryset with `etag_related` counts as annotations."""
+        annotations = {}
+        for name in self.etag_related:
+            relation = queryset.model._meta.get_field(name)
+            related_model, fk_name = relation.related_model, relation.field.name
+            annotations[f'etag_{name}_count'] = count_subquery(related_model, fk_name)
+            rows = related_model.objects.filter(**{fk_name: OuterRef('pk')}).order_by().values(fk_name)
+            annotations[f'etag_{name}_max_pk'] = Coalesce(Subquery(rows.annotate(newest=Max('pk')).values('newest')), 0)
+            for field in related_model._meta.concrete_fields:
+                for value, _ in field.choices or ():
+                    choice_rows = rows.filter(**{field.name: value}).annotate(count=Count('*')).values('count')
+                    annotations[f'etag_{name}_{field.name}_{value}'] = Coalesce(Subquery(choice_rows), 0)
+        return queryset.annotate(**annotations)
+    
+    def get_etag_aggregates(self, queryset):
+        aggregates = {'count': Count('pk'), 'max_pk': Max('pk')}
+        for field in queryset.model._meta.concrete_fields:
+            if isinstance(field, models.DateTimeField):
+                aggregates[f'max_{field.attname}'] = Max(field.attname)
+        weighted = {}
+        for name, annotation in queryset.query.annotations.items():
+            if isinstance(annotation.output_field, (models.IntegerField, models.FloatField, models.DecimalField)):
+                aggregates[f'sum_{name}'] = Sum(name)
+                weighted[f'etag_weighted_{name}'] = F(name) * F('pk')
+                aggregates[f'sum_weighted_{name}'] = Sum(f'etag_weighted_{name}')
+        aggregates.update(self.etag_aggregates)
+        return queryset.annotate(**weighted), aggregates
+    
+    def get_etag(self, request):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg not in self.kwargs and not hasattr(self, 'list'):
+            return None  # Detail views resolving their object another way, e.g. request.user
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        if lookup_url_kwarg in self.kwargs:
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        queryset, aggregates = self.get_etag_aggregates(self.get_etag_queryset(queryset))
+        version = queryset.order_by().aggregate(**aggregates)
+        
+        parts = [request.get_full_path(), str(request.user.pk), request.accepted_media_type or '']
+        parts.extend(f'{name}={value}' for name, value in sorted(version.items()))
+        return 'W/"%s"' % hashlib.md5('|'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    
+    @staticmethod
+    def _etag_matches(request, etag):
+        client_etags = parse_etags(request.headers.get('If-None-Match', ''))
+        return any(client_etag.removeprefix('W/') == etag.removeprefix('W/') for client_etag in client_etags)
+
+
+class ValuesListMixin:
+    """
+    Serve a ListAPIView's GET through `values_serializer_class` (a
+    ValuesSerializer), i.e. from `.values()` rows instead of model instances.
+    
+    The filtered queryset and pagination are the view's usual ones. Requests
+    with `?expand=` use the regular serializer, which embeds related objects;
+    so does every request when the attribute is None.
+    """
+    
+    values_serializer_class = None
+    
+    def list(self, request, *args, **kwargs):
+        _, _, expand = sparse_fieldset(request)
+        if self.values_serializer_class is None or expand:
+            return super().list(request, *args, **kwargs)
+        
+        context = self.get_serializer_context()
+        queryset = self.values_serializer_class.values_queryset(self.filter_queryset(self.get_queryset()), context)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.values_serializer_class(page, many=True, context=context)
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = self.values_serializer_class(queryset, many=True, context=context)
+        return Response(serializer.data)
@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+
+class FeedItemSerializer(serializers.Serializer):
+    """Serializer for a single entry of the merged activity feed."""
+    
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    user = serializers.IntegerField()
+    user_name = serializers.CharField()
+    title = serializers.CharField()
+    status = serializers.CharField()
+    points = serializers.IntegerField()
+    category_name = serializers.CharField()
+    likes_count = serializers.IntegerField()
+    comments_count = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+
+
+class FeedPageSerializer(serializers.Serializer):
+    """Serializer for one keyset-paginated page of the activity feed."""
+    
+    results = FeedItemSerializer(many=True)
+    next_cursor = serializers.CharField(allow_null=True)
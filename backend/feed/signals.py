@@ -0,0 +1,50 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from achievements.models import Achievement, AchievementComment, AchievementLike
+from certificates.models import Certificate, CertificateComment, CertificateLike
+from volunteering.models import VolunteeringActivity, VolunteeringComment, VolunteeringLike
+from .views import invalidate_feed
+
+# Likes and comments -> the foreign key to the feed record whose counts they change
+REACTION_RECORDS = {
+    AchievementLike: 'achievement',
+    AchievementComment: 'achievement',
+    CertificateLike: 'certificate',
+    CertificateComment: 'certificate',
+    VolunteeringLike: 'activity',
+    VolunteeringComment: 'activity',
+}
+
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=VolunteeringActivity)
+@receiver(post_delete, sender=Achievement)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=VolunteeringActivity)
+def invalidate_user_feed(sender, instance, **kwargs):
+    """Drop the cached first feed page of the record's owner."""
+    invalidate_feed(instance.user_id)
+
+
+@receiver(post_save, sender=AchievementLike)
+@receiver(post_save, sender=AchievementComment)
+@receiver(post_save, sender=CertificateLike)
+@receiver(post_save, sender=CertificateComment)
+@receiver(post_save, sender=VolunteeringLike)
+@receiver(post_save, sender=VolunteeringComment)
+@receiver(post_delete, sender=AchievementLike)
+@receiver(post_delete, sender=AchievementComment)
+@receiver(post_delete, sender=CertificateLike)
+@receiver(post_delete, sender=CertificateComment)
+@receiver(post_delete, sender=VolunteeringLike)
+@receiver(post_delete, sender=VolunteeringComment)
+def invalidate_reacted_feed(sender, instance, **kwargs):
+    """Drop the cached first feed page of the liked or commented record's owner, whose counts it shows."""
+    field = sender._meta.get_field(REACTION_RECORDS[sender])
+    owner_id = (
+        field.related_model.objects.filter(pk=getattr(instance, field.attname))
+        .values_list('user_id', flat=True).first()
+    )
+    if owner_id is not None:  # Gone when the record itself was deleted, which already dropped the page
+        invalidate_feed(owner_id)
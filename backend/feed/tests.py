@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from achievements.models import Achievement, AchievementCategory, AchievementComment, AchievementLike
+
+
+class FeedCacheTests(TestCase):
+    """The cached first feed page never shows stale like or comment counts."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email='owner@test.local', username='owner', password='pw', role='student')
+        cls.other = User.objects.create_user(email='other@test.local', username='other', password='pw', role='student')
+        cls.achievement = Achievement.objects.create(
+            user=cls.owner, title='Award', description='d', category=AchievementCategory.objects.create(name='A')
+        )
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+    
+    def counts(self):
+        [item] = self.client.get('/api/feed/').data['results']
+        return item['likes_count'], item['comments_count']
+    
+    def test_likes_and_comments_by_others_refresh_the_cached_page(self):
+        self.assertEqual(self.counts(), (0, 0))
+        like = AchievementLike.objects.create(achievement=self.achievement, user=self.other)
+        self.assertEqual(self.counts(), (1, 0))
+        AchievementComment.objects.create(achievement=self.achievement, user=self.other, comment='Nice')
+        self.assertEqual(self.counts(), (1, 1))
+        like.delete()
+        self.assertEqual(self.counts(), (0, 1))
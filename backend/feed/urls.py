@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Activity feed
+    path('', views.activity_feed, name='activity-feed'),
+]
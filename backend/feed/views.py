@@ -0,0 +1,152 @@
+import base64
+import heapq
+import json
+from itertools import islice
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from achievements.models import Achievement
+from certificates.models import Certificate
+from volunteering.models import VolunteeringActivity
+from eduportal.replicas import replica_reads
+from .serializers import FeedPageSerializer
+
+# Merge order for records sharing a timestamp: (created_at, rank, id), newest first
+FEED_SOURCES = [
+    ('achievement', Achievement),
+    ('certificate', Certificate),
+    ('volunteering', VolunteeringActivity),
+]
+
+MAX_PAGE_SIZE = 100
+
+
+def feed_cache_key(user_id):
+    return f'feed:user:{user_id}'
+
+
+def invalidate_feed(user_id):
+    """Forget the cached first page of a user's feed."""
+    cache.delete(feed_cache_key(user_id))
+
+
+def encode_cursor(item):
+    payload = json.dumps([item['created_at'].isoformat(), item['rank'], item['id']])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(value):
+    """Return (created_at, rank, id) or raise ValueError for a malformed cursor."""
+    try:
+        created_at, rank, pk = json.loads(base64.urlsafe_b64decode(value.encode()).decode())
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor.')
+    created_at = parse_datetime(created_at) if isinstance(created_at, str) else None
+    if created_at is None or not isinstance(rank, int) or not isinstance(pk, int):
+        raise ValueError('Invalid cursor.')
+    return created_at, rank, pk
+
+
+def fetch_source(rank, model, user_id, cursor, limit):
+    """Fetch the next `limit` rows of one source strictly after the cursor."""
+    queryset = model.objects.filter(user_id=user_id)
+
+    if cursor:
+        created_at, cursor_rank, cursor_id = cursor
+        if rank < cursor_rank:
+            queryset = queryset.filter(created_at__lte=created_at)
+        elif rank == cursor_rank:
+            queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=cursor_id))
+        else:
+            queryset = queryset.filter(created_at__lt=created_at)
+
+    rows = queryset.annotate(
+        likes_count=Count('likes', distinct=True),
+        comments_count=Count('comments', distinct=True),
+    ).order_by('-created_at', '-id').values(
+        'id', 'user', 'user__first_name', 'user__last_name', 'title', 'status',
+        'points', 'category__name', 'created_at', 'likes_count', 'comments_count'
+    )[:limit]
+
+    for row in rows:
+        row['rank'] = rank
+        yield row
+
+
+def build_feed_page(user_id, cursor, page_size):
+    """K-way merge the per-source pages into one page of the feed."""
+    sources = [
+        list(fetch_source(rank, model, user_id, cursor, page_size + 1))
+        for rank, (_, model) in enumerate(FEED_SOURCES)
+    ]
+    merged = list(islice(
+        heapq.merge(*sources, key=lambda row: (row['created_at'], row['rank'], row['id']), reverse=True),
+        page_size + 1
+    ))
+
+    page = merged[:page_size]
+    results = [
+        {
+            'type': FEED_SOURCES[row['rank']][0],
+            'id': row['id'],
+            'user': row['user'],
+            'user_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            'title': row['title'],
+            'status': row['status'],
+            'points': row['points'],
+            'category_name': row['category__name'],
+            'likes_count': row['likes_count'],
+            'comments_count': row['comments_count'],
+            'created_at': row['created_at'],
+        }
+        for row in page
+    ]
+    next_cursor = encode_cursor(page[-1]) if len(merged) > page_size else None
+
+    return FeedPageSerializer({'results': results, 'next_cursor': next_cursor}).data
+
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def activity_feed(request):
+    """Get a user's achievements, certificates and volunteering merged newest first."""
+    user = request.user
+    default_page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+
+    user_id = user.id
+    user_filter = request.query_params.get('user')
+    if user_filter and (user.is_faculty() or user.is_admin()):
+        try:
+            user_id = int(user_filter)
+        except ValueError:
+            return Response({'error': 'Invalid user.'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page_size = int(request.query_params.get('page_size', default_page_size))
+    except ValueError:
+        return Response({'error': 'Invalid page size.'}, status=status.HTTP_400_BAD_REQUEST)
+    page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+    cursor = None
+    cursor_param = request.query_params.get('cursor')
+    if cursor_param:
+        try:
+            cursor = decode_cursor(cursor_param)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Only the default-sized first page is cached; deeper pages are cheap keyset reads
+    if cursor is None and page_size == default_page_size:
+        cache_key = feed_cache_key(user_id)
+        data = cache.get(cache_key)
+        if data is None:
+            data = build_feed_page(user_id, None, page_size)
+            cache.set(cache_key, data, settings.FEED_CACHE_TIMEOUT)
+        return Response(data)
+
+    return Response(build_feed_page(user_id, cursor, page_size))
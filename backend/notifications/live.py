@@ -0,0 +1,190 @@
+"""
+Pub/sub behind the live notification stream.
+
+Synchronous code (signals, views, sweeps) calls `publish_notifications()` /
+`publish_unread_count()`; messages go out once the surrounding transaction
+commits, each carrying its user's unread count at that point. Each open
+stream holds a `subscription()` for its user.
+
+Without REDIS_URL delivery stays inside the process, which is enough for a
+single ASGI server. With it, every message goes through one Redis channel
+and each process runs a single listener that fans messages out to its own
+subscribers, so notifications created by other workers (or Celery) arrive
+too.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'eduportal:notifications'
+QUEUE_SIZE = 100  # messages a stalled stream may fall behind before it is closed
+LISTENER_RETRY_DELAY = 5  # seconds
+
+
+class Subscription:
+    """One open stream's queue; `overflowed` tells it to close so the client reconnects and replays."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        self.overflowed = False
+
+    def put(self, message):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class LocalBroker:
+    """Per-process subscribers, keyed by user id; safe to publish to from any thread."""
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[user_id]
+
+    def deliver(self, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(message['user_id'], ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                pass  # Event loop already closed; its stream is gone
+
+
+class RedisBroker(LocalBroker):
+    """LocalBroker whose messages travel through a Redis channel shared by all processes."""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listeners = {}
+
+    def subscribe(self, user_id):
+        loop = asyncio.get_running_loop()
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self._listen())
+        return super().subscribe(user_id)
+
+    def publish(self, message):
+        import redis
+
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        try:
+            self._client.publish(CHANNEL, json.dumps(message, separators=(',', ':')))
+        except redis.RedisError:
+            logger.exception('Could not publish a live notification to Redis; delivering locally only')
+            self.deliver(message)
+
+    async def _listen(self):
+        import redis.asyncio
+
+        while True:
+            client = redis.asyncio.Redis.from_url(self.url)
+            try:
+                async with client.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for item in pubsub.listen():
+                        if item['type'] == 'message':
+                            self.deliver(json.loads(item['data']))
+            except redis.RedisError:
+                logger.exception('Live notification listener lost Redis; retrying')
+                await asyncio.sleep(LISTENER_RETRY_DELAY)
+            finally:
+                await client.aclose()
+
+
+class InProcessBroker(LocalBroker):
+
+    def publish(self, message):
+        self.deliver(message)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = RedisBroker(settings.REDIS_URL) if settings.REDIS_URL else InProcessBroker()
+    return _broker
+
+
+@asynccontextmanager
+async def subscription(user_id):
+    """Receive the messages published for one user while the block runs."""
+    broker = get_broker()
+    subscription = broker.subscribe(user_id)
+    try:
+        yield subscription
+    finally:
+        broker.unsubscribe(user_id, subscription)
+
+
+def _with_unread_counts(messages):
+    """Add each user's unread count, so streams never query it themselves."""
+    from django.db.models import Count
+    from .models import Notification
+
+    counts = dict(
+        Notification.objects.filter(user_id__in={message['user_id'] for message in messages}, is_read=False)
+        .order_by().values('user_id').annotate(count=Count('pk')).values_list('user_id', 'count')
+    )
+    return [{**message, 'unread_count': counts.get(message['user_id'], 0)} for message in messages]
+
+
+def _publish(messages):
+    broker = get_broker()
+    for message in _with_unread_counts(messages):
+        broker.publish(message)
+
+
+def publish_notifications(notifications):
+    """
+    Announce new notifications to their users' streams once the transaction
+    commits. Only ids travel; each listening stream loads the rows itself.
+    """
+    messages = [
+        {'user_id': notification.user_id, 'event': 'notification', 'id': notification.pk}
+        for notification in notifications
+    ]
+    if messages:
+        transaction.on_commit(partial(_publish, messages))
+
+
+def publish_unread_count(user_ids):
+    """Tell these users' streams to resend their unread count once the transaction commits."""
+    messages = [{'user_id': user_id, 'event': 'unread_count'} for user_id in set(user_ids)]
+    if messages:
+        transaction.on_commit(partial(_publish, messages))
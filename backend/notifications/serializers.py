@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from django.utils.functional import cached_property
+from eduportal.serializers import SparseFieldsMixin, ValuesSerializer
 from .models import (
     NotificationType, Notification, NotificationTemplate, NotificationPreference,
     NotificationSubscription, NotificationLog, NotificationBatch
@@ -8,7 +11,7 @@ from .models import (
 User = get_user_model()
 
 
-class NotificationTypeSerializer(serializers.ModelSerializer):
+class NotificationTypeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification types."""
     
     class Meta:
@@ -16,7 +19,7 @@ class NotificationTypeSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'icon', 'color', 'is_active', 'created_at']
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notifications."""
     
     type_name = serializers.SerializerMethodField()
@@ -30,6 +33,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             'expires_at', 'is_expired', 'created_at', 'read_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'read_at']
+        expandable_fields = {'type': NotificationTypeSerializer}
     
     def get_type_name(self, obj):
         return obj.type.name
@@ -42,7 +46,38 @@ class NotificationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class NotificationTemplateSerializer(serializers.ModelSerializer):
+class NotificationValuesSerializer(ValuesSerializer):
+    """Read-only list serializer with NotificationSerializer's output, built from `.values()` rows."""
+    
+    values_fields = {
+        'id': ('id',),
+        'user': ('user_id',),
+        'type': ('type_id',),
+        'type_name': ('type__name',),
+        'title': ('title',),
+        'message': ('message',),
+        'priority': ('priority',),
+        'is_read': ('is_read',),
+        'is_archived': ('is_archived',),
+        'action_url': ('action_url',),
+        'action_text': ('action_text',),
+        'metadata': ('metadata',),
+        'expires_at': ('expires_at',),
+        'is_expired': ('expires_at',),
+        'created_at': ('created_at',),
+        'read_at': ('read_at',),
+    }
+    datetime_fields = ('expires_at', 'created_at', 'read_at')
+    
+    @cached_property
+    def now(self):
+        return timezone.now()
+    
+    def get_is_expired(self, row):
+        return self.now > row['expires_at'] if row['expires_at'] else False
+
+
+class NotificationTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification templates."""
     
     type_name = serializers.SerializerMethodField()
@@ -60,7 +95,7 @@ class NotificationTemplateSerializer(serializers.ModelSerializer):
         return obj.type.name
 
 
-class NotificationPreferenceSerializer(serializers.ModelSerializer):
+class NotificationPreferenceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification preferences."""
     
     type_name = serializers.SerializerMethodField()
@@ -81,7 +116,7 @@ class NotificationPreferenceSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class NotificationSubscriptionSerializer(serializers.ModelSerializer):
+class NotificationSubscriptionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification subscriptions."""
     
     class Meta:
@@ -97,7 +132,7 @@ class NotificationSubscriptionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class NotificationLogSerializer(serializers.ModelSerializer):
+class NotificationLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification logs."""
     
     notification_title = serializers.SerializerMethodField()
@@ -119,7 +154,7 @@ class NotificationLogSerializer(serializers.ModelSerializer):
         return obj.subscription.channel
 
 
-class NotificationBatchSerializer(serializers.ModelSerializer):
+class NotificationBatchSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for notification batches."""
     
     template_name = serializers.SerializerMethodField()
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from .live import publish_notifications, publish_unread_count
+from .models import Notification
+
+
+def push_notification_change(sender, instance, created=False, raw=False, **kwargs):
+    """Feed new notifications and unread-count changes to the live stream."""
+    if raw:
+        return
+    if created:
+        publish_notifications([instance])
+    else:
+        publish_unread_count([instance.user_id])
+
+
+post_save.connect(push_notification_change, sender=Notification, dispatch_uid='notifications-live-save')
+post_delete.connect(push_notification_change, sender=Notification, dispatch_uid='notifications-live-delete')
@@ -0,0 +1,136 @@
+"""
+Server-Sent Events stream of a user's notifications, served by eduportal.asgi.
+
+Events:
+- `notification`: a new notification, serialized like the list endpoint;
+  its `id:` is the notification id, so a reconnecting EventSource sends it
+  back as Last-Event-ID and gets whatever it missed
+- `unread_count`: `{"unread_count": n}`, sent on connect and whenever it
+  may have changed
+
+An open stream holds no database connection: the few queries it makes
+(on connect, and to load new notifications) run through
+eduportal.async_views.gather_queries, and the unread count after connect
+comes with the published messages.
+
+Browsers' EventSource cannot set headers, so the access token may also be
+passed as `?token=`.
+"""
+
+import asyncio
+import json
+from functools import partial
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from accounts.authentication import ClaimsJWTAuthentication
+from eduportal.async_views import gather_queries
+from . import live
+from .models import Notification
+from .serializers import NotificationSerializer
+
+RETRY_MILLISECONDS = 3000
+REPLAY_LIMIT = 50
+
+
+def _authenticate(request):
+    authentication = ClaimsJWTAuthentication()
+    token = request.GET.get('token')
+    if token:
+        validated_token = authentication.get_validated_token(token)
+        return authentication.get_user(validated_token)
+    result = authentication.authenticate(request)
+    return result[0] if result else None
+
+
+def _missed_notifications(user, last_event_id):
+    notifications = (
+        Notification.objects.filter(user=user, pk__gt=last_event_id)
+        .select_related('type')
+        .order_by('pk')[:REPLAY_LIMIT]
+    )
+    return [(notification.pk, NotificationSerializer(notification).data) for notification in notifications]
+
+
+def _event(event, data, event_id=None):
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, separators=(',', ':'), cls=JSONEncoder))
+    return '\n'.join(lines) + '\n\n'
+
+
+def _newest_notification_id(user):
+    return Notification.objects.filter(user=user).order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+async def _events(user, last_event_id):
+    async with live.subscription(user.pk) as subscription:
+        yield f'retry: {RETRY_MILLISECONDS}\n\n'
+
+        # Subscribed first, so nothing created from here on is missed
+        unread = Notification.objects.filter(user=user, is_read=False)
+        if last_event_id is None:
+            last_event_id, unread_count = await gather_queries(partial(_newest_notification_id, user), unread.count)
+        else:
+            missed, unread_count = await gather_queries(
+                partial(_missed_notifications, user, last_event_id), unread.count
+            )
+            for pk, data in missed:
+                last_event_id = pk
+                yield _event('notification', data, pk)
+        yield _event('unread_count', {'unread_count': unread_count})
+
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), settings.NOTIFICATION_STREAM_KEEPALIVE)
+            except TimeoutError:
+                yield ': keepalive\n\n'
+                continue
+
+            # Drain whatever else is queued so a burst costs one query at most
+            messages = [message]
+            while not subscription.queue.empty():
+                messages.append(subscription.queue.get_nowait())
+            if any(message['event'] == 'notification' and message['id'] > last_event_id for message in messages):
+                [missed] = await gather_queries(partial(_missed_notifications, user, last_event_id))
+                for pk, data in missed:
+                    last_event_id = pk
+                    yield _event('notification', data, pk)
+            # The newest count published; earlier ones in the burst are already out of date
+            unread_count = messages[-1].get('unread_count')
+            if unread_count is not None:
+                yield _event('unread_count', {'unread_count': unread_count})
+
+            if subscription.overflowed:
+                return  # The client reconnects with Last-Event-ID and picks up the rest
+
+
+async def notification_stream(request):
+    """Stream the current user's new notifications and unread count."""
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed.'}, status=405)
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be tied up for as long as the client stays connected
+        return JsonResponse({'error': 'The notification stream is only served by eduportal.asgi.'}, status=501)
+
+    try:
+        # Not on the request's own database thread, whose connection would stay open with the stream
+        [user] = await gather_queries(partial(_authenticate, request))
+    except (AuthenticationFailed, InvalidToken, TokenError):
+        user = None
+    if user is None:
+        return JsonResponse({'error': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    response = StreamingHttpResponse(_events(user, last_event_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Keep nginx from buffering the stream
+    return response
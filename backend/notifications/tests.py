@@ -0,0 +1,40 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from .models import Notification, NotificationType
+from .serializers import NotificationSerializer, NotificationValuesSerializer
+
+
+class NotificationValuesSerializerTests(TestCase):
+    """NotificationValuesSerializer must render exactly what NotificationSerializer does."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='student@test.local', username='student', password='pw', role='student')
+        notification_type = NotificationType.objects.create(name='achievement', description='-')
+        now = timezone.now()
+        common = {'user': cls.user, 'type': notification_type, 'message': 'Something happened'}
+        Notification.objects.create(title='Expired', expires_at=now - timedelta(days=1), metadata={'id': 1}, **common)
+        Notification.objects.create(title='Expires later', expires_at=now + timedelta(days=1), **common)
+        Notification.objects.create(
+            title='Never expires', is_read=True, read_at=now, action_url='https://example.com/a', **common
+        )
+    
+    def assertSameOutput(self, **params):
+        request = Request(APIRequestFactory().get('/api/notifications/', params))
+        request.user = self.user
+        context = {'request': request}
+        queryset = Notification.objects.select_related('type').order_by('id')
+        expected = [dict(item) for item in NotificationSerializer(queryset, many=True, context=context).data]
+        values = NotificationValuesSerializer.values_queryset(queryset, context)
+        self.assertEqual(list(NotificationValuesSerializer(values, many=True, context=context).data), expected)
+    
+    def test_same_output(self):
+        self.assertSameOutput()
+    
+    def test_same_output_for_sparse_fields(self):
+        self.assertSameOutput(fields='id,type_name,is_expired,expires_at')
+        self.assertSameOutput(omit='message,metadata')
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import stream, views
 
 urlpatterns = [
     # Types
@@ -12,6 +12,7 @@ urlpatterns = [
     path('mark-all-read/', views.mark_all_notifications_read, name='mark-all-notifications-read'),
     path('archive/', views.archive_notifications, name='archive-notifications'),
     path('delete/', views.delete_notifications, name='delete-notifications'),
+    path('stream/', stream.notification_stream, name='notification-stream'),
     
     # Templates
     path('templates/', views.NotificationTemplateListView.as_view(), name='notification-template-list'),
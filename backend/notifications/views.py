@@ -4,6 +4,13 @@ from rest_framework.response import Response
 from django.db.models import Count, Q, Avg
 from django.utils import timezone
 from datetime import timedelta
+from functools import partial
+from accounts.models import User
+from dashboard.cache import invalidate_dashboards
+from eduportal.async_views import async_api_view, gather_queries
+from eduportal.replicas import replica_reads
+from eduportal.throttling import request_cost
+from eduportal.views import ConditionalGetMixin, ValuesListMixin, choice_counts
 from .models import (
     NotificationType, Notification, NotificationTemplate, NotificationPreference,
     NotificationSubscription, NotificationLog, NotificationBatch
@@ -11,11 +18,12 @@ from .models import (
 from .serializers import (
     NotificationTypeSerializer, NotificationSerializer, NotificationTemplateSerializer,
     NotificationPreferenceSerializer, NotificationSubscriptionSerializer, NotificationLogSerializer,
-    NotificationBatchSerializer, NotificationStatsSerializer, NotificationAnalyticsSerializer
+    NotificationBatchSerializer, NotificationStatsSerializer, NotificationAnalyticsSerializer,
+    NotificationValuesSerializer
 )
 
 
-class NotificationTypeListView(generics.ListAPIView):
+class NotificationTypeListView(ConditionalGetMixin, generics.ListAPIView):
     """List all notification types."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -23,11 +31,16 @@ class NotificationTypeListView(generics.ListAPIView):
     queryset = NotificationType.objects.filter(is_active=True)
 
 
-class NotificationListView(generics.ListCreateAPIView):
+class NotificationListView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List and create notifications."""
     
     permission_classes = [permissions.IsAuthenticated]
+    values_serializer_class = NotificationValuesSerializer
     serializer_class = NotificationSerializer
+    etag_aggregates = {
+        'read': Count('pk', filter=Q(is_read=True)),
+        'archived': Count('pk', filter=Q(is_archived=True)),
+    }
     
     def get_queryset(self):
         user = self.request.user
@@ -53,11 +66,15 @@ class NotificationListView(generics.ListCreateAPIView):
         return queryset.order_by('-created_at')
 
 
-class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
+class NotificationDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific notification."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationSerializer
+    etag_aggregates = {
+        'read': Count('pk', filter=Q(is_read=True)),
+        'archived': Count('pk', filter=Q(is_archived=True)),
+    }
     
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user).select_related('type')
@@ -71,7 +88,7 @@ class NotificationDetailView(generics.RetrieveUpdateDestroyAPIView):
         return Response(serializer.data)
 
 
-class NotificationTemplateListView(generics.ListCreateAPIView):
+class NotificationTemplateListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create notification templates."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -91,7 +108,7 @@ class NotificationTemplateListView(generics.ListCreateAPIView):
         return queryset.select_related('type').order_by('name')
 
 
-class NotificationPreferenceListView(generics.ListCreateAPIView):
+class NotificationPreferenceListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create notification preferences."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -101,7 +118,7 @@ class NotificationPreferenceListView(generics.ListCreateAPIView):
         return NotificationPreference.objects.filter(user=self.request.user).select_related('type')
 
 
-class NotificationSubscriptionListView(generics.ListCreateAPIView):
+class NotificationSubscriptionListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create notification subscriptions."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -111,11 +128,12 @@ class NotificationSubscriptionListView(generics.ListCreateAPIView):
         return NotificationSubscription.objects.filter(user=self.request.user)
 
 
-class NotificationLogListView(generics.ListAPIView):
+class NotificationLogListView(ConditionalGetMixin, generics.ListAPIView):
     """List notification logs."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationLogSerializer
+    etag_aggregates = choice_counts(NotificationLog._meta.get_field('status'))
     
     def get_queryset(self):
         user = self.request.user
@@ -133,11 +151,12 @@ class NotificationLogListView(generics.ListAPIView):
         return queryset.select_related('notification', 'subscription').order_by('-created_at')
 
 
-class NotificationBatchListView(generics.ListCreateAPIView):
+class NotificationBatchListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create notification batches."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = NotificationBatchSerializer
+    etag_aggregates = choice_counts(NotificationBatch._meta.get_field('status'))
     
     def get_queryset(self):
         user = self.request.user
@@ -215,6 +234,7 @@ def archive_notifications(request):
     )
     
     updated_count = notifications.update(is_archived=True)
+    invalidate_dashboards([request.user.id])
     
     return Response({
         'message': f'{updated_count} notifications archived.',
@@ -245,29 +265,37 @@ def delete_notifications(request):
     }, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
+async def notification_stats_data(user):
+    """Notification statistics for the user (shared with the combined dashboard)."""
+    
+    totals, types_count, templates_count = await gather_queries(
+        partial(
+            Notification.objects.filter(user=user).aggregate,
+            total_notifications=Count('pk'),
+            unread_notifications=Count('pk', filter=Q(is_read=False)),
+            read_notifications=Count('pk', filter=Q(is_read=True)),
+            archived_notifications=Count('pk', filter=Q(is_archived=True)),
+            high_priority_notifications=Count('pk', filter=Q(priority__in=['high', 'urgent'])),
+            expired_notifications=Count('pk', filter=Q(expires_at__lt=timezone.now())),
+        ),
+        NotificationType.objects.filter(is_active=True).count,
+        NotificationTemplate.objects.filter(is_active=True).count,
+    )
+    stats = {**totals, 'types_count': types_count, 'templates_count': templates_count}
+    
+    return NotificationStatsSerializer(stats).data
+
+
+@replica_reads
+@async_api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def notification_stats(request):
+async def notification_stats(request):
     """Get notification statistics."""
-    user = request.user
-    
-    notifications = Notification.objects.filter(user=user)
-    
-    stats = {
-        'total_notifications': notifications.count(),
-        'unread_notifications': notifications.filter(is_read=False).count(),
-        'read_notifications': notifications.filter(is_read=True).count(),
-        'archived_notifications': notifications.filter(is_archived=True).count(),
-        'high_priority_notifications': notifications.filter(priority__in=['high', 'urgent']).count(),
-        'expired_notifications': notifications.filter(expires_at__lt=timezone.now()).count(),
-        'types_count': NotificationType.objects.filter(is_active=True).count(),
-        'templates_count': NotificationTemplate.objects.filter(is_active=True).count(),
-    }
-    
-    serializer = NotificationStatsSerializer(stats)
-    return Response(serializer.data)
+    return Response(await notification_stats_data(request.user))
 
 
+@replica_reads
+@request_cost(10)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def notification_analytics(request):
@@ -352,9 +380,9 @@ def notification_analytics(request):
     return Response(serializer.data)
 
 
-@api_view(['POST'])
+@async_api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-def send_notification(request):
+async def send_notification(request):
     """Send a notification to a user (Admin/Faculty only)."""
     user = request.user
     
@@ -372,13 +400,14 @@ def send_notification(request):
     if not all([target_user_id, notification_type_id, title, message]):
         return Response({'error': 'Missing required fields.'}, status=status.HTTP_400_BAD_REQUEST)
     
-    try:
-        target_user = User.objects.get(id=target_user_id)
-        notification_type = NotificationType.objects.get(id=notification_type_id)
-    except (User.DoesNotExist, NotificationType.DoesNotExist):
+    target_user, notification_type = await gather_queries(
+        User.objects.filter(id=target_user_id).first,
+        NotificationType.objects.filter(id=notification_type_id).first,
+    )
+    if target_user is None or notification_type is None:
         return Response({'error': 'Invalid user or notification type.'}, status=status.HTTP_400_BAD_REQUEST)
     
-    notification = Notification.objects.create(
+    notification = await Notification.objects.acreate(
         user=target_user,
         type=notification_type,
         title=title,
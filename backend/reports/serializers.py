@@ -1,11 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from eduportal.serializers import SparseFieldsMixin
 from .models import ReportTemplate, Report, ReportSchedule, ReportAccess, ReportAnalytics
 
 User = get_user_model()
 
 
-class ReportTemplateSerializer(serializers.ModelSerializer):
+class ReportTemplateSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for report templates."""
     
     created_by_name = serializers.SerializerMethodField()
@@ -35,7 +36,7 @@ class ReportTemplateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for reports."""
     
     generated_by_name = serializers.SerializerMethodField()
@@ -92,7 +93,7 @@ class ReportCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReportScheduleSerializer(serializers.ModelSerializer):
+class ReportScheduleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for report schedules."""
     
     created_by_name = serializers.SerializerMethodField()
@@ -118,7 +119,7 @@ class ReportScheduleSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReportAccessSerializer(serializers.ModelSerializer):
+class ReportAccessSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for report access."""
     
     user_name = serializers.SerializerMethodField()
@@ -151,7 +152,7 @@ class ReportAccessSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ReportAnalyticsSerializer(serializers.ModelSerializer):
+class ReportAnalyticsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for report analytics."""
     
     user_name = serializers.SerializerMethodField()
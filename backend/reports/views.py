@@ -1,9 +1,20 @@
+import mimetypes
+import os
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Count, Q, Sum
+from django.core.files.storage import default_storage
+from django.db.models import Count, F, Q, Sum
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
 from django.utils import timezone
 from datetime import timedelta
+from functools import partial
+from eduportal.async_views import async_api_view, gather_queries
+from eduportal.replicas import replica_reads
+from eduportal.throttling import request_cost
+from eduportal.views import ConditionalGetMixin, choice_counts
 from .models import ReportTemplate, Report, ReportSchedule, ReportAccess, ReportAnalytics
 from .serializers import (
     ReportTemplateSerializer, ReportSerializer, ReportCreateSerializer,
@@ -12,7 +23,7 @@ from .serializers import (
 )
 
 
-class ReportTemplateListView(generics.ListCreateAPIView):
+class ReportTemplateListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create report templates."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -32,7 +43,7 @@ class ReportTemplateListView(generics.ListCreateAPIView):
         return queryset.select_related('created_by').order_by('name')
 
 
-class ReportTemplateDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReportTemplateDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific report template."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -40,10 +51,11 @@ class ReportTemplateDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = ReportTemplate.objects.all()
 
 
-class ReportListView(generics.ListCreateAPIView):
+class ReportListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create reports."""
     
     permission_classes = [permissions.IsAuthenticated]
+    etag_aggregates = choice_counts(Report._meta.get_field('status'))
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -78,11 +90,12 @@ class ReportListView(generics.ListCreateAPIView):
         return queryset.order_by('-created_at')
 
 
-class ReportDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReportDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific report."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = ReportSerializer
+    etag_aggregates = choice_counts(Report._meta.get_field('status'))
     
     def get_queryset(self):
         user = self.request.user
@@ -98,7 +111,7 @@ class ReportDetailView(generics.RetrieveUpdateDestroyAPIView):
         return queryset
 
 
-class ReportScheduleListView(generics.ListCreateAPIView):
+class ReportScheduleListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create report schedules."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -118,7 +131,7 @@ class ReportScheduleListView(generics.ListCreateAPIView):
         return queryset.order_by('name')
 
 
-class ReportScheduleDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReportScheduleDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific report schedule."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -138,7 +151,7 @@ class ReportScheduleDetailView(generics.RetrieveUpdateDestroyAPIView):
         return queryset
 
 
-class ReportAccessListView(generics.ListCreateAPIView):
+class ReportAccessListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create report access permissions."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -158,7 +171,7 @@ class ReportAccessListView(generics.ListCreateAPIView):
         return queryset.order_by('-granted_at')
 
 
-class ReportAnalyticsListView(generics.ListAPIView):
+class ReportAnalyticsListView(ConditionalGetMixin, generics.ListAPIView):
     """List report analytics."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -178,6 +191,7 @@ class ReportAnalyticsListView(generics.ListAPIView):
         return queryset.order_by('-timestamp')
 
 
+@request_cost(20)
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def generate_report(request, template_id):
@@ -215,18 +229,25 @@ def generate_report(request, template_id):
     return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-@api_view(['GET'])
+async def _file_chunks(report_file, chunk_size=64 * 1024):
+    try:
+        while chunk := await sync_to_async(report_file.read)(chunk_size):
+            yield chunk
+    finally:
+        await sync_to_async(report_file.close)()
+
+
+@async_api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def download_report(request, report_id):
+async def download_report(request, report_id):
     """Download a report file."""
-    try:
-        report = Report.objects.get(id=report_id)
-    except Report.DoesNotExist:
+    report = await Report.objects.filter(id=report_id).afirst()
+    if report is None:
         return Response({'error': 'Report not found.'}, status=status.HTTP_404_NOT_FOUND)
     
     # Check permissions
     user = request.user
-    if user.is_student() and report.generated_by != user and not report.is_public:
+    if user.is_student() and report.generated_by_id != user.id and not report.is_public:
         return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
     
     # Check if report is expired
@@ -234,7 +255,7 @@ def download_report(request, report_id):
         return Response({'error': 'Report has expired.'}, status=status.HTTP_410_GONE)
     
     # Track download
-    ReportAnalytics.objects.create(
+    await ReportAnalytics.objects.acreate(
         report=report,
         user=user,
         action='downloaded',
@@ -243,50 +264,67 @@ def download_report(request, report_id):
     )
     
     # Increment download count
-    report.download_count += 1
-    report.save()
+    await Report.objects.filter(pk=report.pk).aupdate(download_count=F('download_count') + 1)
+    
+    # Stream the generated file without holding a thread for the whole transfer
+    if report.file_path and await sync_to_async(default_storage.exists)(report.file_path):
+        report_file = await sync_to_async(default_storage.open)(report.file_path, 'rb')
+        filename = os.path.basename(report.file_path)
+        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = StreamingHttpResponse(_file_chunks(report_file), content_type=content_type)
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        if report.file_size:
+            response['Content-Length'] = report.file_size
+        return response
     
-    # Here you would typically return the file
-    # For now, we'll return a success message
     return Response({'message': 'Report download initiated.'}, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
+@replica_reads
+@async_api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def report_stats(request):
+async def report_stats(request):
     """Get report statistics."""
     user = request.user
     
     if user.is_student():
         # Student stats
         reports = Report.objects.filter(generated_by=user)
-        stats = {
-            'total_reports': reports.count(),
-            'pending_reports': reports.filter(status='pending').count(),
-            'completed_reports': reports.filter(status='completed').count(),
-            'failed_reports': reports.filter(status='failed').count(),
-            'total_downloads': reports.aggregate(total=Sum('download_count'))['total'] or 0,
-            'templates_count': ReportTemplate.objects.filter(is_active=True).count(),
-            'schedules_count': ReportSchedule.objects.filter(created_by=user).count(),
-            'active_schedules': ReportSchedule.objects.filter(created_by=user, is_active=True).count(),
-        }
+        schedules = ReportSchedule.objects.filter(created_by=user)
     else:
         # Admin/Faculty stats
-        stats = {
-            'total_reports': Report.objects.count(),
-            'pending_reports': Report.objects.filter(status='pending').count(),
-            'completed_reports': Report.objects.filter(status='completed').count(),
-            'failed_reports': Report.objects.filter(status='failed').count(),
-            'total_downloads': Report.objects.aggregate(total=Sum('download_count'))['total'] or 0,
-            'templates_count': ReportTemplate.objects.filter(is_active=True).count(),
-            'schedules_count': ReportSchedule.objects.count(),
-            'active_schedules': ReportSchedule.objects.filter(is_active=True).count(),
-        }
+        reports = Report.objects.all()
+        schedules = ReportSchedule.objects.all()
+    
+    report_totals, templates_count, schedule_totals = await gather_queries(
+        partial(
+            reports.aggregate,
+            total_reports=Count('pk'),
+            pending_reports=Count('pk', filter=Q(status='pending')),
+            completed_reports=Count('pk', filter=Q(status='completed')),
+            failed_reports=Count('pk', filter=Q(status='failed')),
+            total_downloads=Sum('download_count'),
+        ),
+        ReportTemplate.objects.filter(is_active=True).count,
+        partial(
+            schedules.aggregate,
+            schedules_count=Count('pk'),
+            active_schedules=Count('pk', filter=Q(is_active=True)),
+        ),
+    )
+    stats = {
+        **report_totals,
+        **schedule_totals,
+        'total_downloads': report_totals['total_downloads'] or 0,
+        'templates_count': templates_count,
+    }
     
     serializer = ReportStatsSerializer(stats)
     return Response(serializer.data)
 
 
+@replica_reads
+@request_cost(10)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def report_analytics_summary(request):
@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""
+Load test of the async stats/dashboard endpoints under sync gunicorn vs uvicorn.
+Fills a throwaway test database, serves it with gunicorn sync workers and
+then with gunicorn + uvicorn workers (same worker count), and reports the
+throughput and latency of each endpoint with many concurrent clients.
+
+`--db-latency` adds a delay to every query in the servers, standing in for
+the network round trip to a database on another host; with a local SQLite
+file there is almost no I/O for async views to overlap.
+
+Usage: python scripts/benchmark_async_views.py [--rows 2000] [--workers 2]
+       [--concurrency 32] [--duration 5] [--db-latency 2]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import socket
+import subprocess
+import tempfile
+import threading
+import http.client
+import django
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+
+MODES = {
+    'gunicorn (sync workers)': ('wsgi', 'sync'),
+    'gunicorn + uvicorn workers': ('asgi', 'uvicorn.workers.UvicornWorker'),
+}
+ENDPOINTS = [
+    '/api/auth/dashboard/',
+    '/api/achievements/stats/',
+    '/api/certificates/stats/',
+    '/api/volunteering/stats/',
+    '/api/notifications/stats/',
+    '/api/reports/stats/',
+    '/api/notifications/?page_size=20',  # still a sync view, for comparison
+]
+
+
+def populate(rows):
+    from accounts.models import Department, User, UserProfile, UserSession
+    from achievements.models import Achievement, AchievementCategory
+    from certificates.models import Certificate, CertificateCategory
+    from notifications.models import Notification, NotificationType
+    from reports.models import Report, ReportTemplate
+    from volunteering.models import VolunteeringActivity, VolunteeringCategory, VolunteeringOpportunity
+
+    print(f"Creating {rows} rows of each type...")
+    department = Department.objects.create(name='Engineering', code='ENG')
+    users = User.objects.bulk_create([
+        User(email=f's{i}@bench.local', username=f'bench-s{i}', role='student', department=department,
+             first_name='Student', last_name=str(i))
+        for i in range(100)
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+    admin = User.objects.create(email='admin@bench.local', username='bench-admin', role='admin', first_name='Admin')
+    UserSession.objects.bulk_create([
+        UserSession(user=random.choice(users), session_key=f'bench-{i}', ip_address='127.0.0.1', user_agent='bench')
+        for i in range(rows // 10)
+    ])
+
+    statuses = ['approved', 'pending', 'rejected']
+    achievement_category = AchievementCategory.objects.create(name='Academic')
+    Achievement.objects.bulk_create([
+        Achievement(user=random.choice(users), category=achievement_category, title=f'Achievement {i}',
+                    description='-', status=random.choice(statuses), points=random.randint(0, 100))
+        for i in range(rows)
+    ])
+    certificate_category = CertificateCategory.objects.create(name='Course')
+    Certificate.objects.bulk_create([
+        Certificate(user=random.choice(users), category=certificate_category, title=f'Certificate {i}',
+                    description='-', issuer='Coursera', issue_date=date(2024, 1, 1), status=random.choice(statuses),
+                    points=random.randint(0, 100), certificate_file=f'certs/{i}.pdf',
+                    expiry_date=date.today() + timedelta(days=random.randint(-100, 400)))
+        for i in range(rows)
+    ])
+    volunteering_category = VolunteeringCategory.objects.create(name='Community')
+    VolunteeringActivity.objects.bulk_create([
+        VolunteeringActivity(user=random.choice(users), category=volunteering_category, title=f'Activity {i}',
+                             description='-', organization='NGO', activity_date=date(2024, 3, 1),
+                             hours_volunteered=random.choice([1, 2.5, 4]), status=random.choice(statuses),
+                             points=random.randint(0, 50))
+        for i in range(rows)
+    ])
+    VolunteeringOpportunity.objects.create(
+        title='Food bank', description='-', organization='NGO', location='Town', category=volunteering_category,
+        start_date=date.today(), end_date=date.today(), required_hours=4, contact_email='ngo@bench.local',
+        created_by=admin,
+    )
+    notification_type = NotificationType.objects.create(name='achievement', description='-')
+    Notification.objects.bulk_create([
+        Notification(user=admin, type=notification_type, title=f'Notice {i}', message='Something happened',
+                     is_read=i % 3 == 0, priority=random.choice(['low', 'medium', 'high']))
+        for i in range(rows)
+    ])
+    template = ReportTemplate.objects.create(name='Users', description='-', report_type='user_report', created_by=admin)
+    Report.objects.bulk_create([
+        Report(name=f'Report {i}', template=template, generated_by=admin, status=random.choice(['pending', 'completed']),
+               download_count=random.randint(0, 5), completed_at=timezone.now())
+        for i in range(rows // 10)
+    ])
+    return admin
+
+
+def serve(args):
+    """Child process: serve the benchmark database with gunicorn in the given mode."""
+    from gunicorn.app.base import BaseApplication
+
+    settings.DATABASES['default']['NAME'] = args.database
+    if args.db_latency:
+        from django.db.backends.signals import connection_created
+
+        def slow_query(execute, sql, params, many, context):
+            time.sleep(args.db_latency / 1000)
+            return execute(sql, params, many, context)
+
+        def add_latency(connection, **kwargs):
+            # The wrapper list outlives reconnects of the same connection object
+            if slow_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(slow_query)
+
+        connection_created.connect(add_latency, weak=False)
+
+    interface, worker_class = MODES[args.serve]
+    if interface == 'asgi':
+        from eduportal.asgi import application
+    else:
+        from eduportal.wsgi import application
+
+    class Server(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'127.0.0.1:{args.port}')
+            self.cfg.set('workers', args.workers)
+            self.cfg.set('worker_class', worker_class)
+            self.cfg.set('loglevel', 'warning')
+
+        def load(self):
+            return application
+
+    Server().run()
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server did not start on port {port}')
+
+
+def load(port, path, token, concurrency, duration):
+    """Hit one endpoint from `concurrency` keep-alive clients; return (requests/s, p50 ms, p99 ms, errors)."""
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        own = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request('GET', path, headers={'Authorization': f'Bearer {token}'})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise http.client.HTTPException(response.status)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            own.append(time.perf_counter() - start)
+        conn.close()
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    if not latencies:
+        return 0, 0, 0, errors[0]
+    percentile = lambda p: latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+    return len(latencies) / duration, percentile(0.5), percentile(0.99), errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5, help='seconds per endpoint')
+    parser.add_argument('--db-latency', type=float, default=2, help='milliseconds added to every query')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--serve', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args)
+
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    setup_test_environment()
+    if connection.vendor == 'sqlite':
+        # The servers run in other processes, so the test database has to be a file
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        token = str(AccessToken.for_user(populate(args.rows)))
+        database = connection.settings_dict['NAME']
+        connection.close()
+
+        results = {}
+        for mode in MODES:
+            server = subprocess.Popen([
+                sys.executable, os.path.abspath(__file__), '--serve', mode, '--database', str(database),
+                '--port', str(args.port), '--workers', str(args.workers), '--db-latency', str(args.db_latency),
+            ])
+            try:
+                wait_for_port(args.port)
+                for path in ENDPOINTS:
+                    load(args.port, path, token, args.concurrency, 1)  # warm up
+                    results[mode, path] = load(args.port, path, token, args.concurrency, args.duration)
+            finally:
+                server.terminate()
+                server.wait()
+
+        print(f"Results on {connection.vendor} ({args.workers} workers, {args.concurrency} clients, "
+              f"{args.db_latency:g} ms per query):")
+        for path in ENDPOINTS:
+            print(path)
+            for mode in MODES:
+                rate, p50, p99, errors = results[mode, path]
+                print(f"  {mode:<28} {rate:8.1f} req/s   p50 {p50:7.1f} ms   p99 {p99:7.1f} ms"
+                      + (f"   {errors} errors" if errors else ''))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark for bulk certificate rendering.
+Renders certificates from a generated template into a temporary media
+directory with 1..N worker processes and reports throughput per core.
+
+Usage: python scripts/benchmark_certificate_rendering.py [--certificates 2000] [--format png]
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import django
+from datetime import date
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from PIL import Image, ImageDraw
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment
+from accounts.models import User, UserProfile
+from certificates.models import CertificateCategory, CertificateTemplate
+from certificates.render_worker import DEFAULT_LAYOUT
+from certificates.rendering import generate_certificates
+
+
+def template_image():
+    """A4 landscape at 150 dpi with a border, roughly what a real template looks like."""
+    image = Image.new('RGB', (1754, 1240), '#FFFDF5')
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, 1714, 1200), outline='#B45309', width=12)
+    draw.rectangle((70, 70, 1684, 1170), outline='#D97706', width=3)
+    output = io.BytesIO()
+    image.save(output, 'PNG')
+    return output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--certificates', type=int, default=2000)
+    parser.add_argument('--format', choices=['png', 'pdf'], default='png')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    media_root = tempfile.mkdtemp(prefix='certificate-bench-')
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(MEDIA_ROOT=media_root):
+            users = User.objects.bulk_create([
+                User(email=f'grad{i}@bench.local', username=f'grad{i}', first_name='Graduate', last_name=f'No. {i}', role='student')
+                for i in range(args.certificates)
+            ])
+            UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+            recipients = [{'user_id': user.id} for user in users]
+            category = CertificateCategory.objects.create(name='Convocation')
+            template = CertificateTemplate(name='Bench', description='-', layout={**DEFAULT_LAYOUT, 'format': args.format})
+            template.template_file.save('bench.png', ContentFile(template_image()))
+
+            print(f"Rendering {args.certificates} {args.format.upper()} certificates:")
+            workers = 1
+            while workers <= args.max_workers:
+                start = time.perf_counter()
+                generate_certificates(
+                    template, recipients, title='Bachelor of Engineering', category=category,
+                    issuer='Bench University', issue_date=date.today(), workers=workers,
+                )
+                elapsed = time.perf_counter() - start
+                rate = args.certificates / elapsed
+                print(f"  {workers:>2} worker(s) {elapsed:8.1f} s  {rate:8.1f} certs/s  {rate / workers:8.1f} certs/s/core")
+                workers *= 2
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        shutil.rmtree(media_root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Benchmark for the combined dashboard endpoint.
+Fills a throwaway test database, checks that GET /api/dashboard/ returns
+exactly what the five endpoints it replaces return, and compares calling
+those endpoints one after another with one uncached and one cached
+combined request.
+
+`--db-latency` adds a delay to every query, standing in for the network
+round trip to a database on another host.
+
+Usage: python scripts/benchmark_dashboard.py [--rows 2000] [--db-latency 2]
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import setup_test_environment
+from rest_framework_simplejwt.tokens import AccessToken
+from dashboard.views import DASHBOARD_SECTIONS
+from benchmark_async_views import populate
+
+SECTION_URLS = {
+    'achievements': '/api/achievements/stats/',
+    'certificates': '/api/certificates/stats/',
+    'volunteering': '/api/volunteering/stats/',
+    'notifications': '/api/notifications/stats/',
+}
+
+
+def timed(label, func, repeat=5):
+    """Run func several times and print the best wall-clock time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--db-latency', type=float, default=2, help='milliseconds added to every query')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    if connection.vendor == 'sqlite':
+        # The query pool's threads open their own connections, so the test database has to be a file
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        users = {'admin': populate(args.rows)}
+        from accounts.models import User
+        users['student'] = User.objects.filter(role='student').first()
+
+        if args.db_latency:
+            def slow_query(execute, sql, params, many, context):
+                time.sleep(args.db_latency / 1000)
+                return execute(sql, params, many, context)
+
+            def add_latency(connection, **kwargs):
+                if slow_query not in connection.execute_wrappers:
+                    connection.execute_wrappers.append(slow_query)
+
+            connection_created.connect(add_latency, weak=False)
+            connection.close()
+
+        assert set(SECTION_URLS) == set(DASHBOARD_SECTIONS), 'SECTION_URLS is out of date'
+        for role, user in users.items():
+            client = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+            def get(path):
+                response = client.get(path)
+                assert response.status_code == 200, (path, response.status_code)
+                return json.loads(response.content)
+
+            def separate():
+                data = get('/api/auth/dashboard/')
+                for key, path in SECTION_URLS.items():
+                    data[key] = get(path)
+                return data
+
+            def combined():
+                cache.clear()
+                return get('/api/dashboard/')
+
+            assert combined() == separate(), f'combined dashboard differs for {role}'
+            print(f"Dashboard for {role} on {connection.vendor} ({args.db_latency:g} ms per query), output identical:")
+            timed('5 endpoints, one after another', separate)
+            timed('/api/dashboard/ (uncached)', combined)
+            timed('/api/dashboard/ (cached)', lambda: get('/api/dashboard/'))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Benchmark of per-request database connection overhead.
+Sends requests through Django's WSGI handler (so connections are opened
+and closed exactly as under gunicorn) with a new connection per request,
+with persistent connections, with persistent connections plus health
+checks and, on PostgreSQL with psycopg 3, with the psycopg pool. Reports
+the time per request and how many connections were opened.
+
+Run it against a PostgreSQL server (USE_SQLITE=False) for real numbers.
+On SQLite opening a connection costs next to nothing; `--connect-latency`
+adds a delay to every new connection, standing in for the TCP, TLS and
+authentication handshake with a database on another host.
+
+Usage: python scripts/benchmark_db_connections.py [--requests 500] [--connect-latency 0]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import User, UserProfile
+
+PATH = '/api/auth/profile/'
+
+# Mode -> (CONN_MAX_AGE, CONN_HEALTH_CHECKS, pool)
+MODES = {
+    'new connection per request': (0, False, False),
+    'persistent (CONN_MAX_AGE=60)': (60, False, False),
+    'persistent + health checks': (60, True, False),
+    'psycopg pool': (0, False, True),
+}
+
+
+def pool_available():
+    if connection.vendor != 'postgresql':
+        return False
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run(handler, token, requests):
+    """Send `requests` GETs through the WSGI handler; return seconds per request."""
+    factory = RequestFactory()
+
+    def start_response(status, headers):
+        assert status.startswith('200'), status
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        environ = factory.get(PATH, HTTP_AUTHORIZATION=f'Bearer {token}').environ
+        response = handler(environ, start_response)
+        b''.join(response)
+        response.close()  # Sends request_finished, which closes or keeps the connection
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--connect-latency', type=float, default=0,
+                        help='milliseconds added to every new connection (leave at 0 against a real server)')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    if connection.vendor == 'sqlite':
+        # Connections to an in-memory database are never really closed
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    settings_dict = connection.settings_dict
+    saved = settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'], dict(settings_dict['OPTIONS'])
+    try:
+        user = User.objects.create(email='bench@bench.local', username='bench', role='student', first_name='Bench')
+        UserProfile.objects.create(user=user)
+        token = str(AccessToken.for_user(user))
+        connection.close()
+
+        opened = [0]
+
+        def count_connection(connection, **kwargs):
+            opened[0] += 1
+            if args.connect_latency and 'pool' not in connection.settings_dict['OPTIONS']:
+                time.sleep(args.connect_latency / 1000)
+
+        connection_created.connect(count_connection, weak=False)
+        handler = WSGIHandler()
+
+        print(f"{args.requests} requests to {PATH} on {connection.vendor}"
+              + (f" ({args.connect_latency:g} ms per new connection)" if args.connect_latency else '') + ':')
+        for mode, (max_age, health_checks, pool) in MODES.items():
+            if pool and not pool_available():
+                print(f"  {mode:<32} skipped (needs PostgreSQL and psycopg[pool])")
+                continue
+            settings_dict['CONN_MAX_AGE'] = max_age
+            settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+            settings_dict['OPTIONS'] = {**saved[2], 'pool': True} if pool else {
+                key: value for key, value in saved[2].items() if key != 'pool'
+            }
+            run(handler, token, 10)  # warm up
+            opened[0] = 0
+            per_request = run(handler, token, args.requests)
+            if pool:
+                # connection_created fires for every checkout; count the server connections instead
+                opened[0] = connection.pool.get_stats().get('connections_num', 0)
+                connection.close()
+                connection.close_pool()
+            else:
+                connection.close()
+            print(f"  {mode:<32} {per_request * 1000:8.2f} ms/request {opened[0]:8d} connections opened")
+    finally:
+        settings_dict['CONN_MAX_AGE'], settings_dict['CONN_HEALTH_CHECKS'], settings_dict['OPTIONS'] = saved
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
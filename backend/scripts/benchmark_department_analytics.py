@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Benchmark for the department-scoped analytics endpoints.
+Builds a throwaway test database with many departments and users, then
+compares a per-department query loop with the grouped aggregates used by
+the department analytics views.
+
+Usage: python scripts/benchmark_department_analytics.py [--departments 50] [--users 100000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from datetime import date
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.test.utils import setup_test_environment
+from rest_framework.test import APIRequestFactory, force_authenticate
+from accounts.models import User, Department
+from achievements.models import AchievementCategory, Achievement
+from certificates.models import CertificateCategory, Certificate
+from volunteering.models import VolunteeringCategory, VolunteeringActivity
+from achievements.views import department_achievement_stats
+from certificates.views import department_certificate_stats
+from volunteering.views import department_volunteering_stats
+
+BATCH_SIZE = 5000
+
+
+def timed(label, func, repeat=3):
+    """Run func several times and print the best wall-clock time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<45} {best * 1000:10.1f} ms")
+    return best
+
+
+def populate(department_count, user_count):
+    """Create departments, users and one record per user in each domain."""
+    print(f"Creating {department_count} departments and {user_count} users...")
+    departments = Department.objects.bulk_create([
+        Department(name=f'Department {i}', code=f'D{i}') for i in range(department_count)
+    ])
+
+    users = [
+        User(
+            email=f'user{i}@bench.local',
+            username=f'user{i}',
+            password='!',
+            role='student',
+            department=departments[i % department_count],
+        )
+        for i in range(user_count)
+    ]
+    users = User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+    achievement_category = AchievementCategory.objects.create(name='Bench')
+    certificate_category = CertificateCategory.objects.create(name='Bench')
+    volunteering_category = VolunteeringCategory.objects.create(name='Bench')
+    statuses = ['pending', 'approved', 'rejected']
+    today = date.today()
+
+    Achievement.objects.bulk_create([
+        Achievement(user=user, title='Bench', description='', category=achievement_category,
+                    status=random.choice(statuses), points=random.randint(1, 50))
+        for user in users
+    ], batch_size=BATCH_SIZE)
+    Certificate.objects.bulk_create([
+        Certificate(user=user, title='Bench', description='', category=certificate_category,
+                    issuer='Bench', issue_date=today, status=random.choice(statuses),
+                    points=random.randint(1, 50))
+        for user in users
+    ], batch_size=BATCH_SIZE)
+    VolunteeringActivity.objects.bulk_create([
+        VolunteeringActivity(user=user, title='Bench', description='', organization='Bench',
+                             category=volunteering_category, activity_date=today,
+                             hours_volunteered=random.randint(1, 8), status=random.choice(statuses),
+                             points=random.randint(1, 50))
+        for user in users
+    ], batch_size=BATCH_SIZE)
+
+
+def per_department_loop():
+    """The naive approach: one aggregate per department and domain."""
+    for department in Department.objects.all():
+        Achievement.objects.filter(user__department=department).aggregate(
+            total=Count('id'), points=Sum('points', filter=Q(status='approved'))
+        )
+        Certificate.objects.filter(user__department=department).aggregate(
+            total=Count('id'), points=Sum('points', filter=Q(status='approved'))
+        )
+        VolunteeringActivity.objects.filter(user__department=department).aggregate(
+            total=Count('id'), hours=Sum('hours_volunteered', filter=Q(status='approved'))
+        )
+
+
+def run_views(admin):
+    """Call the grouped department endpoints the way the API does."""
+    factory = APIRequestFactory()
+    for view in (department_achievement_stats, department_certificate_stats, department_volunteering_stats):
+        request = factory.get('/')
+        force_authenticate(request, user=admin)
+        response = view(request)
+        assert response.status_code == 200, response.data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--departments', type=int, default=50)
+    parser.add_argument('--users', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.departments, args.users)
+        admin = User.objects.create(email='admin@bench.local', username='bench-admin', role='admin')
+
+        print("Results (best of 3):")
+        timed('per-department loop (3 queries x departments)', per_department_loop)
+        timed('grouped aggregates, cold cache', lambda: (cache.clear(), run_views(admin)))
+        timed('grouped aggregates, warm cache', lambda: run_views(admin))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Benchmark for the JSON renderer and parser.
+Renders a page of achievements (as the list endpoint would) and a raw
+analytics-style payload with DRF's JSONRenderer and with FastJSONRenderer,
+checks the bytes are identical, and times parsing them back.
+
+Usage: python scripts/benchmark_json_rendering.py [--items 1000]
+"""
+
+import os
+import sys
+import io
+import time
+import uuid
+import random
+import argparse
+import django
+from decimal import Decimal
+from datetime import timedelta
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from accounts.models import User
+from achievements.models import Achievement, AchievementCategory
+from achievements.serializers import AchievementSerializer
+from eduportal import parsers, renderers
+from eduportal.parsers import FastJSONParser
+from eduportal.renderers import FastJSONRenderer
+
+SKILLS = ['python', 'leadership', 'public speaking', 'research', 'design', 'teamwork', 'writing']
+
+
+def timed(label, func, repeat=20):
+    """Run func several times and print the best wall-clock time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.2f} ms")
+
+
+def achievements_page(count):
+    print(f"Creating {count} achievements...")
+    users = User.objects.bulk_create([
+        User(email=f's{i}@bench.local', username=f'bench-s{i}', role='student', first_name='Student', last_name=str(i))
+        for i in range(50)
+    ])
+    category = AchievementCategory.objects.create(name='Academic')
+    Achievement.objects.bulk_create([
+        Achievement(
+            user=random.choice(users),
+            title=f'Achievement {i} – “quoted” ünïcode',
+            description='Won the inter-college hackathon with a team of four. ' * 4,
+            category=category,
+            status=random.choice(['pending', 'approved', 'rejected']),
+            points=random.randint(0, 100),
+            skills_gained=random.sample(SKILLS, 3),
+            tags=random.sample(SKILLS, 2),
+        )
+        for i in range(count)
+    ])
+    queryset = Achievement.objects.select_related('user', 'category', 'verified_by')
+    return AchievementSerializer(queryset, many=True).data
+
+
+def analytics_payload(count):
+    """Raw Python values, as the analytics views put into Response()."""
+    now = timezone.now()
+    return {
+        'generated_at': now,
+        'monthly': [
+            {
+                'month': (now - timedelta(days=30 * i)).date(),
+                'count': i,
+                'average_points': Decimal('12.50') + i,
+                'batch': uuid.uuid4(),
+                'duration': timedelta(hours=i),
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def compare(label, data):
+    stdlib, fast = JSONRenderer(), FastJSONRenderer()
+    stdlib_bytes, fast_bytes = stdlib.render(data), fast.render(data)
+    print(f"{label}: {len(stdlib_bytes)} bytes, identical output: {stdlib_bytes == fast_bytes}")
+    timed('JSONRenderer (stdlib json)', lambda: stdlib.render(data))
+    timed(f'FastJSONRenderer ({"orjson" if renderers.orjson else "stdlib fallback"})', lambda: fast.render(data))
+    timed('JSONParser (stdlib json)', lambda: JSONParser().parse(io.BytesIO(stdlib_bytes)))
+    timed(f'FastJSONParser ({"orjson" if parsers.orjson else "stdlib fallback"})', lambda: FastJSONParser().parse(io.BytesIO(stdlib_bytes)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        page = achievements_page(args.items)
+        start = time.perf_counter()
+        AchievementSerializer(Achievement.objects.select_related('user', 'category', 'verified_by'), many=True).data
+        print(f"(AchievementSerializer itself: {(time.perf_counter() - start) * 1000:.1f} ms for the page)")
+        compare(f'{args.items} achievements page', page)
+        compare(f'{args.items} analytics rows', analytics_payload(args.items))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""
+Benchmark for the read-only `.values()` list serializers.
+Fills a throwaway test database, checks each ValuesSerializer produces
+exactly the output of the ModelSerializer it replaces, and compares how
+many rows per second each can serialize.
+
+Usage: python scripts/benchmark_list_serializers.py [--rows 2000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import django
+from datetime import date, timedelta
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from accounts.models import User
+from achievements.models import Achievement, AchievementCategory, AchievementComment, AchievementLike
+from achievements.serializers import AchievementSerializer, AchievementValuesSerializer
+from certificates.models import Certificate, CertificateCategory, CertificateComment, CertificateLike
+from certificates.serializers import CertificateSerializer, CertificateValuesSerializer
+from notifications.models import Notification, NotificationType
+from notifications.serializers import NotificationSerializer, NotificationValuesSerializer
+from volunteering.models import VolunteeringActivity, VolunteeringCategory, VolunteeringComment, VolunteeringLike
+from volunteering.serializers import VolunteeringActivitySerializer, VolunteeringActivityValuesSerializer
+
+SKILLS = ['python', 'leadership', 'public speaking', 'research', 'design', 'teamwork', 'writing']
+
+
+def timed(label, func, rows, repeat=3):
+    """Run func several times and print the best wall-clock time and throughput."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.1f} ms {rows / best:12.0f} rows/s")
+
+
+def common(users, faculty, i):
+    verified = i % 3 == 0
+    return {
+        'user': random.choice(users),
+        'title': f'Item {i}',
+        'description': 'Lorem ipsum dolor sit amet. ' * 5,
+        'status': 'approved' if verified else random.choice(['pending', 'rejected']),
+        'points': random.randint(0, 100),
+        'verified_by': faculty if verified else None,
+        'verified_at': timezone.now() if verified else None,
+        'tags': random.sample(SKILLS, 2),
+    }
+
+
+def populate(rows):
+    print(f"Creating {rows} rows of each type...")
+    users = User.objects.bulk_create([
+        User(email=f's{i}@bench.local', username=f'bench-s{i}', role='student', first_name='Student', last_name=str(i))
+        for i in range(100)
+    ])
+    faculty = User.objects.create(email='f@bench.local', username='bench-f', role='faculty', first_name='Fac')
+
+    achievement_category = AchievementCategory.objects.create(name='Academic')
+    Achievement.objects.bulk_create([
+        Achievement(category=achievement_category, skills_gained=random.sample(SKILLS, 3),
+                    evidence_file=f'blobs/aa/bb/{i:064x}.pdf' if i % 2 else None, **common(users, faculty, i))
+        for i in range(rows)
+    ])
+    certificate_category = CertificateCategory.objects.create(name='Course')
+    Certificate.objects.bulk_create([
+        Certificate(category=certificate_category, issuer='Coursera', issue_date=date(2024, 1, 1),
+                    expiry_date=date.today() + timedelta(days=random.randint(-100, 400)) if i % 2 else None,
+                    skills_verified=random.sample(SKILLS, 2), certificate_file=f'certs/{i}.pdf',
+                    **common(users, faculty, i))
+        for i in range(rows)
+    ])
+    volunteering_category = VolunteeringCategory.objects.create(name='Community')
+    VolunteeringActivity.objects.bulk_create([
+        VolunteeringActivity(category=volunteering_category, organization='NGO', activity_date=date(2024, 3, 1),
+                             hours_volunteered=random.choice([1, 2.5, 4]), skills_developed=random.sample(SKILLS, 2),
+                             **common(users, faculty, i))
+        for i in range(rows)
+    ])
+    notification_type = NotificationType.objects.create(name='achievement', description='-')
+    now = timezone.now()
+    Notification.objects.bulk_create([
+        Notification(user=users[0], type=notification_type, title=f'Notice {i}', message='Something happened',
+                     metadata={'id': i}, expires_at=now + timedelta(days=random.randint(-5, 5)) if i % 2 else None)
+        for i in range(rows)
+    ])
+
+    for model, like_model, comment_model, fk in (
+        (Achievement, AchievementLike, AchievementComment, 'achievement'),
+        (Certificate, CertificateLike, CertificateComment, 'certificate'),
+        (VolunteeringActivity, VolunteeringLike, VolunteeringComment, 'activity'),
+    ):
+        ids = list(model.objects.values_list('id', flat=True))
+        like_model.objects.bulk_create([
+            like_model(user=user, **{f'{fk}_id': object_id})
+            for object_id in random.sample(ids, len(ids) // 2) for user in random.sample(users, 3)
+        ])
+        comment_model.objects.bulk_create([
+            comment_model(user=random.choice(users), comment='Nice!', **{f'{fk}_id': object_id})
+            for object_id in random.sample(ids, len(ids) // 3)
+        ])
+    return users[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        viewer = populate(args.rows)
+        request = Request(APIRequestFactory().get('/api/'))
+        request.user = viewer
+        context = {'request': request}
+
+        cases = [
+            ('achievements', Achievement.objects.select_related('user', 'category', 'verified_by'),
+             AchievementSerializer, AchievementValuesSerializer),
+            ('certificates', Certificate.objects.select_related('user', 'category', 'verified_by'),
+             CertificateSerializer, CertificateValuesSerializer),
+            ('volunteering activities', VolunteeringActivity.objects.select_related('user', 'category', 'verified_by'),
+             VolunteeringActivitySerializer, VolunteeringActivityValuesSerializer),
+            ('notifications', Notification.objects.select_related('type'),
+             NotificationSerializer, NotificationValuesSerializer),
+        ]
+        print(f"Results on {connection.vendor} (best of 3, {args.rows} rows):")
+        for label, queryset, model_serializer, values_serializer in cases:
+            queryset = queryset.order_by('id')
+
+            def full():
+                return model_serializer(queryset, many=True, context=context).data
+
+            def values():
+                return values_serializer(values_serializer.values_queryset(queryset, context), many=True, context=context).data
+
+            expected, actual = [dict(item) for item in full()], values()
+            mismatches = [(a['id'], key) for a, b in zip(expected, actual) for key in a if a[key] != b.get(key)]
+            parity = 'identical' if expected == actual else f'DIFFERENT, e.g. {mismatches[:3]}'
+            print(f"{label}: output {parity}")
+            timed(model_serializer.__name__, full, args.rows)
+            timed(values_serializer.__name__, values, args.rows)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Benchmark of POST /api/auth/login/ under a burst of logins.
+Logs every user in once per mode and reports p50/p99 latency: Django's
+default PBKDF2 hasher with the session row written during the request
+(the old login path), the tuned Argon2 hasher with the same inline write,
+and, with REDIS_URL set, Argon2 with session tracking queued in Redis and
+written in batches. A first Argon2 pass over PBKDF2 hashes shows the
+one-time rehash-on-login. Checks that every mode ends up with one active
+UserSession per login.
+
+`--db-latency` adds a delay to every query, standing in for the network
+round trip to a database on another host.
+
+Usage: python scripts/benchmark_login.py [--users 200] [--db-latency 2]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.test import Client, override_settings
+from django.test.utils import setup_test_environment
+from accounts.models import User, UserProfile, UserSession
+from accounts.session_tracking import buffering, flush_session_events
+
+PASSWORD = 'Bench-pass-123'
+PBKDF2 = settings.PASSWORD_HASHER_CHOICES['pbkdf2']
+ARGON2 = settings.PASSWORD_HASHER_CHOICES['argon2']
+
+# Mode -> (hasher, SESSION_TRACKING_FLUSH_INTERVAL)
+MODES = {
+    'pbkdf2, inline session write': (PBKDF2, 0),
+    'argon2 (first login, rehash)': (ARGON2, 0),
+    'argon2, inline session write': (ARGON2, 0),
+    'argon2, buffered session write': (ARGON2, 5),
+}
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def login_all(users):
+    """Log every user in with a fresh client; return the latency of each login in seconds."""
+    latencies = []
+    for user in users:
+        client = Client()
+        start = time.perf_counter()
+        response = client.post('/api/auth/login/', {'email': user.email, 'password': PASSWORD},
+                               content_type='application/json')
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, (user.email, response.status_code)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--db-latency', type=float, default=2, help='milliseconds added to every query')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    if connection.vendor == 'sqlite':
+        # A file, so the database outlives the reconnect that adds the query latency
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(PASSWORD_HASHERS=[PBKDF2, ARGON2]):
+            password = make_password(PASSWORD)
+        users = User.objects.bulk_create([
+            User(email=f'login{i}@bench.local', username=f'login{i}', role='student',
+                 first_name='Login', last_name=str(i), password=password)
+            for i in range(args.users)
+        ])
+        UserProfile.objects.bulk_create([UserProfile(user=user) for user in users])
+
+        if args.db_latency:
+            def slow_query(execute, sql, params, many, context):
+                time.sleep(args.db_latency / 1000)
+                return execute(sql, params, many, context)
+
+            def add_latency(connection, **kwargs):
+                if slow_query not in connection.execute_wrappers:
+                    connection.execute_wrappers.append(slow_query)
+
+            connection_created.connect(add_latency, weak=False)
+            connection.close()
+
+        print(f"{args.users} logins per mode on {connection.vendor} ({args.db_latency:g} ms per query):")
+        for mode, (hasher, interval) in MODES.items():
+            others = [name for name in settings.PASSWORD_HASHERS if name != hasher]
+            with override_settings(PASSWORD_HASHERS=[hasher] + others, SESSION_TRACKING_FLUSH_INTERVAL=interval):
+                if interval and not buffering():
+                    print(f"  {mode:<34} skipped (needs REDIS_URL)")
+                    continue
+                UserSession.objects.all().delete()
+                latencies = login_all(users)
+                flush_session_events()
+            assert UserSession.objects.filter(is_active=True).count() == args.users, f'sessions missing for {mode}'
+            algorithms = {identify_hasher(password).algorithm for password in User.objects.values_list('password', flat=True)}
+            print(f"  {mode:<34} p50 {percentile(latencies, 0.5) * 1000:8.1f} ms"
+                  f"   p99 {percentile(latencies, 0.99) * 1000:8.1f} ms   stored hashes: {', '.join(sorted(algorithms))}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
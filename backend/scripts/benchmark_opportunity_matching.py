@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Benchmark for volunteering opportunity recommendations.
+Fills a throwaway test database with opportunities and applications and
+times the inverted-index recommender against scoring every open
+opportunity in Python.
+
+Usage: python scripts/benchmark_opportunity_matching.py [--opportunities 50000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import django
+from datetime import timedelta
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment
+from django.utils import timezone
+from accounts.models import User, UserProfile
+from volunteering.matching import opportunity_terms, rebuild_index, recommend_opportunities, user_terms
+from volunteering.models import VolunteeringApplication, VolunteeringCategory, VolunteeringOpportunity
+
+BATCH_SIZE = 5000
+CATEGORIES = ['Environment', 'Teaching', 'Healthcare', 'Animal Welfare', 'Disaster Relief', 'Community Service']
+SKILLS = [
+    'python', 'teaching', 'first aid', 'photography', 'cooking', 'design', 'writing', 'music',
+    'carpentry', 'counselling', 'fundraising', 'translation', 'coding', 'gardening', 'driving',
+]
+
+
+def timed(label, func, repeat=5):
+    """Run func several times and print the best wall-clock time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.1f} ms")
+
+
+def populate(opportunity_count):
+    print(f"Creating {opportunity_count} opportunities...")
+    creator = User.objects.create(email='creator@bench.local', username='bench-creator', role='faculty')
+    categories = [VolunteeringCategory.objects.create(name=name) for name in CATEGORIES]
+    today = timezone.now().date()
+
+    batch = []
+    for i in range(opportunity_count):
+        start = today + timedelta(days=random.randint(-60, 60))
+        batch.append(VolunteeringOpportunity(
+            title=f"{random.choice(SKILLS).title()} volunteers needed #{i}",
+            description='Help out',
+            organization='Bench Org',
+            location='Chennai',
+            category=random.choice(categories),
+            start_date=start,
+            end_date=start + timedelta(days=random.randint(1, 30)),
+            required_hours=random.randint(1, 40),
+            max_volunteers=random.choice([None, 5, 10, 20]),
+            contact_email='org@bench.local',
+            requirements=', '.join(random.sample(SKILLS, 3)),
+            status=random.choice(['active'] * 4 + ['completed']),
+            created_by=creator,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            VolunteeringOpportunity.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        VolunteeringOpportunity.objects.bulk_create(batch)
+
+    volunteers = User.objects.bulk_create([
+        User(email=f'v{i}@bench.local', username=f'bench-v{i}', role='student') for i in range(200)
+    ])
+    opportunity_ids = list(VolunteeringOpportunity.objects.values_list('id', flat=True))
+    applications = []
+    for volunteer in volunteers:
+        for opportunity_id in random.sample(opportunity_ids, 20):
+            applications.append(VolunteeringApplication(
+                opportunity_id=opportunity_id, user=volunteer, motivation='-', available_hours=5,
+                status=random.choice(['pending', 'accepted']),
+            ))
+    VolunteeringApplication.objects.bulk_create(applications, batch_size=BATCH_SIZE)
+
+    # bulk_create skips signals, so build the index once everything exists
+    rebuild_index()
+
+
+def score_in_python(user, limit=10):
+    """Naive approach: load every open opportunity and score it in Python."""
+    terms = user_terms(user)
+    today = timezone.now().date()
+    scored = []
+    for opportunity in VolunteeringOpportunity.objects.filter(status='active', end_date__gte=today).select_related('category'):
+        accepted = opportunity.applications.filter(status='accepted').count()
+        if opportunity.max_volunteers is not None and accepted >= opportunity.max_volunteers:
+            continue
+        weights = opportunity_terms({
+            'title': opportunity.title,
+            'requirements': opportunity.requirements,
+            'category__name': opportunity.category.name,
+        })
+        score = sum(weight for term, weight in weights.items() if term in terms)
+        if score:
+            scored.append((score, opportunity.id, opportunity))
+    scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    return [opportunity for _, _, opportunity in scored[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--opportunities', type=int, default=50000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.opportunities)
+        student = User.objects.create(email='student@bench.local', username='bench-student', role='student')
+        UserProfile.objects.create(user=student, skills=['Python', 'First Aid'], interests=['Teaching'])
+        print(f"Student terms: {', '.join(sorted(user_terms(student)))}")
+
+        print(f"Results on {connection.vendor} (best of 5, top 10):")
+        timed('score every opportunity in Python', lambda: score_in_python(student), repeat=1)
+        timed('inverted index + SQL filters', lambda: recommend_opportunities(student, limit=10))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
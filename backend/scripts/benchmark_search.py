@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Benchmark for full-text search.
+Fills a throwaway test database with search entries and compares the
+ranked full-text path (FTS5 on SQLite, GIN/tsvector on PostgreSQL) with
+the icontains scan that SearchFilter performs.
+
+Usage: python scripts/benchmark_search.py [--rows 1000000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import django
+
+# Add the project directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Setup Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'eduportal.settings')
+django.setup()
+
+from django.db import connection
+from django.db.models import Q
+from django.test.utils import setup_test_environment
+from accounts.models import User
+from search.backends import search
+from search.models import SearchEntry
+
+BATCH_SIZE = 10000
+VOCABULARY = [
+    'robotics', 'hackathon', 'python', 'leadership', 'volunteer', 'cloud', 'security',
+    'research', 'debate', 'music', 'football', 'chess', 'design', 'startup', 'analytics',
+    'community', 'teaching', 'environment', 'health', 'finance', 'marketing', 'physics',
+]
+RARE_WORD = 'quasicrystal'
+
+
+def timed(label, func, repeat=5):
+    """Run func several times and print the best wall-clock time."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<40} {best * 1000:10.1f} ms")
+
+
+def populate(row_count):
+    print(f"Creating {row_count} search entries...")
+    kinds = ['achievement', 'certificate', 'opportunity']
+    batch = []
+    for i in range(row_count):
+        words = random.choices(VOCABULARY, k=30)
+        if i % 10000 == 0:
+            words.append(RARE_WORD)
+        batch.append(SearchEntry(
+            kind=kinds[i % 3],
+            object_id=i,
+            title=' '.join(words[:4]).title(),
+            body=' '.join(words[4:]),
+            is_public=True,
+        ))
+        if len(batch) >= BATCH_SIZE:
+            SearchEntry.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        SearchEntry.objects.bulk_create(batch)
+
+
+def icontains(term):
+    return list(SearchEntry.objects.filter(
+        Q(title__icontains=term) | Q(body__icontains=term)
+    ).order_by('-updated_at')[:20])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        populate(args.rows)
+        user = User.objects.create(email='admin@bench.local', username='bench-admin', role='admin')
+
+        print(f"Results on {connection.vendor} (best of 5, top 20 rows):")
+        for term in ('robotics', RARE_WORD):
+            timed(f"icontains '{term}'", lambda: icontains(term))
+            timed(f"full-text '{term}'", lambda: search(term, user, limit=20))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -77,7 +77,7 @@ def create_users():
                 'first_name': faculty_info['first_name'],
                 'last_name': faculty_info['last_name'],
                 'role': 'faculty',
-                'department': faculty_info['department'],
+                'department': Department.objects.get(name=faculty_info['department']),
             }
         )
         if created:
@@ -103,7 +103,7 @@ def create_users():
                 'last_name': student_info['last_name'],
                 'role': 'student',
                 'student_id': student_info['student_id'],
-                'department': student_info['department'],
+                'department': Department.objects.get(name=student_info['department']),
             }
         )
         if created:
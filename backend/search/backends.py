@@ -0,0 +1,76 @@
+import re
+from django.db import connection
+from django.db.models import Q
+from .models import SearchEntry
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+ENTRY_COLUMNS = 'e.id, e.kind, e.object_id, e.owner_id, e.title, e.body, e.is_public, e.updated_at'
+
+
+def _visibility_sql(user, kinds):
+    """WHERE fragments shared by the raw full-text queries."""
+    clauses = []
+    params = []
+    if kinds:
+        clauses.append('e.kind IN (%s)' % ', '.join(['%s'] * len(kinds)))
+        params.extend(kinds)
+    if user.is_student():
+        clauses.append('(e.is_public OR e.owner_id = %s)')
+        params.append(user.id)
+    return clauses, params
+
+
+def _postgresql_search(query, user, kinds, limit, offset):
+    clauses, params = _visibility_sql(user, kinds)
+    where = ''.join(f' AND {clause}' for clause in clauses)
+    sql = (
+        f"SELECT {ENTRY_COLUMNS}, ts_rank(e.search_vector, q) AS rank "
+        "FROM search_entries e, websearch_to_tsquery('english', %s) q "
+        f"WHERE e.search_vector @@ q{where} "
+        "ORDER BY rank DESC, e.id DESC LIMIT %s OFFSET %s"
+    )
+    return list(SearchEntry.objects.raw(sql, [query, *params, limit, offset]))
+
+
+def _sqlite_search(query, user, kinds, limit, offset):
+    tokens = TOKEN_RE.findall(query)
+    if not tokens:
+        return []
+    # Quote every token so user input can never be parsed as FTS5 syntax
+    match = ' '.join('"%s"*' % token for token in tokens)
+
+    clauses, params = _visibility_sql(user, kinds)
+    where = ''.join(f' AND {clause}' for clause in clauses)
+    sql = (
+        f"SELECT {ENTRY_COLUMNS}, -bm25(search_entries_fts, 10.0, 1.0) AS rank "
+        "FROM search_entries_fts JOIN search_entries e ON e.id = search_entries_fts.rowid "
+        f"WHERE search_entries_fts MATCH %s{where} "
+        "ORDER BY bm25(search_entries_fts, 10.0, 1.0), e.id DESC LIMIT %s OFFSET %s"
+    )
+    return list(SearchEntry.objects.raw(sql, [match, *params, limit, offset]))
+
+
+def _fallback_search(query, user, kinds, limit, offset):
+    """Unranked substring search for databases without a full-text path."""
+    entries = SearchEntry.objects.filter(Q(title__icontains=query) | Q(body__icontains=query))
+    if kinds:
+        entries = entries.filter(kind__in=kinds)
+    if user.is_student():
+        entries = entries.filter(Q(is_public=True) | Q(owner=user))
+    entries = list(entries.order_by('-updated_at')[offset:offset + limit])
+    for entry in entries:
+        entry.rank = None
+    return entries
+
+
+def search(query, user, kinds=None, limit=20, offset=0):
+    """Return ranked search entries visible to `user`, best match first."""
+    query = query.strip()
+    if not query:
+        return []
+    if connection.vendor == 'postgresql':
+        return _postgresql_search(query, user, kinds, limit, offset)
+    if connection.vendor == 'sqlite':
+        return _sqlite_search(query, user, kinds, limit, offset)
+    return _fallback_search(query, user, kinds, limit, offset)
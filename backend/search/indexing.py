@@ -0,0 +1,157 @@
+from django.db import connection, transaction
+from accounts.models import User
+from achievements.models import Achievement
+from certificates.models import Certificate
+from volunteering.models import VolunteeringOpportunity
+from .models import SearchEntry
+
+REBUILD_BATCH_SIZE = 2000
+
+
+def _join(*parts):
+    """Flatten strings and JSON lists into one space-separated text blob."""
+    words = []
+    for part in parts:
+        if isinstance(part, (list, tuple)):
+            words.extend(str(item) for item in part if item)
+        elif part:
+            words.append(str(part))
+    return ' '.join(words)
+
+
+def achievement_document(achievement):
+    return {
+        'owner_id': achievement.user_id,
+        'title': achievement.title,
+        'body': _join(achievement.description, achievement.tags, achievement.skills_gained),
+        'is_public': achievement.is_public and achievement.status == 'approved',
+    }
+
+
+def certificate_document(certificate):
+    return {
+        'owner_id': certificate.user_id,
+        'title': certificate.title,
+        'body': _join(
+            certificate.description, certificate.issuer, certificate.certificate_number,
+            certificate.tags, certificate.skills_verified
+        ),
+        'is_public': certificate.is_public and certificate.status == 'approved',
+    }
+
+
+def opportunity_document(opportunity):
+    return {
+        'owner_id': opportunity.created_by_id,
+        'title': opportunity.title,
+        'body': _join(
+            opportunity.description, opportunity.organization, opportunity.location,
+            opportunity.requirements
+        ),
+        'is_public': opportunity.status == 'active',
+    }
+
+
+def user_document(user):
+    # Users are only searchable by faculty/admins (and by themselves as owner)
+    return {
+        'owner_id': user.id,
+        'title': user.full_name or user.username,
+        'body': _join(user.email, user.username, user.student_id, user.bio),
+        'is_public': False,
+    }
+
+
+# kind -> (model, document builder, fields that feed the document)
+INDEXED_MODELS = {
+    'achievement': (
+        Achievement, achievement_document,
+        {'title', 'description', 'tags', 'skills_gained', 'is_public', 'status', 'user'},
+    ),
+    'certificate': (
+        Certificate, certificate_document,
+        {'title', 'description', 'issuer', 'certificate_number', 'tags', 'skills_verified',
+         'is_public', 'status', 'user'},
+    ),
+    'opportunity': (
+        VolunteeringOpportunity, opportunity_document,
+        {'title', 'description', 'organization', 'location', 'requirements', 'status', 'created_by'},
+    ),
+    'user': (
+        User, user_document,
+        {'first_name', 'last_name', 'username', 'email', 'student_id', 'bio'},
+    ),
+}
+
+
+def kind_for_model(model):
+    for kind, (indexed_model, _, _) in INDEXED_MODELS.items():
+        if indexed_model is model:
+            return kind
+    return None
+
+
+def index_instance(instance, update_fields=None):
+    """Create or refresh the search entry of a saved instance."""
+    kind = kind_for_model(type(instance))
+    if kind is None:
+        return
+    _, build_document, indexed_fields = INDEXED_MODELS[kind]
+
+    # Saves that only touch unindexed columns (e.g. last_login) leave the entry alone
+    if update_fields is not None and not indexed_fields.intersection(update_fields):
+        return
+
+    SearchEntry.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults=build_document(instance),
+    )
+
+
+def index_instances(instances):
+    """Bulk variant of index_instance for rows created with bulk_create, which sends no signals."""
+    entries = []
+    for instance in instances:
+        kind = kind_for_model(type(instance))
+        if kind is not None:
+            _, build_document, _ = INDEXED_MODELS[kind]
+            entries.append(SearchEntry(kind=kind, object_id=instance.pk, **build_document(instance)))
+    SearchEntry.objects.bulk_create(
+        entries,
+        batch_size=REBUILD_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['owner', 'title', 'body', 'is_public', 'updated_at'],
+    )
+
+
+def remove_instance(instance):
+    kind = kind_for_model(type(instance))
+    if kind is not None:
+        SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def rebuild_index(stdout=None):
+    """Rebuild every search entry from the source tables."""
+    with transaction.atomic():
+        SearchEntry.objects.all().delete()
+        for kind, (model, build_document, _) in INDEXED_MODELS.items():
+            batch = []
+            count = 0
+            for instance in model.objects.all().iterator(chunk_size=REBUILD_BATCH_SIZE):
+                batch.append(SearchEntry(kind=kind, object_id=instance.pk, **build_document(instance)))
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    SearchEntry.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                SearchEntry.objects.bulk_create(batch)
+                count += len(batch)
+            if stdout:
+                stdout.write(f"Indexed {count} {kind} records")
+
+        if connection.vendor == 'sqlite':
+            # Resync the FTS5 shadow table in case triggers were lost by a table rebuild
+            with connection.cursor() as cursor:
+                cursor.execute("INSERT INTO search_entries_fts(search_entries_fts) VALUES('rebuild')")
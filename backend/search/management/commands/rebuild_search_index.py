@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from search.indexing import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from achievements, certificates, opportunities and users.'
+    
+    def handle(self, *args, **options):
+        rebuild_index(stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+POSTGRESQL_FORWARDS = [
+    "ALTER TABLE search_entries ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(body, '')), 'B')) STORED",
+    "CREATE INDEX search_entries_vector_idx ON search_entries USING GIN (search_vector)",
+]
+
+POSTGRESQL_BACKWARDS = [
+    "DROP INDEX IF EXISTS search_entries_vector_idx",
+    "ALTER TABLE search_entries DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table; triggers keep it in step with search_entries.
+# A table rebuild by a later ALTER on SQLite drops the triggers, so run
+# `manage.py rebuild_search_index` after any migration touching SearchEntry.
+SQLITE_FORWARDS = [
+    "CREATE VIRTUAL TABLE search_entries_fts USING fts5("
+    "title, body, content='search_entries', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER search_entries_ai AFTER INSERT ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER search_entries_ad AFTER DELETE ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(search_entries_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER search_entries_au AFTER UPDATE ON search_entries BEGIN "
+    "INSERT INTO search_entries_fts(search_entries_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO search_entries_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS search_entries_au",
+    "DROP TRIGGER IF EXISTS search_entries_ad",
+    "DROP TRIGGER IF EXISTS search_entries_ai",
+    "DROP TABLE IF EXISTS search_entries_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def operation(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({'postgresql': POSTGRESQL_FORWARDS, 'sqlite': SQLITE_FORWARDS}),
+            _run({'postgresql': POSTGRESQL_BACKWARDS, 'sqlite': SQLITE_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import models
+from django.conf import settings
+
+
+class SearchEntry(models.Model):
+    """Denormalized, full-text indexed copy of a searchable record.
+    
+    The full-text index itself lives outside the ORM: a generated tsvector
+    column with a GIN index on PostgreSQL, or an FTS5 table kept in sync by
+    triggers on SQLite (see migration 0002).
+    """
+    
+    KIND_CHOICES = [
+        ('achievement', 'Achievement'),
+        ('certificate', 'Certificate'),
+        ('opportunity', 'Volunteering Opportunity'),
+        ('user', 'User'),
+    ]
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='search_entries'
+    )
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    is_public = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'search_entries'
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+        unique_together = ['kind', 'object_id']
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} - {self.title}"
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from eduportal.serializers import SparseFieldsMixin
+from .models import SearchEntry
+
+
+class SearchResultSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for ranked search results."""
+    
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    snippet = serializers.SerializerMethodField()
+    rank = serializers.FloatField(allow_null=True)
+    
+    class Meta:
+        model = SearchEntry
+        fields = ['type', 'id', 'title', 'snippet', 'is_public', 'rank', 'updated_at']
+    
+    def get_snippet(self, obj):
+        if len(obj.body) > 200:
+            return obj.body[:200].rsplit(' ', 1)[0] + '...'
+        return obj.body
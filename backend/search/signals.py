@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from .indexing import INDEXED_MODELS, index_instance, remove_instance
+
+
+def update_search_entry(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the search entry of a saved record current."""
+    if raw:
+        return
+    index_instance(instance, update_fields=update_fields)
+
+
+def delete_search_entry(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for model, _, _ in INDEXED_MODELS.values():
+    post_save.connect(update_search_entry, sender=model, dispatch_uid=f'search-index-{model._meta.label}')
+    post_delete.connect(delete_search_entry, sender=model, dispatch_uid=f'search-remove-{model._meta.label}')
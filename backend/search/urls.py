@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Full-text search
+    path('', views.search_view, name='search'),
+]
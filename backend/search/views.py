@@ -0,0 +1,39 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from eduportal.replicas import replica_reads
+from .backends import search
+from .models import SearchEntry
+from .serializers import SearchResultSerializer
+
+MAX_LIMIT = 100
+
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def search_view(request):
+    """Ranked full-text search over achievements, certificates, opportunities and users."""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response({'error': 'A search query is required.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    valid_kinds = {kind for kind, _ in SearchEntry.KIND_CHOICES}
+    kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+    if any(kind not in valid_kinds for kind in kinds):
+        return Response({'error': 'Invalid type filter.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        limit = min(int(request.query_params.get('limit', 20)), MAX_LIMIT)
+        offset = int(request.query_params.get('offset', 0))
+    except ValueError:
+        return Response({'error': 'Invalid limit or offset.'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1 or offset < 0:
+        return Response({'error': 'Invalid limit or offset.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Fetch one extra row to know whether another page exists
+    entries = search(query, request.user, kinds=kinds, limit=limit + 1, offset=offset)
+    next_offset = offset + limit if len(entries) > limit else None
+    
+    serializer = SearchResultSerializer(entries[:limit], many=True)
+    return Response({'results': serializer.data, 'next_offset': next_offset})
@@ -0,0 +1,141 @@
+from django.db import transaction
+from accounts.models import UserProfile
+from achievements.models import Achievement
+from certificates.models import Certificate
+from volunteering.models import VolunteeringActivity
+from .models import Tag, TaggedItem
+
+REBUILD_BATCH_SIZE = 2000
+
+# kind -> (model, owner attribute, {JSON list field: tag field})
+TAGGED_MODELS = {
+    'achievement': (Achievement, 'user_id', {'tags': 'tag', 'skills_gained': 'skill'}),
+    'certificate': (Certificate, 'user_id', {'tags': 'tag', 'skills_verified': 'skill'}),
+    'volunteering': (VolunteeringActivity, 'user_id', {'tags': 'tag', 'skills_developed': 'skill'}),
+    'profile': (UserProfile, 'user_id', {'skills': 'skill', 'interests': 'interest'}),
+}
+
+
+def normalize_tag(value):
+    """Lowercase and collapse whitespace so 'Machine  Learning' == 'machine learning'."""
+    if not isinstance(value, str):
+        value = str(value)
+    return ' '.join(value.split()).lower()[:100]
+
+
+def kind_for_model(model):
+    for kind, (tagged_model, _, _) in TAGGED_MODELS.items():
+        if tagged_model is model:
+            return kind
+    return None
+
+
+def _wanted_pairs(values_by_attribute, json_fields):
+    """(field, normalized name) pairs stored in a row's JSON lists."""
+    pairs = set()
+    for attribute, field in json_fields.items():
+        values = values_by_attribute[attribute] or []
+        if not isinstance(values, (list, tuple)):
+            continue
+        for value in values:
+            name = normalize_tag(value)
+            if name:
+                pairs.add((field, name))
+    return pairs
+
+
+def _tag_ids(names):
+    """Map names to Tag ids, creating missing tags in one round trip."""
+    if not names:
+        return {}
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    return dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+
+
+def sync_instance(instance, update_fields=None):
+    """Make the TaggedItem rows of an instance match its JSON lists."""
+    kind = kind_for_model(type(instance))
+    if kind is None:
+        return
+    _, owner_attribute, json_fields = TAGGED_MODELS[kind]
+
+    if update_fields is not None and not set(json_fields).intersection(update_fields):
+        return
+
+    wanted = _wanted_pairs({attribute: getattr(instance, attribute) for attribute in json_fields}, json_fields)
+    existing = {
+        (item['field'], item['tag__name']): item['id']
+        for item in TaggedItem.objects.filter(kind=kind, object_id=instance.pk).values('id', 'field', 'tag__name')
+    }
+
+    stale = [item_id for pair, item_id in existing.items() if pair not in wanted]
+    missing = wanted - set(existing)
+    if not stale and not missing:
+        return
+
+    with transaction.atomic():
+        if stale:
+            TaggedItem.objects.filter(id__in=stale).delete()
+        if missing:
+            tag_ids = _tag_ids({name for _, name in missing})
+            TaggedItem.objects.bulk_create([
+                TaggedItem(
+                    tag_id=tag_ids[name],
+                    kind=kind,
+                    object_id=instance.pk,
+                    field=field,
+                    owner_id=getattr(instance, owner_attribute),
+                )
+                for field, name in missing
+            ], ignore_conflicts=True)
+
+
+def remove_instance(instance):
+    kind = kind_for_model(type(instance))
+    if kind is not None:
+        TaggedItem.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+def tagged_object_ids(kind, field, name):
+    """Subquery of object ids carrying a tag; resolved through the unique index."""
+    return TaggedItem.objects.filter(
+        kind=kind, field=field, tag__name=normalize_tag(name)
+    ).values('object_id')
+
+
+def rebuild_index(stdout=None):
+    """Rebuild every TaggedItem row from the JSON lists."""
+    with transaction.atomic():
+        TaggedItem.objects.all().delete()
+        for kind, (model, owner_attribute, json_fields) in TAGGED_MODELS.items():
+            count = 0
+            rows = model.objects.values('pk', owner_attribute, *json_fields).iterator(chunk_size=REBUILD_BATCH_SIZE)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= REBUILD_BATCH_SIZE:
+                    count += _bulk_index(kind, owner_attribute, json_fields, batch)
+                    batch = []
+            if batch:
+                count += _bulk_index(kind, owner_attribute, json_fields, batch)
+            if stdout:
+                stdout.write(f"Indexed {count} {kind} tags")
+
+
+def _bulk_index(kind, owner_attribute, json_fields, rows):
+    pairs_by_row = []
+    names = set()
+    for row in rows:
+        pairs = _wanted_pairs(row, json_fields)
+        names.update(name for _, name in pairs)
+        pairs_by_row.append((row, pairs))
+
+    tag_ids = _tag_ids(names)
+    items = [
+        TaggedItem(tag_id=tag_ids[name], kind=kind, object_id=row['pk'], field=field,
+                   owner_id=row[owner_attribute])
+        for row, pairs in pairs_by_row
+        for field, name in pairs
+    ]
+    TaggedItem.objects.bulk_create(items, ignore_conflicts=True)
+    return len(items)
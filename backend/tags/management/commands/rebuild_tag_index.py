@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from tags.indexing import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the tag/skill index from the JSON lists on achievements, certificates, volunteering and profiles.'
+    
+    def handle(self, *args, **options):
+        rebuild_index(stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Tag index rebuilt.'))
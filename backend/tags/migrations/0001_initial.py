@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Tag',
+                'verbose_name_plural': 'Tags',
+                'db_table': 'tags',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaggedItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('achievement', 'Achievement'), ('certificate', 'Certificate'), ('volunteering', 'Volunteering Activity'), ('profile', 'User Profile')], max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('field', models.CharField(choices=[('tag', 'Tag'), ('skill', 'Skill'), ('interest', 'Interest')], max_length=10)),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tagged_items', to=settings.AUTH_USER_MODEL)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='tags.tag')),
+            ],
+            options={
+                'verbose_name': 'Tagged Item',
+                'verbose_name_plural': 'Tagged Items',
+                'db_table': 'tagged_items',
+                'indexes': [models.Index(fields=['kind', 'object_id'], name='tagged_item_kind_ae07bd_idx')],
+                'unique_together': {('tag', 'kind', 'field', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.db import models
+from django.conf import settings
+
+
+class Tag(models.Model):
+    """Normalized tag or skill name shared across all domains."""
+    
+    name = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tags'
+        verbose_name = 'Tag'
+        verbose_name_plural = 'Tags'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class TaggedItem(models.Model):
+    """One tag/skill/interest attached to a record, mirrored from its JSON list."""
+    
+    KIND_CHOICES = [
+        ('achievement', 'Achievement'),
+        ('certificate', 'Certificate'),
+        ('volunteering', 'Volunteering Activity'),
+        ('profile', 'User Profile'),
+    ]
+    
+    FIELD_CHOICES = [
+        ('tag', 'Tag'),
+        ('skill', 'Skill'),
+        ('interest', 'Interest'),
+    ]
+    
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='items')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    field = models.CharField(max_length=10, choices=FIELD_CHOICES)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='tagged_items'
+    )
+    
+    class Meta:
+        db_table = 'tagged_items'
+        verbose_name = 'Tagged Item'
+        verbose_name_plural = 'Tagged Items'
+        unique_together = ['tag', 'kind', 'field', 'object_id']
+        indexes = [
+            models.Index(fields=['kind', 'object_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} - {self.field}: {self.tag.name}"
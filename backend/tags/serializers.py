@@ -0,0 +1,9 @@
+from rest_framework import serializers
+
+
+class TopTagSerializer(serializers.Serializer):
+    """Serializer for one row of the top tags/skills aggregate"""
+    
+    name = serializers.CharField()
+    count = serializers.IntegerField()
+    users_count = serializers.IntegerField()
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from .indexing import TAGGED_MODELS, sync_instance, remove_instance
+
+
+def update_tagged_items(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Mirror the JSON tag/skill lists of a saved record into the tag index."""
+    if raw:
+        return
+    sync_instance(instance, update_fields=update_fields)
+
+
+def delete_tagged_items(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for model, _, _ in TAGGED_MODELS.values():
+    post_save.connect(update_tagged_items, sender=model, dispatch_uid=f'tags-sync-{model._meta.label}')
+    post_delete.connect(delete_tagged_items, sender=model, dispatch_uid=f'tags-remove-{model._meta.label}')
@@ -0,0 +1,35 @@
+from datetime import date
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from certificates.models import Certificate, CertificateCategory
+
+
+class TopTagsTests(TestCase):
+    """Top skills only count records that every user can see."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email='student@test.local', username='student', password='pw', role='student')
+        category = CertificateCategory.objects.create(name='Course')
+        for title, status, is_public in [
+            ('Approved', 'approved', True), ('Pending', 'pending', True),
+            ('Rejected', 'rejected', True), ('Private', 'approved', False),
+        ]:
+            Certificate.objects.create(
+                user=cls.student, title=title, description='d', category=category, issuer='Coursera',
+                issue_date=date(2024, 1, 1), status=status, is_public=is_public, skills_verified=['Python', title],
+            )
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+    
+    def test_counts_only_approved_public_records(self):
+        response = self.client.get('/api/tags/top/', {'field': 'skill'})
+        self.assertEqual(
+            [(row['name'], row['count']) for row in response.data],
+            [('approved', 1), ('python', 1)],
+        )
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Tag and skill aggregates
+    path('top/', views.top_tags, name='top-tags'),
+]
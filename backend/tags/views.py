@@ -0,0 +1,74 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from eduportal.replicas import replica_reads
+from .indexing import TAGGED_MODELS
+from .models import TaggedItem
+from .serializers import TopTagSerializer
+
+MAX_LIMIT = 100
+
+# Record kinds whose tags only count once the record is approved and public
+REVIEWED_KINDS = ('achievement', 'certificate', 'volunteering')
+
+
+def visible_items(items):
+    """
+    Items of records every user sees in the list endpoints: approved, public
+    achievements, certificates and activities, plus profiles. Counts are
+    shared by all viewers, so pending, rejected and private records never
+    show up in them.
+    """
+    visible = Q(kind='profile')
+    for kind in REVIEWED_KINDS:
+        model = TAGGED_MODELS[kind][0]
+        visible |= Q(kind=kind, object_id__in=model.objects.filter(status='approved', is_public=True).values('pk'))
+    return items.filter(visible)
+
+
+@replica_reads
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def top_tags(request):
+    """Most used tags/skills, optionally narrowed by field, record type and department."""
+    field = request.query_params.get('field', 'skill')
+    kind = request.query_params.get('type')
+    department_id = request.query_params.get('department')
+    
+    if field not in {value for value, _ in TaggedItem.FIELD_CHOICES}:
+        return Response({'error': 'Invalid field.'}, status=status.HTTP_400_BAD_REQUEST)
+    if kind and kind not in {value for value, _ in TaggedItem.KIND_CHOICES}:
+        return Response({'error': 'Invalid type filter.'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(int(request.query_params.get('limit', 20)), MAX_LIMIT)
+        department_id = int(department_id) if department_id else None
+    except ValueError:
+        return Response({'error': 'Invalid limit or department.'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1:
+        return Response({'error': 'Invalid limit.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    cache_key = f'tags:top:{field}:{kind or "all"}:{department_id or "all"}:{limit}'
+    rows = cache.get(cache_key)
+    if rows is None:
+        items = visible_items(TaggedItem.objects.filter(field=field))
+        if kind:
+            items = items.filter(kind=kind)
+        if department_id:
+            items = items.filter(owner__department_id=department_id)
+        
+        rows = list(
+            items.values('tag__name')
+            .annotate(count=Count('id'), users_count=Count('owner', distinct=True))
+            .order_by('-count', 'tag__name')[:limit]
+        )
+        rows = [
+            {'name': row['tag__name'], 'count': row['count'], 'users_count': row['users_count']}
+            for row in rows
+        ]
+        cache.set(cache_key, rows, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = TopTagSerializer(rows, many=True)
+    return Response(serializer.data)
@@ -0,0 +1,174 @@
+import fcntl
+import os
+from datetime import timedelta
+from functools import partial
+from django.conf import settings
+from django.db import transaction
+from django.http import UnreadablePostError
+from django.utils import timezone
+from achievements.models import Achievement
+from certificates.models import Certificate
+from volunteering.models import VolunteeringActivity
+from blobs.storage import hash_path
+from .models import UploadSession
+
+READ_SIZE = 64 * 1024
+
+# target -> (model, file field); the record must belong to the uploader (user_id)
+UPLOAD_TARGETS = {
+    'achievement': (Achievement, 'evidence_file'),
+    'certificate': (Certificate, 'certificate_file'),
+    'volunteering_activity': (VolunteeringActivity, 'evidence_file'),
+}
+
+# extension -> leading-byte check, applied to the first SIGNATURE_LENGTH bytes of the file
+FILE_SIGNATURES = {
+    '.pdf': lambda head: head.startswith(b'%PDF'),
+    '.png': lambda head: head.startswith(b'\x89PNG\r\n\x1a\n'),
+    '.jpg': lambda head: head.startswith(b'\xff\xd8\xff'),
+    '.jpeg': lambda head: head.startswith(b'\xff\xd8\xff'),
+    '.zip': lambda head: head.startswith(b'PK\x03\x04'),
+    '.mp4': lambda head: head[4:8] == b'ftyp',
+    '.mov': lambda head: head[4:8] in (b'ftyp', b'moov', b'wide', b'mdat'),
+    '.webm': lambda head: head.startswith(b'\x1a\x45\xdf\xa3'),
+}
+SIGNATURE_LENGTH = 8  # Longest prefix any check above reads
+
+
+class OffsetMismatch(Exception):
+    """The chunk doesn't start where the upload left off; `offset` is where it did."""
+    
+    def __init__(self, offset):
+        super().__init__(f"Upload is at offset {offset}")
+        self.offset = offset
+
+
+class UploadInProgress(Exception):
+    """Another request is still appending to this upload; `offset` is the last one saved."""
+    
+    def __init__(self, offset):
+        super().__init__("Another request is still writing to this upload.")
+        self.offset = offset
+
+
+class InvalidUpload(Exception):
+    pass
+
+
+def _read_head(path):
+    with open(path, 'rb') as file:
+        return file.read(SIGNATURE_LENGTH)
+
+
+def append_chunk(session, offset, stream, length):
+    """
+    Write `length` bytes from `stream` at `offset` of the partial file.
+    
+    The request body is copied to disk READ_SIZE bytes at a time, never
+    buffered whole. If the client disconnects mid-chunk, the bytes that did
+    arrive are kept and the offset advanced, so the next request resumes
+    from there. Returns the session with its new offset.
+    
+    Appends to one session are serialized by an exclusive lock on the
+    partial file, not by the database: no row lock or transaction stays
+    open while a slow client sends its bytes. The new offset is saved
+    afterwards in one conditional UPDATE.
+    """
+    os.makedirs(os.path.dirname(session.partial_path), exist_ok=True)
+    fd = os.open(session.partial_path, os.O_RDWR | os.O_CREAT, 0o644)
+    with open(fd, 'r+b') as partial:
+        try:
+            fcntl.flock(partial, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadInProgress(session.offset)
+        
+        # Whatever the last request that held the lock saved
+        session.refresh_from_db(fields=['offset', 'size', 'updated_at'])
+        if offset != session.offset:
+            raise OffsetMismatch(session.offset)
+        if session.offset + length > session.size:
+            raise InvalidUpload("Chunk extends past the declared upload size.")
+        
+        received = 0
+        check = FILE_SIGNATURES.get(session.extension) if session.offset < SIGNATURE_LENGTH else None
+        # Drop bytes past the committed offset left by a request that died before saving it
+        partial.seek(session.offset)
+        partial.truncate()
+        try:
+            while received < length:
+                chunk = stream.read(min(READ_SIZE, length - received))
+                if not chunk:
+                    break
+                partial.write(chunk)
+                received += len(chunk)
+                end = session.offset + received
+                # A read may return only a few bytes: check once the whole signature (or file) is in
+                if check and (end >= SIGNATURE_LENGTH or end == session.size):
+                    partial.flush()
+                    valid = check(_read_head(session.partial_path))
+                    check = None
+                    if not valid:
+                        partial.truncate(session.offset)
+                        raise InvalidUpload(f"File content does not match its {session.extension} extension.")
+        except (UnreadablePostError, OSError):
+            pass  # Client went away; keep what arrived
+        partial.flush()
+        
+        # Still under the file lock; the offset condition guards against a writer that doesn't share it
+        now = timezone.now()
+        saved = UploadSession.objects.filter(pk=session.pk, offset=session.offset).update(
+            offset=session.offset + received, updated_at=now
+        )
+        if not saved:
+            session.refresh_from_db(fields=['offset'])
+            raise OffsetMismatch(session.offset)
+        session.offset += received
+        session.updated_at = now
+    return session
+
+
+def attach_upload(session, instance, field_name):
+    """
+    Move a finished upload into the record's file storage and save it.
+    
+    The partial file is hard-linked into place (see ContentAddressedStorage.adopt),
+    so even large files are not copied again. It is removed only once the
+    record is saved; if saving fails, the upload can be attached again.
+    """
+    storage = instance._meta.get_field(field_name).storage
+    sha256 = hash_path(session.partial_path)
+    if isinstance(instance, Certificate):
+        duplicate = Certificate.objects.filter(
+            user_id=instance.user_id, file_sha256=sha256
+        ).exclude(pk=instance.pk).exclude(status='rejected').exists()
+        if duplicate:
+            raise InvalidUpload("This file has already been submitted as a certificate.")
+    
+    name = None
+    try:
+        with transaction.atomic():
+            name = storage.adopt(session.partial_path, session.extension, sha256=sha256)
+            setattr(instance, field_name, name)
+            instance.save()
+            session.delete()
+    except Exception:
+        # The partial upload is still there for a retry; drop the blob file if its row was rolled back
+        if name:
+            storage.delete_if_unreferenced(name)
+        raise
+    transaction.on_commit(partial(_remove_file, session.partial_path))
+    return instance
+
+
+def _remove_file(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def purge_stale_uploads():
+    """Discard uploads untouched for UPLOAD_SESSION_TTL hours. Returns how many went."""
+    cutoff = timezone.now() - timedelta(hours=settings.UPLOAD_SESSION_TTL)
+    stale = list(UploadSession.objects.filter(updated_at__lt=cutoff))
+    for session in stale:
+        session.discard()
+    return len(stale)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from uploads.chunks import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = 'Discard chunked uploads not touched for UPLOAD_SESSION_TTL hours (for cron when Celery beat is not used).'
+    
+    def handle(self, *args, **options):
+        purged = purge_stale_uploads()
+        self.stdout.write(self.style.SUCCESS(f"Discarded {purged} stale uploads."))
@@ -0,0 +1,45 @@
+import os
+import uuid
+from django.conf import settings
+from django.db import models
+
+PARTIAL_UPLOAD_DIR = 'uploads/partial'
+
+
+class UploadSession(models.Model):
+    """A chunked upload in progress; chunks are appended to a partial file under MEDIA_ROOT."""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()  # Declared total size in bytes
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received and written so far
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'upload_sessions'
+        verbose_name = 'Upload Session'
+        verbose_name_plural = 'Upload Sessions'
+        indexes = [models.Index(fields=['updated_at'])]
+    
+    def __str__(self):
+        return f"{self.user.email} - {self.filename} ({self.offset}/{self.size})"
+    
+    @property
+    def extension(self):
+        return os.path.splitext(self.filename)[1].lower()
+    
+    @property
+    def partial_path(self):
+        return os.path.join(settings.MEDIA_ROOT, PARTIAL_UPLOAD_DIR, f'{self.id}.part')
+    
+    @property
+    def is_complete(self):
+        return self.offset == self.size
+    
+    def discard(self):
+        """Delete the session and whatever was received."""
+        if os.path.exists(self.partial_path):
+            os.remove(self.partial_path)
+        self.delete()
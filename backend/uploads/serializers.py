@@ -0,0 +1,45 @@
+from django.conf import settings
+from rest_framework import serializers
+from eduportal.serializers import SparseFieldsMixin
+from .chunks import FILE_SIGNATURES, UPLOAD_TARGETS
+from .models import UploadSession
+
+
+class UploadSessionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for chunked upload sessions."""
+    
+    chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'offset', 'chunk_size', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'offset', 'created_at', 'updated_at']
+    
+    def get_chunk_size(self, obj):
+        return settings.UPLOAD_CHUNK_SIZE
+    
+    def validate_filename(self, value):
+        value = value.replace('\\', '/').rsplit('/', 1)[-1]
+        extension = '.' + value.rsplit('.', 1)[-1].lower() if '.' in value else ''
+        if extension not in FILE_SIGNATURES:
+            allowed = ', '.join(sorted(FILE_SIGNATURES))
+            raise serializers.ValidationError(f"Unsupported file type. Allowed: {allowed}")
+        return value
+    
+    def validate_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Size must be positive.")
+        if value > settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Files may be at most {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
+    
+    def create(self, validated_data):
+        validated_data['user'] = self.context['request'].user
+        return super().create(validated_data)
+
+
+class UploadCompleteSerializer(serializers.Serializer):
+    """Serializer for attaching a finished upload to a record."""
+    
+    target = serializers.ChoiceField(choices=sorted(UPLOAD_TARGETS))
+    object_id = serializers.IntegerField()
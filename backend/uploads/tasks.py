@@ -0,0 +1,8 @@
+from celery import shared_task
+from .chunks import purge_stale_uploads
+
+
+@shared_task
+def purge_stale_uploads_task():
+    """Scheduled by Celery beat, see CELERY_BEAT_SCHEDULE."""
+    return purge_stale_uploads()
@@ -0,0 +1,63 @@
+import io
+import shutil
+import tempfile
+from django.db import connection
+from django.test import TestCase, override_settings
+from accounts.models import User
+from .chunks import OffsetMismatch, UploadInProgress, append_chunk
+from .models import UploadSession
+
+
+class WatchedStream(io.BytesIO):
+    """Request body that records whether a transaction was open while it was read."""
+    
+    def __init__(self, data, on_read=None):
+        super().__init__(data)
+        self.on_read = on_read
+        self.read_in_transaction = False
+        # TestCase's own atomic blocks, open before append_chunk runs
+        self.outer_blocks = len(connection.atomic_blocks)
+    
+    def read(self, size=-1):
+        self.read_in_transaction |= len(connection.atomic_blocks) > self.outer_blocks
+        if self.on_read is not None:
+            self.on_read()
+        return super().read(size)
+
+
+class AppendChunkTests(TestCase):
+    """Chunks are streamed to disk without holding a database lock or transaction."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='student@test.local', username='student', password='pw', role='student')
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.session = UploadSession.objects.create(user=self.user, filename='evidence.pdf', size=12)
+    
+    def test_body_is_read_outside_a_transaction(self):
+        stream = WatchedStream(b'%PDF-1.7')
+        session = append_chunk(self.session, 0, stream, 8)
+        self.assertFalse(stream.read_in_transaction)
+        self.assertEqual(session.offset, 8)
+        self.assertEqual(UploadSession.objects.get(pk=self.session.pk).offset, 8)
+    
+    def test_concurrent_append_is_refused(self):
+        attempts = []
+        
+        def append_again():
+            if not attempts:
+                with self.assertRaises(UploadInProgress) as raised:
+                    append_chunk(UploadSession.objects.get(pk=self.session.pk), 0, io.BytesIO(b'%PDF'), 4)
+                attempts.append(raised.exception.offset)
+        
+        append_chunk(self.session, 0, WatchedStream(b'%PDF-1.7', on_read=append_again), 8)
+        self.assertEqual(attempts, [0])
+        with self.assertRaises(OffsetMismatch):
+            append_chunk(self.session, 0, io.BytesIO(b'%PDF'), 4)
+        self.assertEqual(append_chunk(self.session, 8, io.BytesIO(b'\n%%E'), 4).offset, 12)
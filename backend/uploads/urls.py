@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Chunked, resumable uploads
+    path('', views.start_upload, name='upload-start'),
+    path('<uuid:pk>/', views.upload_session, name='upload-session'),
+    path('<uuid:pk>/complete/', views.complete_upload, name='upload-complete'),
+]
@@ -0,0 +1,97 @@
+from rest_framework import status, permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from django.conf import settings
+from django.shortcuts import get_object_or_404
+from .chunks import UPLOAD_TARGETS, InvalidUpload, OffsetMismatch, UploadInProgress, append_chunk, attach_upload
+from .models import UploadSession
+from .serializers import UploadSessionSerializer, UploadCompleteSerializer
+
+
+def _offset_response(session, status_code=status.HTTP_200_OK):
+    response = Response(UploadSessionSerializer(session).data, status=status_code)
+    response['Upload-Offset'] = str(session.offset)
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def start_upload(request):
+    """Open a chunked upload for a file of a declared name and size."""
+    serializer = UploadSessionSerializer(data=request.data, context={'request': request})
+    serializer.is_valid(raise_exception=True)
+    session = serializer.save()
+    return _offset_response(session, status.HTTP_201_CREATED)
+
+
+@api_view(['GET', 'PATCH', 'DELETE'])
+@permission_classes([permissions.IsAuthenticated])
+def upload_session(request, pk):
+    """
+    GET reports the offset to resume from; PATCH appends the raw request
+    body at the `Upload-Offset` header; DELETE abandons the upload.
+    """
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+    
+    if request.method == 'GET':
+        return _offset_response(session)
+    
+    if request.method == 'DELETE':
+        session.discard()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    try:
+        offset = int(request.headers['Upload-Offset'])
+        length = int(request.headers.get('Content-Length') or 0)
+    except (KeyError, ValueError):
+        return Response(
+            {'error': 'Upload-Offset and Content-Length headers are required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if length <= 0:
+        return Response({'error': 'Empty chunk'}, status=status.HTTP_400_BAD_REQUEST)
+    if length > settings.UPLOAD_CHUNK_SIZE:
+        return Response(
+            {'error': f'Chunks may be at most {settings.UPLOAD_CHUNK_SIZE} bytes'},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        )
+    
+    try:
+        # request.stream is the unparsed body, read incrementally by append_chunk
+        session = append_chunk(session, offset, request.stream, length)
+    except (OffsetMismatch, UploadInProgress) as exc:
+        response = Response({'error': str(exc), 'offset': exc.offset}, status=status.HTTP_409_CONFLICT)
+        response['Upload-Offset'] = str(exc.offset)
+        return response
+    except InvalidUpload as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    return _offset_response(session)
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def complete_upload(request, pk):
+    """Attach a fully received upload to one of the user's achievements, certificates or activities."""
+    session = get_object_or_404(UploadSession, pk=pk, user=request.user)
+    serializer = UploadCompleteSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    
+    if not session.is_complete:
+        return Response(
+            {'error': f'Upload incomplete: {session.offset} of {session.size} bytes received', 'offset': session.offset},
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    model, field_name = UPLOAD_TARGETS[serializer.validated_data['target']]
+    instance = get_object_or_404(model, pk=serializer.validated_data['object_id'], user=request.user)
+    try:
+        instance = attach_upload(session, instance, field_name)
+    except InvalidUpload as exc:
+        return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    file = getattr(instance, field_name)
+    return Response({
+        'target': serializer.validated_data['target'],
+        'object_id': instance.pk,
+        'file': request.build_absolute_uri(file.url),
+    })
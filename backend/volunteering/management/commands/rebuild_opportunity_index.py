@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from volunteering.matching import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the term index used to match volunteering opportunities to students.'
+    
+    def handle(self, *args, **options):
+        rebuild_index(stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS('Opportunity index rebuilt.'))
@@ -0,0 +1,187 @@
+import re
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import OpportunityTerm, VolunteeringActivity, VolunteeringApplication, VolunteeringOpportunity
+
+REBUILD_BATCH_SIZE = 2000
+
+TOKEN_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+STOP_WORDS = {
+    'and', 'are', 'for', 'from', 'has', 'have', 'our', 'the', 'their', 'this', 'that',
+    'with', 'will', 'you', 'your', 'who', 'all', 'any', 'can', 'into', 'not', 'per',
+}
+
+# Opportunity field -> weight of the terms it contributes
+TERM_WEIGHTS = {
+    'category': 3,
+    'requirements': 2,
+    'title': 1,
+}
+
+OPPORTUNITY_VALUES = (
+    'id', 'title', 'requirements', 'category__name', 'status',
+    'start_date', 'end_date', 'max_volunteers', 'accepted_count',
+)
+
+
+def terms_from_text(text):
+    """Lowercased word terms of a text, without stop words and very short tokens."""
+    return {
+        token for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 2 and token not in STOP_WORDS
+    }
+
+
+def opportunity_terms(opportunity):
+    """Map each term of an opportunity to its strongest weight."""
+    sources = {
+        'category': opportunity['category__name'],
+        'requirements': opportunity['requirements'],
+        'title': opportunity['title'],
+    }
+    weights = {}
+    for source, text in sources.items():
+        for term in terms_from_text(text):
+            weights[term] = max(weights.get(term, 0), TERM_WEIGHTS[source])
+    return weights
+
+
+def accepted_count_subquery():
+    """Accepted applications per opportunity, for use as an annotation."""
+    return Coalesce(
+        Subquery(
+            VolunteeringApplication.objects.filter(opportunity=OuterRef('pk'), status='accepted')
+            .order_by().values('opportunity').annotate(total=Count('id')).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def is_open(opportunity):
+    if opportunity['status'] != 'active':
+        return False
+    return opportunity['max_volunteers'] is None or opportunity['accepted_count'] < opportunity['max_volunteers']
+
+
+def _opportunity_values(queryset):
+    return queryset.annotate(accepted_count=accepted_count_subquery()).values(*OPPORTUNITY_VALUES)
+
+
+def _term_rows(opportunities):
+    rows = []
+    for opportunity in opportunities:
+        open_now = is_open(opportunity)
+        for term, weight in opportunity_terms(opportunity).items():
+            rows.append(OpportunityTerm(
+                opportunity_id=opportunity['id'],
+                term=term[:100],
+                weight=weight,
+                start_date=opportunity['start_date'],
+                end_date=opportunity['end_date'],
+                is_open=open_now,
+            ))
+    return rows
+
+
+def index_opportunities(opportunity_ids):
+    """Recompute the index entries of the given opportunities."""
+    opportunity_ids = list(opportunity_ids)
+    if not opportunity_ids:
+        return
+    with transaction.atomic():
+        OpportunityTerm.objects.filter(opportunity_id__in=opportunity_ids).delete()
+        rows = _term_rows(_opportunity_values(VolunteeringOpportunity.objects.filter(id__in=opportunity_ids)))
+        OpportunityTerm.objects.bulk_create(rows, batch_size=REBUILD_BATCH_SIZE)
+
+
+def refresh_capacity(opportunity_id):
+    """Re-evaluate whether an opportunity still takes volunteers after an application change."""
+    opportunity = _opportunity_values(VolunteeringOpportunity.objects.filter(id=opportunity_id)).first()
+    if opportunity is not None:
+        OpportunityTerm.objects.filter(opportunity_id=opportunity_id).exclude(
+            is_open=is_open(opportunity)
+        ).update(is_open=is_open(opportunity))
+
+
+def rebuild_index(stdout=None):
+    """Rebuild the whole opportunity term index."""
+    count = 0
+    with transaction.atomic():
+        OpportunityTerm.objects.all().delete()
+        batch = []
+        for opportunity in _opportunity_values(VolunteeringOpportunity.objects.all()).iterator(chunk_size=REBUILD_BATCH_SIZE):
+            batch.append(opportunity)
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                rows = _term_rows(batch)
+                OpportunityTerm.objects.bulk_create(rows, batch_size=REBUILD_BATCH_SIZE)
+                count += len(rows)
+                batch = []
+        if batch:
+            rows = _term_rows(batch)
+            OpportunityTerm.objects.bulk_create(rows, batch_size=REBUILD_BATCH_SIZE)
+            count += len(rows)
+    if stdout:
+        stdout.write(f"Indexed {count} opportunity terms")
+
+
+def user_terms(user):
+    """Terms describing a user: profile skills and interests plus categories they volunteered in."""
+    profile = getattr(user, 'profile', None)
+    texts = []
+    if profile is not None:
+        texts.extend(str(value) for value in (profile.skills or []) + (profile.interests or []))
+    texts.extend(
+        VolunteeringActivity.objects.filter(user=user, status='approved')
+        .order_by().values_list('category__name', flat=True).distinct()
+    )
+    terms = set()
+    for text in texts:
+        terms.update(terms_from_text(text))
+    return terms
+
+
+def recommend_opportunities(user, limit=10, start=None, end=None):
+    """
+    Top `limit` open opportunities for a user, best match first.
+
+    Scoring, the date window and the capacity check run in one grouped
+    query over the term index; only the winning opportunities are loaded.
+    """
+    terms = user_terms(user)
+    if not terms:
+        return []
+
+    today = timezone.now().date()
+    entries = OpportunityTerm.objects.filter(
+        term__in=terms, is_open=True, end_date__gte=max(start or today, today)
+    ).exclude(
+        opportunity_id__in=VolunteeringApplication.objects.filter(user=user).values('opportunity_id')
+    )
+    if end:
+        entries = entries.filter(start_date__lte=end)
+
+    scores = list(
+        entries.values('opportunity_id')
+        .annotate(score=Sum('weight'), matched_terms=Count('id'))
+        .order_by('-score', '-opportunity_id')[:limit]
+    )
+    if not scores:
+        return []
+
+    by_id = VolunteeringOpportunity.objects.select_related('category').annotate(
+        accepted_count=accepted_count_subquery()
+    ).in_bulk([row['opportunity_id'] for row in scores])
+
+    results = []
+    for row in scores:
+        opportunity = by_id.get(row['opportunity_id'])
+        if opportunity is None:
+            continue
+        opportunity.score = row['score']
+        opportunity.matched_terms = row['matched_terms']
+        results.append(opportunity)
+    return results
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteering', '0002_volunteeringactivity_volunteerin_user_id_6f9deb_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OpportunityTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=100)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('is_open', models.BooleanField(default=True)),
+                ('opportunity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='volunteering.volunteeringopportunity')),
+            ],
+            options={
+                'verbose_name': 'Opportunity Term',
+                'verbose_name_plural': 'Opportunity Terms',
+                'db_table': 'volunteering_opportunity_terms',
+                'indexes': [models.Index(fields=['term', 'is_open', 'end_date', 'start_date', 'opportunity', 'weight'], name='volunteerin_term_81aeb7_idx')],
+                'unique_together': {('opportunity', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:10
+
+import blobs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteering', '0003_opportunity_terms'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='volunteeringactivity',
+            name='evidence_file',
+            field=models.FileField(blank=True, null=True, storage=blobs.storage.get_content_addressed_storage, upload_to='volunteering/evidence/'),
+        ),
+    ]
@@ -1,6 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.utils import timezone
+from blobs.storage import get_content_addressed_storage
+
+
+class OpportunityFull(Exception):
+    """Raised when accepting an application would exceed max_volunteers."""
 
 
 class VolunteeringCategory(models.Model):
@@ -51,7 +56,7 @@ class VolunteeringActivity(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     points = models.PositiveIntegerField(default=0)
     evidence_url = models.URLField(blank=True)
-    evidence_file = models.FileField(upload_to='volunteering/evidence/', blank=True, null=True)
+    evidence_file = models.FileField(upload_to='volunteering/evidence/', storage=get_content_addressed_storage, blank=True, null=True)
     verified_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, 
         on_delete=models.SET_NULL, 
@@ -72,6 +77,9 @@ class VolunteeringActivity(models.Model):
         verbose_name = 'Volunteering Activity'
         verbose_name_plural = 'Volunteering Activities'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
     
     def __str__(self):
         return f"{self.user.full_name} - {self.title}"
@@ -193,6 +201,12 @@ class VolunteeringOpportunity(models.Model):
     
     def __str__(self):
         return f"{self.organization} - {self.title}"
+    
+    def remaining_slots(self, accepted_count):
+        """Free places left, or None when the opportunity is unlimited."""
+        if self.max_volunteers is None:
+            return None
+        return max(self.max_volunteers - accepted_count, 0)
 
 
 class VolunteeringApplication(models.Model):
@@ -231,6 +245,33 @@ class VolunteeringApplication(models.Model):
     
     def __str__(self):
         return f"{self.user.full_name} - {self.opportunity.title}"
+    
+    def accept(self, reviewed_by, notes=''):
+        """
+        Accept the application without overfilling the opportunity.
+        
+        The opportunity row is locked first, so concurrent reviewers are
+        serialized and each sees the accepted count left by the previous one.
+        """
+        with transaction.atomic():
+            opportunity = VolunteeringOpportunity.objects.select_for_update().get(pk=self.opportunity_id)
+            if self.status != 'accepted' and opportunity.max_volunteers is not None:
+                accepted = opportunity.applications.filter(status='accepted').exclude(pk=self.pk).count()
+                if accepted >= opportunity.max_volunteers:
+                    raise OpportunityFull(f"{opportunity.title} has no remaining slots.")
+            self.status = 'accepted'
+            self.reviewed_by = reviewed_by
+            self.reviewed_at = timezone.now()
+            self.review_notes = notes
+            self.save()
+    
+    def reject(self, reviewed_by, notes=''):
+        """Reject the application."""
+        self.status = 'rejected'
+        self.reviewed_by = reviewed_by
+        self.reviewed_at = timezone.now()
+        self.review_notes = notes
+        self.save()
 
 
 class VolunteeringImpact(models.Model):
@@ -250,3 +291,32 @@ class VolunteeringImpact(models.Model):
     
     def __str__(self):
         return f"{self.activity.title} - {self.metric_name}: {self.metric_value} {self.metric_unit}"
+
+
+class OpportunityTerm(models.Model):
+    """
+    Inverted index entry: one matchable term of a volunteering opportunity.
+    
+    Dates and open/full state are copied from the opportunity so matching
+    can filter on this table alone.
+    """
+    
+    opportunity = models.ForeignKey(VolunteeringOpportunity, on_delete=models.CASCADE, related_name='terms')
+    term = models.CharField(max_length=100)
+    weight = models.PositiveSmallIntegerField(default=1)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    is_open = models.BooleanField(default=True)  # Active and below max_volunteers
+    
+    class Meta:
+        db_table = 'volunteering_opportunity_terms'
+        verbose_name = 'Opportunity Term'
+        verbose_name_plural = 'Opportunity Terms'
+        unique_together = ['opportunity', 'term']
+        indexes = [
+            # Covers the whole matching query, so scoring never touches the table
+            models.Index(fields=['term', 'is_open', 'end_date', 'start_date', 'opportunity', 'weight']),
+        ]
+    
+    def __str__(self):
+        return f"{self.term} -> {self.opportunity_id} ({self.weight})"
@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Value
+from accounts.serializers import UserSummarySerializer
+from eduportal.serializers import SparseFieldsMixin, ValuesSerializer, count_subquery
 from .models import (
     VolunteeringCategory, VolunteeringActivity, VolunteeringComment,
     VolunteeringLike, VolunteeringShare, VolunteeringOpportunity,
@@ -9,7 +12,7 @@ from .models import (
 User = get_user_model()
 
 
-class VolunteeringCategorySerializer(serializers.ModelSerializer):
+class VolunteeringCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering categories."""
     
     class Meta:
@@ -17,7 +20,7 @@ class VolunteeringCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'icon', 'color', 'points_per_hour', 'is_active']
 
 
-class VolunteeringActivitySerializer(serializers.ModelSerializer):
+class VolunteeringActivitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering activities."""
     
     user_name = serializers.SerializerMethodField()
@@ -39,6 +42,11 @@ class VolunteeringActivitySerializer(serializers.ModelSerializer):
             'likes_count', 'comments_count', 'is_liked'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'verified_by', 'verified_at', 'points']
+        expandable_fields = {
+            'user': UserSummarySerializer,
+            'category': VolunteeringCategorySerializer,
+            'verified_by': UserSummarySerializer,
+        }
     
     def get_user_name(self, obj):
         return obj.user.full_name
@@ -69,6 +77,72 @@ class VolunteeringActivitySerializer(serializers.ModelSerializer):
         return False
 
 
+class VolunteeringActivityValuesSerializer(ValuesSerializer):
+    """Read-only list serializer with VolunteeringActivitySerializer's output, built from `.values()` rows."""
+    
+    values_fields = {
+        'id': ('id',),
+        'user': ('user_id',),
+        'user_name': ('user__first_name', 'user__last_name'),
+        'title': ('title',),
+        'description': ('description',),
+        'organization': ('organization',),
+        'location': ('location',),
+        'category': ('category_id',),
+        'category_name': ('category__name',),
+        'activity_date': ('activity_date',),
+        'hours_volunteered': ('hours_volunteered',),
+        'status': ('status',),
+        'priority': ('priority',),
+        'points': ('points',),
+        'evidence_url': ('evidence_url',),
+        'evidence_file': ('evidence_file',),
+        'evidence_file_url': ('evidence_file',),
+        'verified_by': ('verified_by_id',),
+        'verified_by_name': ('verified_by__first_name', 'verified_by__last_name'),
+        'verified_at': ('verified_at',),
+        'rejection_reason': ('rejection_reason',),
+        'skills_developed': ('skills_developed',),
+        'tags': ('tags',),
+        'is_public': ('is_public',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'likes_count': ('likes_count',),
+        'comments_count': ('comments_count',),
+        'is_liked': ('is_liked',),
+    }
+    datetime_fields = ('verified_at', 'created_at', 'updated_at')
+    date_fields = ('activity_date',)
+    evidence_storage = VolunteeringActivity._meta.get_field('evidence_file').storage
+    
+    @classmethod
+    def annotations(cls, context):
+        user = context['request'].user
+        return {
+            'likes_count': count_subquery(VolunteeringLike, 'activity'),
+            'comments_count': count_subquery(VolunteeringComment, 'activity'),
+            'is_liked': (
+                Exists(VolunteeringLike.objects.filter(activity=OuterRef('pk'), user=user))
+                if user.is_authenticated else Value(False)
+            ),
+        }
+    
+    def get_user_name(self, row):
+        return self.full_name(row['user__first_name'], row['user__last_name'])
+    
+    def get_verified_by_name(self, row):
+        return self.full_name(row['verified_by__first_name'], row['verified_by__last_name'])
+    
+    def get_hours_volunteered(self, row):
+        return float(row['hours_volunteered'])
+    
+    def get_evidence_file(self, row):
+        return self.file_url(self.evidence_storage, row['evidence_file'])
+    
+    def get_evidence_file_url(self, row):
+        return self.get_evidence_file(row) if self.request is not None else None
+
+
 class VolunteeringActivityCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating volunteering activities."""
     
@@ -109,7 +183,7 @@ class VolunteeringApprovalSerializer(serializers.Serializer):
         return attrs
 
 
-class VolunteeringCommentSerializer(serializers.ModelSerializer):
+class VolunteeringCommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering comments."""
     
     user_name = serializers.SerializerMethodField()
@@ -127,7 +201,7 @@ class VolunteeringCommentSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class VolunteeringLikeSerializer(serializers.ModelSerializer):
+class VolunteeringLikeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering likes."""
     
     class Meta:
@@ -140,7 +214,7 @@ class VolunteeringLikeSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class VolunteeringShareSerializer(serializers.ModelSerializer):
+class VolunteeringShareSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering shares."""
     
     class Meta:
@@ -153,12 +227,15 @@ class VolunteeringShareSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class VolunteeringOpportunitySerializer(serializers.ModelSerializer):
+class VolunteeringOpportunitySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering opportunities."""
     
     created_by_name = serializers.SerializerMethodField()
     category_name = serializers.SerializerMethodField()
     applications_count = serializers.SerializerMethodField()
+    pending_applications_count = serializers.SerializerMethodField()
+    accepted_applications_count = serializers.SerializerMethodField()
+    remaining_slots = serializers.SerializerMethodField()
     
     class Meta:
         model = VolunteeringOpportunity
@@ -166,7 +243,8 @@ class VolunteeringOpportunitySerializer(serializers.ModelSerializer):
             'id', 'title', 'description', 'organization', 'location', 'category', 'category_name',
             'start_date', 'end_date', 'required_hours', 'max_volunteers', 'contact_email',
             'contact_phone', 'requirements', 'benefits', 'status', 'is_featured',
-            'created_by', 'created_by_name', 'created_at', 'updated_at', 'applications_count'
+            'created_by', 'created_by_name', 'created_at', 'updated_at', 'applications_count',
+            'pending_applications_count', 'accepted_applications_count', 'remaining_slots'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
     
@@ -176,15 +254,31 @@ class VolunteeringOpportunitySerializer(serializers.ModelSerializer):
     def get_category_name(self, obj):
         return obj.category.name
     
+    # List/detail views annotate the counts; fall back to queries otherwise
     def get_applications_count(self, obj):
+        if hasattr(obj, 'applications_count'):
+            return obj.applications_count
         return obj.applications.count()
     
+    def get_pending_applications_count(self, obj):
+        if hasattr(obj, 'pending_applications_count'):
+            return obj.pending_applications_count
+        return obj.applications.filter(status='pending').count()
+    
+    def get_accepted_applications_count(self, obj):
+        if hasattr(obj, 'accepted_count'):
+            return obj.accepted_count
+        return obj.applications.filter(status='accepted').count()
+    
+    def get_remaining_slots(self, obj):
+        return obj.remaining_slots(self.get_accepted_applications_count(obj))
+    
     def create(self, validated_data):
         validated_data['created_by'] = self.context['request'].user
         return super().create(validated_data)
 
 
-class VolunteeringApplicationSerializer(serializers.ModelSerializer):
+class VolunteeringApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering applications."""
     
     user_name = serializers.SerializerMethodField()
@@ -198,7 +292,8 @@ class VolunteeringApplicationSerializer(serializers.ModelSerializer):
             'relevant_experience', 'available_hours', 'status', 'applied_at',
             'reviewed_at', 'reviewed_by', 'reviewed_by_name', 'review_notes'
         ]
-        read_only_fields = ['id', 'user', 'applied_at', 'reviewed_at', 'reviewed_by']
+        # Status changes go through VolunteeringApplicationReviewView so capacity is enforced
+        read_only_fields = ['id', 'user', 'status', 'applied_at', 'reviewed_at', 'reviewed_by', 'review_notes']
     
     def get_user_name(self, obj):
         return obj.user.full_name
@@ -214,7 +309,14 @@ class VolunteeringApplicationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class VolunteeringImpactSerializer(serializers.ModelSerializer):
+class VolunteeringApplicationReviewSerializer(serializers.Serializer):
+    """Serializer for accepting/rejecting volunteering applications."""
+    
+    action = serializers.ChoiceField(choices=['accept', 'reject'])
+    review_notes = serializers.CharField(required=False, allow_blank=True)
+
+
+class VolunteeringImpactSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for volunteering impacts."""
     
     class Meta:
@@ -223,6 +325,26 @@ class VolunteeringImpactSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
+class OpportunityRecommendationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for a recommended opportunity and its match score."""
+    
+    category_name = serializers.CharField(source='category.name', read_only=True)
+    remaining_slots = serializers.SerializerMethodField()
+    score = serializers.IntegerField(read_only=True)
+    matched_terms = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = VolunteeringOpportunity
+        fields = [
+            'id', 'title', 'organization', 'location', 'category', 'category_name',
+            'start_date', 'end_date', 'required_hours', 'max_volunteers', 'remaining_slots',
+            'is_featured', 'score', 'matched_terms'
+        ]
+    
+    def get_remaining_slots(self, obj):
+        return obj.remaining_slots(obj.accepted_count)
+
+
 class VolunteeringStatsSerializer(serializers.Serializer):
     """Serializer for volunteering statistics."""
     
@@ -246,3 +368,31 @@ class VolunteeringAnalyticsSerializer(serializers.Serializer):
     average_hours_per_activity = serializers.FloatField()
     approval_rate = serializers.FloatField()
     impact_metrics = serializers.DictField()
+
+
+class DepartmentVolunteeringStatsSerializer(serializers.Serializer):
+    """Serializer for per-department volunteering statistics."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    contributors_count = serializers.IntegerField()
+    total_activities = serializers.IntegerField()
+    approved_activities = serializers.IntegerField()
+    pending_activities = serializers.IntegerField()
+    rejected_activities = serializers.IntegerField()
+    total_hours = serializers.FloatField()
+    total_points = serializers.IntegerField()
+    approval_rate = serializers.FloatField()
+
+
+class DepartmentVolunteeringAnalyticsSerializer(serializers.Serializer):
+    """Serializer for volunteering analytics scoped to one department."""
+    
+    department_id = serializers.IntegerField()
+    department_name = serializers.CharField()
+    stats = serializers.DictField()
+    activities_by_category = serializers.DictField()
+    activities_by_month = serializers.DictField()
+    top_volunteers = serializers.ListField()
+    average_hours_per_activity = serializers.FloatField()
+    approval_rate = serializers.FloatField()
@@ -0,0 +1,38 @@
+from django.db.models.signals import post_save, post_delete
+from .matching import index_opportunities, refresh_capacity
+from .models import VolunteeringApplication, VolunteeringCategory, VolunteeringOpportunity
+
+OPPORTUNITY_INDEXED_FIELDS = {
+    'title', 'requirements', 'category', 'status', 'start_date', 'end_date', 'max_volunteers',
+}
+
+
+def update_opportunity_terms(sender, instance, update_fields=None, raw=False, **kwargs):
+    """Keep the matching index of a saved opportunity current."""
+    if raw:
+        return
+    if update_fields is not None and not OPPORTUNITY_INDEXED_FIELDS.intersection(update_fields):
+        return
+    index_opportunities([instance.pk])
+
+
+def update_category_terms(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    """A renamed category changes the terms of every opportunity in it."""
+    if raw or created:
+        return
+    if update_fields is not None and 'name' not in update_fields:
+        return
+    index_opportunities(instance.opportunities.values_list('id', flat=True))
+
+
+def update_opportunity_capacity(sender, instance, raw=False, **kwargs):
+    """Accepting or withdrawing an application can fill or reopen an opportunity."""
+    if raw:
+        return
+    refresh_capacity(instance.opportunity_id)
+
+
+post_save.connect(update_opportunity_terms, sender=VolunteeringOpportunity, dispatch_uid='volunteering-opportunity-terms')
+post_save.connect(update_category_terms, sender=VolunteeringCategory, dispatch_uid='volunteering-category-terms')
+post_save.connect(update_opportunity_capacity, sender=VolunteeringApplication, dispatch_uid='volunteering-application-capacity')
+post_delete.connect(update_opportunity_capacity, sender=VolunteeringApplication, dispatch_uid='volunteering-application-capacity')
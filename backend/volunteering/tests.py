@@ -0,0 +1,141 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+from accounts.models import User
+from .models import (
+    OpportunityFull, VolunteeringActivity, VolunteeringApplication, VolunteeringCategory,
+    VolunteeringComment, VolunteeringLike, VolunteeringOpportunity
+)
+from .serializers import VolunteeringActivitySerializer, VolunteeringActivityValuesSerializer
+
+
+class VolunteeringActivityValuesSerializerTests(TestCase):
+    """VolunteeringActivityValuesSerializer must render exactly what VolunteeringActivitySerializer does."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(
+            email='student@test.local', username='student', password='pw', role='student',
+            first_name='Ada', last_name='Lovelace',
+        )
+        cls.faculty = User.objects.create_user(
+            email='faculty@test.local', username='faculty', password='pw', role='faculty', first_name='Alan',
+        )
+        category = VolunteeringCategory.objects.create(name='Community')
+        common = {
+            'user': cls.student, 'description': 'd', 'organization': 'NGO', 'category': category,
+            'activity_date': date(2024, 3, 1), 'tags': ['outreach'],
+        }
+        verified = VolunteeringActivity.objects.create(
+            title='Verified', status='approved', verified_by=cls.faculty, verified_at=timezone.now(),
+            hours_volunteered=2.5, skills_developed=['teamwork'], **common
+        )
+        VolunteeringActivity.objects.create(title='No verifier, no file', hours_volunteered=4, **common)
+        empty_file = VolunteeringActivity.objects.create(title='Empty file name', hours_volunteered=1, **common)
+        # Set file names directly; saving through the storage would need the blob on disk
+        VolunteeringActivity.objects.filter(pk=empty_file.pk).update(evidence_file='')
+        VolunteeringActivity.objects.filter(pk=verified.pk).update(evidence_file=f'blobs/aa/bb/{"0" * 64}.jpg')
+        VolunteeringLike.objects.create(activity=verified, user=cls.student)
+        VolunteeringLike.objects.create(activity=empty_file, user=cls.faculty)
+        VolunteeringComment.objects.create(activity=verified, user=cls.faculty, comment='Nice')
+    
+    def assertSameOutput(self, viewer, **params):
+        request = Request(APIRequestFactory().get('/api/volunteering/activities/', params))
+        request.user = viewer
+        context = {'request': request}
+        queryset = VolunteeringActivity.objects.select_related('user', 'category', 'verified_by').order_by('id')
+        expected = [dict(item) for item in VolunteeringActivitySerializer(queryset, many=True, context=context).data]
+        values = VolunteeringActivityValuesSerializer.values_queryset(queryset, context)
+        self.assertEqual(list(VolunteeringActivityValuesSerializer(values, many=True, context=context).data), expected)
+    
+    def test_same_output_for_liking_viewer(self):
+        self.assertSameOutput(self.student)
+    
+    def test_same_output_for_other_viewer(self):
+        self.assertSameOutput(self.faculty)
+    
+    def test_same_output_for_sparse_fields(self):
+        self.assertSameOutput(self.student, fields='id,verified_by_name,evidence_file_url,is_liked')
+        self.assertSameOutput(self.student, omit='description,likes_count')
+
+
+def create_opportunity(created_by, max_volunteers, applicants):
+    """An opportunity with one pending application per applicant."""
+    opportunity = VolunteeringOpportunity.objects.create(
+        title='Tutoring', description='d', organization='Org', location='Campus',
+        category=VolunteeringCategory.objects.create(name='Education'),
+        start_date=date.today(), end_date=date.today() + timedelta(days=30), required_hours=10,
+        max_volunteers=max_volunteers, contact_email='org@test.local', created_by=created_by,
+    )
+    applications = VolunteeringApplication.objects.bulk_create([
+        VolunteeringApplication(opportunity=opportunity, user=user, motivation='m', available_hours=5)
+        for user in applicants
+    ])
+    return opportunity, applications
+
+
+def create_students(count):
+    return [
+        User.objects.create_user(email=f's{i}@test.local', username=f's{i}', password='pw', role='student')
+        for i in range(count)
+    ]
+
+
+class ApplicationAcceptTests(TestCase):
+    """Accepting applications never fills an opportunity beyond max_volunteers."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.faculty = User.objects.create_user(
+            email='faculty@test.local', username='faculty', password='pw', role='faculty'
+        )
+        cls.opportunity, cls.applications = create_opportunity(cls.faculty, 2, create_students(3))
+    
+    def test_accept_raises_when_full(self):
+        first, second, third = self.applications
+        first.accept(self.faculty)
+        second.accept(self.faculty)
+        with self.assertRaises(OpportunityFull):
+            third.accept(self.faculty)
+        third.refresh_from_db()
+        self.assertEqual(third.status, 'pending')
+        # Accepting an already accepted application doesn't count it twice
+        first.accept(self.faculty)
+    
+    def test_review_endpoint_answers_conflict_when_full(self):
+        client = APIClient()
+        client.force_authenticate(self.faculty)
+        statuses = [
+            client.patch(f'/api/volunteering/applications/{application.pk}/review/', {'action': 'accept'}).status_code
+            for application in self.applications
+        ]
+        self.assertEqual(statuses, [200, 200, 409])
+        self.assertEqual(self.opportunity.applications.filter(status='accepted').count(), 2)
+
+
+@unittest.skipUnless(connection.features.has_select_for_update, 'needs SELECT ... FOR UPDATE (PostgreSQL)')
+class ConcurrentApplicationAcceptTests(TransactionTestCase):
+    """Reviewers accepting at the same time are serialized by the opportunity row lock."""
+    
+    def test_concurrent_accepts_never_overfill(self):
+        faculty = User.objects.create_user(email='faculty@test.local', username='faculty', password='pw', role='faculty')
+        opportunity, applications = create_opportunity(faculty, 3, create_students(12))
+        
+        def accept(application):
+            try:
+                application.accept(faculty)
+                return True
+            except OpportunityFull:
+                return False
+            finally:
+                connection.close()
+        
+        with ThreadPoolExecutor(max_workers=len(applications)) as pool:
+            accepted = list(pool.map(accept, applications))
+        self.assertEqual(sum(accepted), 3)
+        self.assertEqual(opportunity.applications.filter(status='accepted').count(), 3)
@@ -20,10 +20,12 @@ urlpatterns = [
     # Opportunities
     path('opportunities/', views.VolunteeringOpportunityListView.as_view(), name='volunteering-opportunity-list'),
     path('opportunities/<int:pk>/', views.VolunteeringOpportunityDetailView.as_view(), name='volunteering-opportunity-detail'),
+    path('opportunities/recommended/', views.recommended_opportunities, name='volunteering-opportunity-recommended'),
     
     # Applications
     path('applications/', views.VolunteeringApplicationListView.as_view(), name='volunteering-application-list'),
     path('applications/<int:pk>/', views.VolunteeringApplicationDetailView.as_view(), name='volunteering-application-detail'),
+    path('applications/<int:pk>/review/', views.VolunteeringApplicationReviewView.as_view(), name='volunteering-application-review'),
     
     # Impacts
     path('activities/<int:activity_id>/impacts/', views.VolunteeringImpactListView.as_view(), name='volunteering-impact-list'),
@@ -31,5 +33,7 @@ urlpatterns = [
     # Statistics and Analytics
     path('stats/', views.volunteering_stats, name='volunteering-stats'),
     path('analytics/', views.volunteering_analytics, name='volunteering-analytics'),
+    path('analytics/departments/', views.department_volunteering_stats, name='department-volunteering-stats'),
+    path('analytics/departments/<int:department_id>/', views.department_volunteering_analytics, name='department-volunteering-analytics'),
     path('pending-reviews/', views.pending_volunteering_reviews, name='pending-volunteering-reviews'),
 ]
@@ -1,24 +1,40 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from django.db.models import Count, Q, Sum, Avg
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum, Avg
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
-from datetime import timedelta
+from datetime import timedelta, date
+from functools import partial
+from accounts.models import Department
+from tags.indexing import tagged_object_ids
+from eduportal.async_views import async_api_view, gather_queries
+from .matching import recommend_opportunities
+from eduportal.replicas import replica_reads
+from eduportal.throttling import request_cost
+from eduportal.views import ConditionalGetMixin, ValuesListMixin, choice_counts
 from .models import (
     VolunteeringCategory, VolunteeringActivity, VolunteeringComment,
     VolunteeringLike, VolunteeringShare, VolunteeringOpportunity,
-    VolunteeringApplication, VolunteeringImpact
+    VolunteeringApplication, VolunteeringImpact, OpportunityFull
 )
 from .serializers import (
     VolunteeringCategorySerializer, VolunteeringActivitySerializer, VolunteeringActivityCreateSerializer,
     VolunteeringActivityUpdateSerializer, VolunteeringApprovalSerializer, VolunteeringCommentSerializer,
     VolunteeringLikeSerializer, VolunteeringShareSerializer, VolunteeringOpportunitySerializer,
     VolunteeringApplicationSerializer, VolunteeringImpactSerializer, VolunteeringStatsSerializer,
-    VolunteeringAnalyticsSerializer
+    VolunteeringAnalyticsSerializer, DepartmentVolunteeringStatsSerializer,
+    DepartmentVolunteeringAnalyticsSerializer, OpportunityRecommendationSerializer,
+    VolunteeringApplicationReviewSerializer,
+    VolunteeringActivityValuesSerializer
 )
 
+MAX_RECOMMENDATIONS = 50
 
-class VolunteeringCategoryListView(generics.ListAPIView):
+
+class VolunteeringCategoryListView(ConditionalGetMixin, generics.ListAPIView):
     """List all volunteering categories."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -26,10 +42,13 @@ class VolunteeringCategoryListView(generics.ListAPIView):
     queryset = VolunteeringCategory.objects.filter(is_active=True)
 
 
-class VolunteeringActivityListView(generics.ListCreateAPIView):
+class VolunteeringActivityListView(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """List and create volunteering activities."""
     
     permission_classes = [permissions.IsAuthenticated]
+    values_serializer_class = VolunteeringActivityValuesSerializer
+    search_fields = ['title', 'description', 'organization', 'location']
+    etag_related = ('likes', 'comments')
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
@@ -66,14 +85,24 @@ class VolunteeringActivityListView(generics.ListCreateAPIView):
         if user_filter and (user.is_faculty() or user.is_admin()):
             queryset = queryset.filter(user_id=user_filter)
         
+        # Tag/skill filters resolve through the tag index instead of scanning JSON
+        tag_filter = self.request.query_params.get('tag')
+        if tag_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('volunteering', 'tag', tag_filter))
+        
+        skill_filter = self.request.query_params.get('skill')
+        if skill_filter:
+            queryset = queryset.filter(id__in=tagged_object_ids('volunteering', 'skill', skill_filter))
+        
         return queryset.order_by('-created_at')
 
 
-class VolunteeringActivityDetailView(generics.RetrieveUpdateDestroyAPIView):
+class VolunteeringActivityDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific volunteering activity."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VolunteeringActivitySerializer
+    etag_related = ('likes', 'comments')
     
     def get_queryset(self):
         user = self.request.user
@@ -125,7 +154,7 @@ class VolunteeringApprovalView(generics.UpdateAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class VolunteeringCommentListView(generics.ListCreateAPIView):
+class VolunteeringCommentListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create comments for a volunteering activity."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -188,14 +217,25 @@ class VolunteeringShareView(generics.CreateAPIView):
         serializer.save(activity=activity)
 
 
-class VolunteeringOpportunityListView(generics.ListCreateAPIView):
+def annotate_application_counts(queryset):
+    """Application counts per status in the same query as the opportunities."""
+    return queryset.annotate(
+        applications_count=Count('applications'),
+        pending_applications_count=Count('applications', filter=Q(applications__status='pending')),
+        accepted_count=Count('applications', filter=Q(applications__status='accepted')),
+    )
+
+
+class VolunteeringOpportunityListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create volunteering opportunities."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VolunteeringOpportunitySerializer
+    search_fields = ['title', 'description', 'organization', 'location']
     
     def get_queryset(self):
         queryset = VolunteeringOpportunity.objects.filter(status='active').select_related('category', 'created_by')
+        queryset = annotate_application_counts(queryset)
         
         # Apply filters
         category_filter = self.request.query_params.get('category')
@@ -206,22 +246,29 @@ class VolunteeringOpportunityListView(generics.ListCreateAPIView):
         if location_filter:
             queryset = queryset.filter(location__icontains=location_filter)
         
+        if self.request.query_params.get('has_capacity') in ('1', 'true', 'True'):
+            queryset = queryset.filter(Q(max_volunteers__isnull=True) | Q(max_volunteers__gt=F('accepted_count')))
+        
         return queryset.order_by('-created_at')
 
 
-class VolunteeringOpportunityDetailView(generics.RetrieveUpdateDestroyAPIView):
+class VolunteeringOpportunityDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a specific volunteering opportunity."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VolunteeringOpportunitySerializer
     queryset = VolunteeringOpportunity.objects.all()
+    
+    def get_queryset(self):
+        return annotate_application_counts(VolunteeringOpportunity.objects.select_related('category', 'created_by'))
 
 
-class VolunteeringApplicationListView(generics.ListCreateAPIView):
+class VolunteeringApplicationListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create volunteering applications."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VolunteeringApplicationSerializer
+    etag_aggregates = choice_counts(VolunteeringApplication._meta.get_field('status'))
     
     def get_queryset(self):
         user = self.request.user
@@ -237,11 +284,12 @@ class VolunteeringApplicationListView(generics.ListCreateAPIView):
         return queryset.order_by('-applied_at')
 
 
-class VolunteeringApplicationDetailView(generics.RetrieveUpdateAPIView):
+class VolunteeringApplicationDetailView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     """Get or update a specific volunteering application."""
     
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = VolunteeringApplicationSerializer
+    etag_aggregates = choice_counts(VolunteeringApplication._meta.get_field('status'))
     
     def get_queryset(self):
         user = self.request.user
@@ -257,7 +305,41 @@ class VolunteeringApplicationDetailView(generics.RetrieveUpdateAPIView):
         return queryset
 
 
-class VolunteeringImpactListView(generics.ListCreateAPIView):
+class VolunteeringApplicationReviewView(generics.UpdateAPIView):
+    """Accept or reject volunteering applications (Faculty/Admin only)."""
+    
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = VolunteeringApplicationReviewSerializer
+    queryset = VolunteeringApplication.objects.all()
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_faculty() or user.is_admin():
+            return VolunteeringApplication.objects.select_related('opportunity')
+        return VolunteeringApplication.objects.none()
+    
+    def update(self, request, *args, **kwargs):
+        application = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        
+        if serializer.is_valid():
+            action = serializer.validated_data['action']
+            notes = serializer.validated_data.get('review_notes', '')
+            
+            if action == 'accept':
+                try:
+                    application.accept(request.user, notes)
+                except OpportunityFull as exc:
+                    return Response({'error': str(exc)}, status=status.HTTP_409_CONFLICT)
+                return Response({'message': 'Volunteering application accepted successfully.'}, status=status.HTTP_200_OK)
+            else:
+                application.reject(request.user, notes)
+                return Response({'message': 'Volunteering application rejected successfully.'}, status=status.HTTP_200_OK)
+        
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class VolunteeringImpactListView(ConditionalGetMixin, generics.ListCreateAPIView):
     """List and create volunteering impacts."""
     
     permission_classes = [permissions.IsAuthenticated]
@@ -272,49 +354,70 @@ class VolunteeringImpactListView(generics.ListCreateAPIView):
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
-def volunteering_stats(request):
-    """Get volunteering statistics."""
-    user = request.user
+def recommended_opportunities(request):
+    """Open opportunities ranked against the user's skills, interests and past categories."""
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), MAX_RECOMMENDATIONS)
+        start = request.query_params.get('start')
+        end = request.query_params.get('end')
+        start = date.fromisoformat(start) if start else None
+        end = date.fromisoformat(end) if end else None
+    except ValueError:
+        return Response({'error': 'Invalid limit or date window.'}, status=status.HTTP_400_BAD_REQUEST)
+    if limit < 1 or (start and end and start > end):
+        return Response({'error': 'Invalid limit or date window.'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    opportunities = recommend_opportunities(request.user, limit=limit, start=start, end=end)
+    serializer = OpportunityRecommendationSerializer(opportunities, many=True)
+    return Response(serializer.data)
+
+
+async def volunteering_stats_data(user):
+    """Volunteering statistics as the user's role sees them (shared with the combined dashboard)."""
     
     if user.is_student():
         # Student stats
         activities = VolunteeringActivity.objects.filter(user=user)
-        stats = {
-            'total_activities': activities.count(),
-            'approved_activities': activities.filter(status='approved').count(),
-            'pending_activities': activities.filter(status='pending').count(),
-            'rejected_activities': activities.filter(status='rejected').count(),
-            'total_hours': activities.filter(status='approved').aggregate(
-                total=Sum('hours_volunteered')
-            )['total'] or 0,
-            'total_points': activities.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'categories_count': activities.values('category').distinct().count(),
-            'opportunities_count': VolunteeringOpportunity.objects.filter(status='active').count(),
-        }
+        categories = activities.values('category').distinct()
     else:
         # Admin/Faculty stats
         activities = VolunteeringActivity.objects.all()
-        stats = {
-            'total_activities': activities.count(),
-            'approved_activities': activities.filter(status='approved').count(),
-            'pending_activities': activities.filter(status='pending').count(),
-            'rejected_activities': activities.filter(status='rejected').count(),
-            'total_hours': activities.filter(status='approved').aggregate(
-                total=Sum('hours_volunteered')
-            )['total'] or 0,
-            'total_points': activities.filter(status='approved').aggregate(
-                total=Sum('points')
-            )['total'] or 0,
-            'categories_count': VolunteeringCategory.objects.filter(is_active=True).count(),
-            'opportunities_count': VolunteeringOpportunity.objects.filter(status='active').count(),
-        }
+        categories = VolunteeringCategory.objects.filter(is_active=True)
+    
+    totals, categories_count, opportunities_count = await gather_queries(
+        partial(
+            activities.aggregate,
+            total_activities=Count('pk'),
+            approved_activities=Count('pk', filter=Q(status='approved')),
+            pending_activities=Count('pk', filter=Q(status='pending')),
+            rejected_activities=Count('pk', filter=Q(status='rejected')),
+            total_hours=Sum('hours_volunteered', filter=Q(status='approved')),
+            total_points=Sum('points', filter=Q(status='approved')),
+        ),
+        categories.count,
+        VolunteeringOpportunity.objects.filter(status='active').count,
+    )
+    stats = {
+        **totals,
+        'total_hours': totals['total_hours'] or 0,
+        'total_points': totals['total_points'] or 0,
+        'categories_count': categories_count,
+        'opportunities_count': opportunities_count,
+    }
     
-    serializer = VolunteeringStatsSerializer(stats)
-    return Response(serializer.data)
+    return VolunteeringStatsSerializer(stats).data
+
+
+@replica_reads
+@async_api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+async def volunteering_stats(request):
+    """Get volunteering statistics."""
+    return Response(await volunteering_stats_data(request.user))
 
 
+@replica_reads
+@request_cost(5)
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
 def volunteering_analytics(request):
@@ -407,3 +510,143 @@ def pending_volunteering_reviews(request):
     pending_activities = VolunteeringActivity.objects.filter(status='pending').select_related('user', 'category')
     serializer = VolunteeringActivitySerializer(pending_activities, many=True, context={'request': request})
     return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_volunteering_stats(request):
+    """Get volunteering statistics for every department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    cache_key = 'volunteering:departments'
+    stats = cache.get(cache_key)
+    if stats is None:
+        # One grouped query across the department -> users -> activities join
+        approved = Q(users__volunteering_activities__status='approved')
+        departments = Department.objects.annotate(
+            contributors_count=Count('users__volunteering_activities__user', distinct=True),
+            total_activities=Count('users__volunteering_activities'),
+            approved_activities=Count('users__volunteering_activities', filter=approved),
+            pending_activities=Count(
+                'users__volunteering_activities',
+                filter=Q(users__volunteering_activities__status='pending')
+            ),
+            rejected_activities=Count(
+                'users__volunteering_activities',
+                filter=Q(users__volunteering_activities__status='rejected')
+            ),
+            total_hours=Sum('users__volunteering_activities__hours_volunteered', filter=approved),
+            total_points=Sum('users__volunteering_activities__points', filter=approved),
+        ).order_by('name')
+        
+        stats = []
+        for department in departments:
+            total = department.total_activities
+            stats.append({
+                'department_id': department.id,
+                'department_name': department.name,
+                'contributors_count': department.contributors_count,
+                'total_activities': total,
+                'approved_activities': department.approved_activities,
+                'pending_activities': department.pending_activities,
+                'rejected_activities': department.rejected_activities,
+                'total_hours': department.total_hours or 0,
+                'total_points': department.total_points or 0,
+                'approval_rate': round(department.approved_activities / total * 100, 2) if total > 0 else 0,
+            })
+        cache.set(cache_key, stats, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentVolunteeringStatsSerializer(stats, many=True)
+    return Response(serializer.data)
+
+
+@replica_reads
+@request_cost(5)
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def department_volunteering_analytics(request, department_id):
+    """Get volunteering analytics for a single department (Admin/Faculty only)."""
+    user = request.user
+    
+    if not (user.is_faculty() or user.is_admin()):
+        return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        department = Department.objects.get(id=department_id)
+    except Department.DoesNotExist:
+        return Response({'error': 'Department not found.'}, status=status.HTTP_404_NOT_FOUND)
+    
+    cache_key = f'volunteering:department:{department.id}'
+    analytics = cache.get(cache_key)
+    if analytics is None:
+        activities = VolunteeringActivity.objects.filter(user__department=department)
+        approved = Q(status='approved')
+        
+        totals = activities.aggregate(
+            total_activities=Count('id'),
+            approved_activities=Count('id', filter=approved),
+            pending_activities=Count('id', filter=Q(status='pending')),
+            rejected_activities=Count('id', filter=Q(status='rejected')),
+            total_hours=Sum('hours_volunteered', filter=approved),
+            total_points=Sum('points', filter=approved),
+            average_hours=Avg('hours_volunteered', filter=approved),
+            contributors_count=Count('user', distinct=True),
+        )
+        
+        activities_by_category = {
+            row['category__name']: row['count']
+            for row in activities.values('category__name').annotate(count=Count('id')).order_by('-count')
+        }
+        
+        year_ago = timezone.now() - timedelta(days=365)
+        activities_by_month = {
+            row['month'].strftime('%Y-%m'): row['count']
+            for row in activities.filter(created_at__gte=year_ago).annotate(
+                month=TruncMonth('created_at')
+            ).values('month').annotate(count=Count('id')).order_by('-month')
+        }
+        
+        top_volunteers = [
+            {
+                'user_name': f"{row['user__first_name']} {row['user__last_name']}".strip(),
+                'total_hours': row['total_hours'],
+                'total_points': row['total_points'],
+            }
+            for row in activities.filter(status='approved').values(
+                'user', 'user__first_name', 'user__last_name'
+            ).annotate(
+                total_hours=Sum('hours_volunteered'),
+                total_points=Sum('points')
+            ).order_by('-total_hours')[:10]
+        ]
+        
+        total = totals['total_activities']
+        approval_rate = (totals['approved_activities'] / total * 100) if total > 0 else 0
+        
+        analytics = {
+            'department_id': department.id,
+            'department_name': department.name,
+            'stats': {
+                'contributors_count': totals['contributors_count'],
+                'total_activities': total,
+                'approved_activities': totals['approved_activities'],
+                'pending_activities': totals['pending_activities'],
+                'rejected_activities': totals['rejected_activities'],
+                'total_hours': totals['total_hours'] or 0,
+                'total_points': totals['total_points'] or 0,
+            },
+            'activities_by_category': activities_by_category,
+            'activities_by_month': activities_by_month,
+            'top_volunteers': top_volunteers,
+            'average_hours_per_activity': round(totals['average_hours'] or 0, 2),
+            'approval_rate': round(approval_rate, 2),
+        }
+        cache.set(cache_key, analytics, settings.ANALYTICS_CACHE_TIMEOUT)
+    
+    serializer = DepartmentVolunteeringAnalyticsSerializer(analytics)
+    return Response(serializer.data)